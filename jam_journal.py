@@ -0,0 +1,664 @@
+#!/usr/bin/env python3
+"""
+Jam Journal
+===========
+Append-only Journal für Jammel- und Memory-Dateien (.jam)
+Jeder Eintrag ist eine JSON-Zeile, ein Schreibvorgang hängt nur diese Zeile an
+(statt die ganze Datei neu zu schreiben). Ältere .jam-Dateien (ein JSON-Array)
+werden weiterhin gelesen und lassen sich einmalig umwandeln:
+
+    python jam_journal.py otto_jammel otto_mind
+
+Mit Segment-Rotation wird die aktive Datei ab einer Größe oder einem Alter
+versiegelt und komprimiert in <name>.jam.segments/ abgelegt; ein Manifest hält
+Zeitbereich und Anzahl Einträge jedes Segments fest. Kleine Segmente lassen
+sich zusammenfassen:
+
+    python jam_journal.py compact otto_jammel otto_mind
+"""
+
+import gzip
+import json
+import os
+import re
+import sys
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+try:
+    import fcntl
+except ImportError:
+    # Ohne fcntl (Windows) schützt nur der Lock innerhalb eines Prozesses
+    fcntl = None
+
+# Blockgröße beim Rückwärtslesen vom Dateiende
+TAIL_BLOCK = 8192
+
+# Jeder so vielte Eintrag landet im Zeitstempel-Index (Zeitstempel -> Byte-Offset)
+INDEX_INTERVAL = 64
+
+# Standard-Rotation (unkomprimierte Größe bzw. Alter des ältesten Eintrags der aktiven Datei)
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+DEFAULT_SEGMENT_AGE = timedelta(days=7)
+
+# Komprimierung versiegelter Segmente -> Dateiendung
+SEGMENT_COMPRESSION = {"gzip": ".gz", "lzma": ".xz", None: ""}
+
+# Segmentdatei: erste und letzte Rotationsnummer (nach Kompaktierung mehrere)
+SEGMENT_NAME = re.compile(r"^(\d{6,})-(\d{6,})\.jam(\.gz|\.xz)?$")
+
+# Format des Segment-Manifests; bei Änderungen hochzählen
+MANIFEST_FORMAT = 1
+
+# Wie oft ein Lesezugriff neu ansetzt, wenn ein anderer Prozess Segmente ersetzt hat
+SEGMENT_READ_ATTEMPTS = 3
+
+
+def _timestamp_key(value: Union[str, datetime, None]) -> Optional[str]:
+    """ISO-Zeitstempel als vergleichbarer String (Einträge nutzen datetime.isoformat())"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _decode_line(line: bytes) -> Optional[Dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line.decode("utf-8"))
+    except ValueError:
+        # Abgeschnittene Zeile nach einem Absturz
+        return None
+
+
+def _segment_sequence(name: str) -> Tuple[int, int]:
+    match = SEGMENT_NAME.match(name)
+    return int(match.group(1)), int(match.group(2))
+
+
+def _open_segment(path: Path, mode: str = "rb"):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode)
+    if path.suffix == ".xz":
+        return lzma.open(path, mode)
+    return open(path, mode)
+
+
+class JamSegments:
+    """Versiegelte Segmente eines Journals mit Manifest (Zeitbereich, Einträge, Größe)
+
+    Das Manifest ist nur ein Verzeichnis der Segmentdateien: nicht aufgeführte
+    Segmente (Abbruch während Rotation oder Kompaktierung) werden beim Laden
+    übernommen. Nur Schreiber (seal, compact) löschen überholte Teilstücke und
+    schreiben das Manifest, und zwar unter einem Datei-Lock (.lock), damit
+    mehrere Prozesse sich nicht gegenseitig Dateien entziehen.
+    """
+
+    def __init__(self, directory, compression: Optional[str] = "gzip"):
+        if compression not in SEGMENT_COMPRESSION:
+            raise ValueError(f"Unbekannte Komprimierung: {compression}")
+        if compression == "lzma" and lzma is None:
+            raise ValueError("lzma ist in dieser Python-Installation nicht verfügbar")
+        self.directory = Path(directory)
+        self.compression = compression
+        self.manifest_path = self.directory / "manifest.json"
+        self._segments: Optional[List[Dict[str, Any]]] = None
+        self._manifest_mtime = None
+
+    def _mtime(self):
+        try:
+            return self.manifest_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Segmente in Zeit-Reihenfolge (Manifest-Einträge; neu geladen, wenn ein anderer Prozess es geändert hat)"""
+        mtime = self._mtime()
+        if self._segments is None or mtime != self._manifest_mtime:
+            self._segments = self._load()
+            self._manifest_mtime = mtime
+        return self._segments
+
+    def invalidate(self):
+        """Verwirft die geladene Liste (z.B. nachdem eine Segmentdatei verschwunden ist)"""
+        self._segments = None
+
+    @contextmanager
+    def _writer_lock(self):
+        """Exklusiver Schreibzugriff über Prozessgrenzen; lädt die Segmentliste frisch und räumt auf"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                self._segments = self._load(cleanup=True)
+                self._manifest_mtime = self._mtime()
+                yield self._segments
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def overlapping(self, start: Optional[str], end: Optional[str]) -> List[Dict[str, Any]]:
+        """Segmente, deren Zeitbereich [start, end) berührt (ohne Zeitstempel: immer)"""
+        return [info for info in self.list()
+                if info["first"] is None
+                or ((end is None or info["first"] < end) and (start is None or info["last"] >= start))]
+
+    def _load(self, cleanup: bool = False) -> List[Dict[str, Any]]:
+        """Segmentliste aus Manifest und Verzeichnis; cleanup (nur unter _writer_lock) löscht Überholtes"""
+        if not self.directory.is_dir():
+            return []
+        known = {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("format") == MANIFEST_FORMAT:
+                known = {info["file"]: info for info in manifest["segments"]}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+
+        files = [path for path in self.directory.iterdir() if SEGMENT_NAME.match(path.name)]
+        # Größter Bereich und komprimierte Fassung zuerst: sie überholen Teilstücke
+        files.sort(key=lambda path: (_segment_sequence(path.name)[0], -_segment_sequence(path.name)[1],
+                                     path.suffix == ".jam"))
+        segments = []
+        covered = 0
+        for path in files:
+            first, last = _segment_sequence(path.name)
+            if first <= covered:
+                if cleanup:
+                    path.unlink(missing_ok=True)
+                continue
+            segments.append(known.get(path.name) or self._scan(path))
+            covered = last
+
+        if cleanup and [info["file"] for info in segments] != list(known):
+            self._save(segments)
+        return segments
+
+    def _scan(self, path: Path) -> Dict[str, Any]:
+        entries = self._read_path(path)
+        timestamps = [entry["timestamp"] for entry in entries
+                      if isinstance(entry, dict) and isinstance(entry.get("timestamp"), str)]
+        with _open_segment(path) as f:
+            raw_bytes = sum(len(line) for line in f)
+        return {
+            "file": path.name,
+            "first": min(timestamps) if timestamps else None,
+            "last": max(timestamps) if timestamps else None,
+            "entries": len(entries),
+            "bytes": raw_bytes,
+            "stored_bytes": path.stat().st_size
+        }
+
+    def _save(self, segments: List[Dict[str, Any]]):
+        tmp_path = self.manifest_path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": MANIFEST_FORMAT, "segments": segments}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_mtime = self._mtime()
+
+    @staticmethod
+    def _read_path(path: Path) -> List[Dict[str, Any]]:
+        with _open_segment(path) as f:
+            return [entry for entry in map(_decode_line, f) if entry is not None]
+
+    def read(self, info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Alle Einträge eines Segments"""
+        return self._read_path(self.directory / info["file"])
+
+    def seal(self, active_path: Path) -> Dict[str, Any]:
+        """Versiegelt die aktive Datei als nächstes Segment und komprimiert es"""
+        with self._writer_lock() as segments:
+            sequence = _segment_sequence(segments[-1]["file"])[1] + 1 if segments else 1
+            raw_path = self.directory / f"{sequence:06d}-{sequence:06d}.jam"
+            # Ab dem Umbenennen ist das Segment versiegelt (wird notfalls beim Laden übernommen)
+            os.replace(active_path, raw_path)
+            info = self._scan(raw_path)
+            if self.compression is not None:
+                info["file"] = self._write_segment(raw_path.name, [raw_path])
+                info["stored_bytes"] = (self.directory / info["file"]).stat().st_size
+                raw_path.unlink(missing_ok=True)
+            segments.append(info)
+            self._save(segments)
+            return info
+
+    def _write_segment(self, raw_name: str, sources: List[Path]) -> str:
+        """Schreibt die Zeilen der Quell-Segmente atomar in ein (komprimiertes) Segment"""
+        name = raw_name + SEGMENT_COMPRESSION[self.compression]
+        tmp_path = self.directory / f"{name}.tmp{os.getpid()}"
+        if self.compression == "gzip":
+            target = gzip.open(tmp_path, "wb")
+        elif self.compression == "lzma":
+            target = lzma.open(tmp_path, "wb")
+        else:
+            target = open(tmp_path, "wb")
+        with target:
+            for source in sources:
+                with _open_segment(source) as f:
+                    for line in f:
+                        target.write(line if line.endswith(b"\n") else line + b"\n")
+        os.replace(tmp_path, self.directory / name)
+        return name
+
+    def compact(self, max_bytes: int = DEFAULT_SEGMENT_BYTES) -> int:
+        """Fasst aufeinanderfolgende kleine Segmente bis max_bytes (unkomprimiert) zusammen
+
+        Gibt die Anzahl eingesparter Segmente zurück.
+        """
+        if not self.directory.is_dir():
+            return 0
+        with self._writer_lock() as segments:
+            return self._compact(segments, max_bytes)
+
+    def _compact(self, segments: List[Dict[str, Any]], max_bytes: int) -> int:
+        groups = []
+        for info in segments:
+            if groups and sum(member["bytes"] for member in groups[-1]) + info["bytes"] <= max_bytes:
+                groups[-1].append(info)
+            else:
+                groups.append([info])
+
+        merged_segments = []
+        obsolete = []
+        for group in groups:
+            if len(group) == 1:
+                merged_segments.append(group[0])
+                continue
+            first = _segment_sequence(group[0]["file"])[0]
+            last = _segment_sequence(group[-1]["file"])[1]
+            name = self._write_segment(f"{first:06d}-{last:06d}.jam",
+                                       [self.directory / member["file"] for member in group])
+            timestamps = [member[key] for member in group for key in ("first", "last") if member[key] is not None]
+            merged_segments.append({
+                "file": name,
+                "first": min(timestamps) if timestamps else None,
+                "last": max(timestamps) if timestamps else None,
+                "entries": sum(member["entries"] for member in group),
+                "bytes": sum(member["bytes"] for member in group),
+                "stored_bytes": (self.directory / name).stat().st_size
+            })
+            obsolete.extend(member["file"] for member in group)
+
+        if obsolete:
+            self._segments = merged_segments
+            self._save(merged_segments)
+            for name in obsolete:
+                (self.directory / name).unlink(missing_ok=True)
+        return len(segments) - len(merged_segments)
+
+
+class JamJournal:
+    """Eine .jam-Datei: JSON Lines zum Anhängen, Lesen auch im alten Array-Format
+
+    Eine unvollständige letzte Zeile (Absturz beim Schreiben) wird beim Lesen
+    übersprungen und beim nächsten Anhängen mit einem Zeilenumbruch abgeschlossen.
+    Zeitbereiche setzen voraus, dass Einträge in Zeit-Reihenfolge angehängt werden.
+    Mit writer (WriteBehindWriter) schreibt append im Hintergrund; die Lesemethoden
+    enthalten die noch ausstehenden Einträge. Mit max_segment_bytes und/oder
+    max_segment_age wird die aktive Datei beim Schreiben rotiert (siehe JamSegments).
+    """
+
+    def __init__(self, path, writer=None, max_segment_bytes: int = None, max_segment_age: timedelta = None,
+                 compression: Optional[str] = "gzip"):
+        self.path = Path(path)
+        self.writer = writer
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.segments = JamSegments(self.path.with_name(f"{self.path.name}.segments"), compression)
+        self.lock = threading.RLock()
+        self._terminated = False
+        # Zeitstempel des ersten Eintrags der aktiven Datei (für die Alters-Rotation)
+        self._active_first: Optional[str] = None
+        # Dünn besetzter Index (Zeitstempel, Byte-Offset), inkrementell bis _indexed_size
+        self._index: List[Tuple[str, int]] = []
+        self._indexed_size = 0
+        self._unindexed = INDEX_INTERVAL
+
+    def exists(self) -> bool:
+        with self.lock:
+            return self.path.exists() or bool(self.segments.list())
+
+    def is_legacy(self) -> bool:
+        """Liegt die Datei noch im alten Format (JSON-Array) vor"""
+        try:
+            with open(self.path, "rb") as f:
+                return f.read(64).lstrip()[:1] == b"["
+        except OSError:
+            return False
+
+    def migrate(self) -> int:
+        """Wandelt eine Array-Datei atomar in JSON Lines um; gibt die Anzahl umgewandelter Einträge zurück
+
+        Eine beschädigte Array-Datei wird als .corrupt beiseitegelegt statt überschrieben.
+        """
+        with self.lock:
+            if not self.is_legacy():
+                return 0
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if not isinstance(entries, list):
+                    raise ValueError("kein JSON-Array")
+            except ValueError as e:
+                corrupt_path = self.path.with_suffix(f"{self.path.suffix}.corrupt")
+                os.replace(self.path, corrupt_path)
+                print(f"⚠️  {self.path.name} nicht lesbar ({e}), verschoben nach {corrupt_path.name}")
+                return 0
+
+            tmp_path = self.path.with_suffix(f"{self.path.suffix}.tmp{os.getpid()}")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(self.encode(entry))
+            os.replace(tmp_path, self.path)
+            self._terminated = True
+            self._reset_index()
+            return len(entries)
+
+    @staticmethod
+    def encode(entry: Dict[str, Any]) -> str:
+        return json.dumps(entry, ensure_ascii=False) + "\n"
+
+    def append(self, entry: Dict[str, Any]):
+        """Hängt einen Eintrag als eine Zeile an (Kosten unabhängig von der Dateigröße)"""
+        if self.writer is not None:
+            self.writer.append(self, entry)
+        else:
+            self.write_entries([entry])
+
+    def write_entries(self, entries: List[Dict[str, Any]], fsync: bool = False):
+        """Hängt mehrere Einträge in einem Schreibvorgang an"""
+        with self.lock:
+            if not self._terminated:
+                if self.is_legacy():
+                    self.migrate()
+                self._terminate_last_line()
+            self._rotate_if_due()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(self.encode(entry) for entry in entries))
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def _rotate_if_due(self):
+        if not self.max_segment_bytes and not self.max_segment_age:
+            return
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return
+        if size == 0:
+            return
+        due = bool(self.max_segment_bytes) and size >= self.max_segment_bytes
+        if not due and self.max_segment_age:
+            if self._active_first is None:
+                with open(self.path, "rb") as f:
+                    first = _decode_line(f.readline())
+                timestamp = first.get("timestamp") if isinstance(first, dict) else None
+                self._active_first = timestamp if isinstance(timestamp, str) else ""
+            due = "" < self._active_first < (datetime.now() - self.max_segment_age).isoformat()
+        if due:
+            self.rotate()
+
+    def rotate(self) -> Optional[Dict[str, Any]]:
+        """Versiegelt die aktive Datei als Segment; gibt dessen Manifest-Eintrag zurück (None wenn leer)"""
+        with self.lock:
+            if self.is_legacy():
+                self.migrate()
+            try:
+                if self.path.stat().st_size == 0:
+                    return None
+            except OSError:
+                return None
+            info = self.segments.seal(self.path)
+            self._terminated = True
+            self._active_first = None
+            self._reset_index()
+            return info
+
+    def compact(self, max_bytes: int = None) -> int:
+        """Fasst kleine Segmente zusammen; gibt die Anzahl eingesparter Segmente zurück"""
+        with self.lock:
+            return self.segments.compact(max_bytes or self.max_segment_bytes or DEFAULT_SEGMENT_BYTES)
+
+    def _read_segments(self, read):
+        """Führt read() aus; verschwindet dabei ein Segment (anderer Prozess kompaktiert), neu ansetzen"""
+        for attempt in range(SEGMENT_READ_ATTEMPTS):
+            try:
+                return read()
+            except FileNotFoundError:
+                if attempt == SEGMENT_READ_ATTEMPTS - 1:
+                    raise
+                self.segments.invalidate()
+
+    def _pending(self) -> List[Dict[str, Any]]:
+        return self.writer.pending(self) if self.writer is not None else []
+
+    def _terminate_last_line(self):
+        try:
+            with open(self.path, "rb+") as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+        except FileNotFoundError:
+            pass
+        self._terminated = True
+
+    def read_all(self) -> List[Dict[str, Any]]:
+        """Alle Einträge in Schreib-Reihenfolge (beide Formate)"""
+        with self.lock:
+            sealed = self._read_segments(
+                lambda: [entry for info in self.segments.list() for entry in self.segments.read(info)])
+            return sealed + self._read_file() + self._pending()
+
+    def _read_file(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except OSError:
+            return []
+
+        if content.lstrip()[:1] == "[":
+            try:
+                entries = json.loads(content)
+            except ValueError:
+                return []
+            return entries if isinstance(entries, list) else []
+
+        entries = []
+        for line in content.encode("utf-8").split(b"\n"):
+            entry = _decode_line(line)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+    def read_last(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Die letzten limit Einträge (wie read_all()[-limit:])
+
+        Liest blockweise rückwärts vom Dateiende und dekodiert nur die benötigten
+        Zeilen: die Kosten hängen von limit ab, nicht von der Dateigröße.
+        """
+        if limit <= 0:
+            return self.read_all()[-limit:]
+        with self.lock:
+            pending = self._pending()[-limit:]
+            needed = limit - len(pending)
+            if needed == 0:
+                return pending
+            if self.is_legacy():
+                entries = self._read_file()[-needed:]
+            else:
+                entries = self._read_tail(needed)
+            # Reicht die aktive Datei nicht, die jüngsten Segmente dazunehmen
+            if len(entries) < needed:
+                entries = self._read_segments(lambda: self._read_sealed_tail(needed - len(entries))) + entries
+            return entries + pending
+
+    def _read_sealed_tail(self, limit: int) -> List[Dict[str, Any]]:
+        entries = []
+        for info in reversed(self.segments.list()):
+            if len(entries) >= limit:
+                break
+            entries = self.segments.read(info)[-(limit - len(entries)):] + entries
+        return entries
+
+    def _read_tail(self, limit: int) -> List[Dict[str, Any]]:
+        entries = []
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return []
+        with f:
+            position = f.seek(0, os.SEEK_END)
+            remainder = b""
+            while position > 0 and len(entries) < limit:
+                step = min(TAIL_BLOCK, position)
+                position -= step
+                f.seek(position)
+                lines = (f.read(step) + remainder).split(b"\n")
+                # Die erste Zeile des Blocks ist evtl. unvollständig: mit dem nächsten Block lesen
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    entry = _decode_line(line)
+                    if entry is not None:
+                        entries.append(entry)
+                        if len(entries) == limit:
+                            break
+            if position == 0 and len(entries) < limit:
+                entry = _decode_line(remainder)
+                if entry is not None:
+                    entries.append(entry)
+
+        entries.reverse()
+        return entries
+
+    def read_range(self, start: Union[str, datetime] = None, end: Union[str, datetime] = None) -> List[Dict[str, Any]]:
+        """Einträge mit start <= timestamp < end (ISO-Strings oder datetime, None = offen)
+
+        Öffnet nur Segmente, deren Zeitbereich laut Manifest passt; in der aktiven
+        Datei springt der Zeitstempel-Index direkt in die Nähe von start und liest
+        ab dort vorwärts, bis end erreicht ist.
+        """
+        start, end = _timestamp_key(start), _timestamp_key(end)
+        with self.lock:
+            entries = self._read_segments(
+                lambda: [entry for info in self.segments.overlapping(start, end)
+                         for entry in self.segments.read(info) if self._in_range(entry, start, end)])
+            if self.is_legacy():
+                entries += [entry for entry in self._read_file() if self._in_range(entry, start, end)]
+            else:
+                entries += self._read_file_range(start, end)
+            return entries + [entry for entry in self._pending() if self._in_range(entry, start, end)]
+
+    def _read_file_range(self, start: Optional[str], end: Optional[str]) -> List[Dict[str, Any]]:
+        offset = self.find_offset(start) if start is not None else 0
+        entries = []
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return []
+        with f:
+            f.seek(offset)
+            for line in f:
+                entry = _decode_line(line)
+                if entry is None:
+                    continue
+                timestamp = entry.get("timestamp") if isinstance(entry, dict) else None
+                if not isinstance(timestamp, str):
+                    continue
+                if end is not None and timestamp >= end:
+                    break
+                if start is None or timestamp >= start:
+                    entries.append(entry)
+        return entries
+
+    @staticmethod
+    def _in_range(entry: Any, start: Optional[str], end: Optional[str]) -> bool:
+        timestamp = entry.get("timestamp") if isinstance(entry, dict) else None
+        if not isinstance(timestamp, str):
+            return False
+        return (start is None or timestamp >= start) and (end is None or timestamp < end)
+
+    def find_offset(self, timestamp: Union[str, datetime]) -> int:
+        """Byte-Offset einer Zeile vor dem ersten Eintrag mit diesem Zeitstempel (Startpunkt zum Vorwärtslesen)"""
+        timestamp = _timestamp_key(timestamp)
+        with self.lock:
+            self._update_index()
+            position = bisect_left(self._index, (timestamp, -1))
+            return self._index[position - 1][1] if position else 0
+
+    def _reset_index(self):
+        self._index = []
+        self._indexed_size = 0
+        self._unindexed = INDEX_INTERVAL
+
+    def _update_index(self):
+        """Indiziert nur den seit dem letzten Aufruf angehängten Teil der Datei"""
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            self._reset_index()
+            return
+        if size < self._indexed_size:
+            # Datei wurde ersetzt (z.B. Migration durch einen anderen Prozess)
+            self._reset_index()
+        if size == self._indexed_size:
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(self._indexed_size)
+            offset = self._indexed_size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Noch nicht fertig geschriebene Zeile: beim nächsten Mal
+                    break
+                self._unindexed += 1
+                if self._unindexed > INDEX_INTERVAL:
+                    entry = _decode_line(line)
+                    timestamp = entry.get("timestamp") if isinstance(entry, dict) else None
+                    if isinstance(timestamp, str) and (not self._index or timestamp >= self._index[-1][0]):
+                        self._index.append((timestamp, offset))
+                        self._unindexed = 0
+                offset += len(line)
+            self._indexed_size = offset
+
+
+def migrate_directory(directory) -> Dict[str, int]:
+    """Wandelt alle .jam-Dateien eines Verzeichnisses um; Dateiname -> Anzahl umgewandelter Einträge"""
+    results = {}
+    for path in sorted(Path(directory).glob("*.jam")):
+        journal = JamJournal(path)
+        if journal.is_legacy():
+            results[path.name] = journal.migrate()
+    return results
+
+
+def compact_directory(directory, max_bytes: int = DEFAULT_SEGMENT_BYTES) -> Dict[str, int]:
+    """Fasst die Segmente aller Journale eines Verzeichnisses zusammen; Dateiname -> eingesparte Segmente"""
+    directory = Path(directory)
+    names = {path.name for path in directory.glob("*.jam")}
+    names.update(path.name[:-len(".segments")] for path in directory.glob("*.jam.segments") if path.is_dir())
+    return {name: JamJournal(directory / name).compact(max_bytes) for name in sorted(names)}
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    if arguments[:1] == ["compact"]:
+        for directory in arguments[1:] or ["otto_jammel", "otto_mind"]:
+            for name, removed in compact_directory(directory).items():
+                print(f"✅ {directory}/{name}: {removed} Segmente zusammengefasst")
+    else:
+        for directory in arguments or ["otto_jammel", "otto_mind"]:
+            for name, count in migrate_directory(directory).items():
+                print(f"✅ {directory}/{name}: {count} Einträge umgewandelt")
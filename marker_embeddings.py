@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Marker Embeddings
+=================
+Semantische Suche über die Marker-Beispiele (findet auch Umschreibungen)
+Alle Beispiele werden beim Laden zu einer normalisierten float32-Matrix
+eingebettet; eine Äußerung kostet ein Matrix-Vektor-Produkt plus argpartition.
+Das Embedding-Backend ist austauschbar: sentence-transformers, falls
+installiert, sonst ein abhängigkeitsfreier Hashing-Vektorisierer.
+"""
+
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+WORD = re.compile(r"\w+")
+
+# Mehrsprachiges Modell: die Marker-Beispiele sind überwiegend deutsch
+DEFAULT_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# Format der Embedding-Datei; bei Änderungen hochzählen
+EMBEDDING_FORMAT = 1
+
+# Trennzeichen der Beispiel-Texte in der Embedding-Datei (ASCII Unit Separator)
+TEXT_SEPARATOR = "\x1f"
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class HashingEmbedder:
+    """Abhängigkeitsfreies Backend: Wörter und Zeichen-Trigramme per CRC32 in dim Buckets
+
+    Vorzeichen-Hashing hält Kollisionen erwartungstreu bei null; die Trigramme
+    machen ähnliche Wortformen ("gerissen"/"zerrissen") ähnlich. Für echte
+    Umschreibungen ist sentence-transformers deutlich besser.
+    """
+
+    def __init__(self, dim: int = 256, trigram_weight: float = 0.5):
+        self.dim = dim
+        self.trigram_weight = trigram_weight
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str):
+        for word in WORD.findall(text.lower()):
+            yield word, 1.0
+            padded = f" {word} "
+            for i in range(len(padded) - 2):
+                yield padded[i:i + 3], self.trigram_weight
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            buckets = []
+            weights = []
+            for feature, weight in self._features(text):
+                h = zlib.crc32(feature.encode("utf-8"))
+                buckets.append(h % self.dim)
+                weights.append(weight if h & 0x80000000 else -weight)
+            if buckets:
+                matrix[row] = np.bincount(buckets, weights, minlength=self.dim)
+        return _normalize_rows(matrix)
+
+
+class SentenceTransformerEmbedder:
+    """Backend mit sentence-transformers (das Modell wird beim Erzeugen geladen)"""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.name = f"st-{model_name.replace('/', '_')}"
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self.model.encode(list(texts), convert_to_numpy=True, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+
+def create_embedder(backend: str = "auto", model_name: str = DEFAULT_MODEL):
+    """Erzeugt ein Backend: "auto" (sentence-transformers, sonst Hashing), "sentence-transformers" oder "hashing"
+
+    Ein eigenes Backend braucht nur encode(texts) -> normalisierte float32-Matrix
+    und einen eindeutigen name (Schlüssel der Embedding-Datei).
+    """
+    if backend == "hashing":
+        return HashingEmbedder()
+    if backend not in ("auto", "sentence-transformers"):
+        raise ValueError(f"Unbekanntes Embedding-Backend: {backend}")
+    try:
+        return SentenceTransformerEmbedder(model_name)
+    except Exception as e:
+        # ImportError, aber auch ein Modell, das offline nicht geladen werden kann
+        if backend != "auto":
+            raise
+        print(f"⚠️  sentence-transformers nicht verfügbar ({type(e).__name__}), nutze Hashing-Embeddings")
+        return HashingEmbedder()
+
+
+class MarkerEmbeddingIndex:
+    """Normalisierte Embedding-Matrix aller Marker-Beispiele mit Top-k-Abfrage
+
+    Mit cache_path werden die Vektoren neben dem Index-Cache gespeichert; beim
+    nächsten Aufbau werden nur neue oder geänderte Beispiele eingebettet.
+    """
+
+    def __init__(self, embedder, cache_path=None):
+        self.embedder = embedder
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.entries: List[Tuple[str, int, str]] = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.encoded = 0
+
+    def build(self, entries: List[Tuple[str, int, str]]):
+        """Bettet die Beispiele (Marker, Index, Text) ein; bekannte Texte kommen aus dem Cache"""
+        self.entries = list(entries)
+        texts = [text for _, _, text in self.entries]
+        cached = self._load_cache()
+
+        missing = sorted({text for text in texts if text not in cached})
+        if missing:
+            for text, vector in zip(missing, self.embedder.encode(missing)):
+                cached[text] = vector
+        self.encoded = len(missing)
+
+        if texts:
+            self.matrix = np.ascontiguousarray(np.stack([cached[text] for text in texts]), dtype=np.float32)
+        else:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+        if missing or len(cached) != len(set(texts)):
+            self._save_cache(texts)
+
+    def query(self, text: str, top_k: int = 5, min_score: float = 0.0) -> List[Tuple[float, int]]:
+        """(Kosinus-Ähnlichkeit, Eintrags-Index) der top_k ähnlichsten Beispiele, absteigend"""
+        if not self.entries or top_k <= 0:
+            return []
+        scores = self.matrix @ self.embedder.encode([text])[0]
+        if len(scores) > top_k:
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        ranked = sorted(candidates.tolist(), key=lambda entry: (-scores[entry], entry))
+        return [(float(scores[entry]), entry) for entry in ranked if scores[entry] >= min_score]
+
+    def _load_cache(self) -> dict:
+        if self.cache_path is None:
+            return {}
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                if int(data["format"]) != EMBEDDING_FORMAT or str(data["backend"]) != self.embedder.name:
+                    return {}
+                texts = str(data["texts"]).split(TEXT_SEPARATOR)
+                matrix = data["matrix"]
+                if len(texts) != len(matrix):
+                    return {}
+                return dict(zip(texts, matrix))
+        except (OSError, KeyError, ValueError):
+            return {}
+
+    def _save_cache(self, texts: List[str]):
+        if self.cache_path is None:
+            return
+        unique = list(dict.fromkeys(texts))
+        rows = {text: index for index, text in enumerate(texts)}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".tmp{os.getpid()}")
+            with open(tmp_path, "wb") as f:
+                np.savez(f, format=np.int64(EMBEDDING_FORMAT), backend=np.str_(self.embedder.name),
+                         texts=np.str_(TEXT_SEPARATOR.join(unique)),
+                         matrix=self.matrix[[rows[text] for text in unique]] if unique else self.matrix)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️  Embeddings konnten nicht gespeichert werden: {e}")
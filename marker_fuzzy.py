@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Marker Fuzzy
+============
+Fehlertolerante Marker-Suche für ASR-Transkripte
+Kandidaten kommen aus einem Trigramm-Index über die Marker-Begriffe,
+bestätigt werden sie mit einer begrenzten Editierdistanz.
+"""
+
+import re
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+WORD = re.compile(r"\w+")
+
+# Längere Beispiele (ganze Sätze) werden nur exakt gesucht
+FUZZY_MAX_WORDS = 4
+
+# Ein unscharfer Treffer: wie MarkerHit, zusätzlich Editierdistanz und Ähnlichkeit (1 - Distanz / Länge)
+FuzzyHit = namedtuple("FuzzyHit", ["category", "term", "start", "end", "whole_word", "entry",
+                                   "distance", "similarity"])
+
+
+def normalize_term(text: str) -> str:
+    """Kleinschreibung, nur Wörter, durch einzelne Leerzeichen getrennt"""
+    return " ".join(WORD.findall(text.lower()))
+
+
+def trigrams(text: str) -> set:
+    """Zeichen-Trigramme des mit je einem Leerzeichen aufgefüllten Texts"""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Levenshtein-Distanz, falls sie höchstens max_distance beträgt, sonst None"""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+
+    # Nur ein Band der Breite 2 * max_distance + 1 um die Diagonale wird berechnet
+    limit = max_distance + 1
+    previous = [j if j <= max_distance else limit for j in range(len(b) + 1)]
+    for i, ch in enumerate(a, 1):
+        current = [limit] * (len(b) + 1)
+        if i <= max_distance:
+            current[0] = i
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        row_min = current[low - 1]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (ch != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if cost > limit:
+                cost = limit
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_distance:
+            return None
+        previous = current
+
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else None
+
+
+class FuzzyMarkerIndex:
+    """Trigramm-Index über die Wörter der Marker-Begriffe mit Verifikation per begrenzter Editierdistanz
+
+    Ein Begriff mit n Wörtern passt auf n aufeinanderfolgende Wörter des Texts, wenn
+    jedes Wort innerhalb seiner eigenen Distanz liegt (kurze Wörter nur exakt) und
+    der ganze Abschnitt höchstens k vom Begriff entfernt ist, mit
+    k = min(max_distance, Länge * (1 - min_similarity)).
+
+    Kandidaten entstehen nur über unscharf erkannte Wörter: jede Editieroperation
+    zerstört höchstens drei Trigramme, ein Wort mit Distanz k teilt also mindestens
+    eines seiner 3k + 1 seltensten Trigramme mit dem Text-Wort; nur diese werden
+    indexiert. Die Zuordnung Text-Wort -> ähnliche Wörter wird zwischengespeichert,
+    weil gesprochene Sprache dieselben Wörter ständig wiederholt.
+    """
+
+    def __init__(self, max_distance: int = 2, min_similarity: float = 0.75, min_length: int = 4,
+                 max_words: int = FUZZY_MAX_WORDS, cache_size: int = 20000):
+        self.max_distance = max_distance
+        self.min_similarity = min_similarity
+        self.min_length = min_length
+        self.max_words = max_words
+        self.cache_size = cache_size
+        # (Kategorie, Begriff, normalisierter Begriff, erlaubte Distanz, Wort-IDs)
+        self.entries: List[Tuple[str, str, str, int, Tuple[int, ...]]] = []
+        self.words: List[str] = []
+        self.word_ids: Dict[str, int] = {}
+        # Wort-ID -> (Eintrag, Position des Worts im Begriff)
+        self._occurrences: Dict[int, List[Tuple[int, int]]] = {}
+        # Länge -> Trigramm -> Wort-IDs
+        self._postings: Dict[int, Dict[str, List[int]]] = {}
+        self._similar: Dict[str, Dict[int, int]] = {}
+        # Wortanzahl des längsten unscharf gesuchten Begriffs (Fensterbreite beim Streaming)
+        self.max_term_words = 0
+        self.compiled = True
+
+    def budget(self, normalized: str) -> int:
+        """Erlaubte Editierdistanz eines Worts oder Begriffs (0 = nur exakt)"""
+        if len(normalized) < self.min_length:
+            return 0
+        budget = min(self.max_distance, int(len(normalized) * (1.0 - self.min_similarity) + 1e-9))
+        # Trigramm-Filter bleibt verlustfrei, solange mindestens ein Trigramm übrig bleibt
+        return max(0, min(budget, (len(normalized) - 1) // 3))
+
+    def add(self, category: str, term: str) -> int:
+        """Fügt einen Begriff hinzu und gibt den Eintrags-Index zurück (wie MarkerAutomaton.add)"""
+        if not term:
+            return -1
+
+        normalized = normalize_term(term)
+        budget = self.budget(normalized) if normalized else 0
+        words = normalized.split()
+
+        entry = len(self.entries)
+        word_ids = ()
+        if budget and len(words) <= self.max_words:
+            word_ids = tuple(self._word_id(word) for word in words)
+            self.max_term_words = max(self.max_term_words, len(word_ids))
+            for offset, word_id in enumerate(word_ids):
+                self._occurrences.setdefault(word_id, []).append((entry, offset))
+            self.compiled = False
+        self.entries.append((category, term, normalized, budget, word_ids))
+        return entry
+
+    def add_all(self, category: str, terms):
+        """Fügt alle Begriffe einer Kategorie hinzu"""
+        for term in terms:
+            self.add(category, term)
+
+    def _word_id(self, word: str) -> int:
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            word_id = len(self.words)
+            self.words.append(word)
+            self.word_ids[word] = word_id
+        return word_id
+
+    def compile(self):
+        """Indexiert pro Wort die 3k + 1 Trigramme, die unter allen Wörtern am seltensten sind"""
+        word_grams = [trigrams(word) for word in self.words]
+        frequency: Dict[str, int] = {}
+        for grams in word_grams:
+            for gram in grams:
+                frequency[gram] = frequency.get(gram, 0) + 1
+
+        postings: Dict[int, Dict[str, List[int]]] = {}
+        for word_id, (word, grams) in enumerate(zip(self.words, word_grams)):
+            budget = self.budget(word)
+            if not budget:
+                continue
+            by_gram = postings.setdefault(len(word), {})
+            for gram in sorted(grams, key=lambda gram: (frequency[gram], gram))[:3 * budget + 1]:
+                by_gram.setdefault(gram, []).append(word_id)
+
+        self._postings = postings
+        self._similar = {}
+        self.compiled = True
+
+    def similar_words(self, token: str) -> Dict[int, int]:
+        """Wort-IDs mit Distanz > 0 innerhalb der Distanz des jeweiligen Worts"""
+        similar = self._similar.get(token)
+        if similar is not None:
+            return similar
+
+        similar = {}
+        length = len(token)
+        grams = None
+        candidates = set()
+        for word_length in range(length - self.max_distance, length + self.max_distance + 1):
+            by_gram = self._postings.get(word_length)
+            if by_gram is None:
+                continue
+            if grams is None:
+                grams = trigrams(token)
+            for gram in grams:
+                found = by_gram.get(gram)
+                if found:
+                    candidates.update(found)
+
+        for word_id in candidates:
+            word = self.words[word_id]
+            if word == token:
+                continue
+            distance = bounded_edit_distance(token, word, self.budget(word))
+            if distance is not None:
+                similar[word_id] = distance
+
+        if len(self._similar) >= self.cache_size:
+            self._similar.clear()
+        self._similar[token] = similar
+        return similar
+
+    def find(self, text_lower: str, start: int = 0) -> List[FuzzyHit]:
+        """Unscharfe Treffer (Distanz > 0) im kleingeschriebenen Text, sortiert nach Position
+
+        Mit start wird erst ab dieser Position (einem Wortanfang) gesucht; Spans bleiben
+        auf den ganzen Text bezogen.
+        """
+        if not self.compiled:
+            self.compile()
+        if not self._postings:
+            return []
+
+        tokens = [(match.start(), match.end(), match.group()) for match in WORD.finditer(text_lower, start)]
+        exact = [self.word_ids.get(token) for _, _, token in tokens]
+        similar = [self.similar_words(token) for _, _, token in tokens]
+        entries = self.entries
+        hits = []
+        checked = set()
+
+        for position, candidates in enumerate(similar):
+            for word_id in candidates:
+                for entry, offset in self._occurrences.get(word_id, ()):
+                    first = position - offset
+                    if (entry, first) in checked:
+                        continue
+                    checked.add((entry, first))
+
+                    category, term, normalized, budget, word_ids = entries[entry]
+                    last = first + len(word_ids) - 1
+                    if first < 0 or last >= len(tokens):
+                        continue
+                    if not all(exact[first + index] == expected or expected in similar[first + index]
+                               for index, expected in enumerate(word_ids)):
+                        continue
+
+                    window = " ".join(token for _, _, token in tokens[first:last + 1])
+                    if first == last:
+                        distance = candidates[word_id]
+                    else:
+                        distance = bounded_edit_distance(window, normalized, budget)
+                    if not distance:
+                        continue
+                    similarity = 1.0 - distance / max(len(normalized), len(window))
+                    if similarity >= self.min_similarity:
+                        hits.append(FuzzyHit(category, term, tokens[first][0], tokens[last][1], True, entry,
+                                             distance, similarity))
+
+        hits.sort(key=lambda hit: (hit.start, hit.end, hit.entry))
+        return hits
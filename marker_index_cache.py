@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Marker Index Cache
+==================
+Kompilierter Index der Marker-Bibliothek auf der Festplatte
+Unveränderte Dateien werden aus einem binären Schnappschuss geladen,
+nur geänderte Dateien werden erneut geparst.
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Format des Schnappschusses; bei Änderungen hochzählen
+CACHE_FORMAT = 1
+CACHE_MAGIC = b"OTTOMIX"
+
+DEFAULT_CACHE_DIR = Path.home() / "Documents" / "Otto_Mind_System" / "Cache"
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+class MarkerIndexCache:
+    """Parse-Ergebnisse pro Marker-Datei, geschlüsselt nach Pfad, Größe, mtime und Inhalts-Hash
+
+    namespace trennt Loader mit unterschiedlichen Parsern, parser_version
+    verwirft den Cache, wenn sich ein Parser ändert.
+    """
+
+    def __init__(self, source_dir, namespace: str, parser_version: int = 1, cache_dir=None):
+        self.source_dir = Path(source_dir).resolve()
+        self.namespace = namespace
+        self.parser_version = parser_version
+        cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        source_key = hashlib.sha1(str(self.source_dir).encode("utf-8")).hexdigest()[:12]
+        self.cache_path = cache_dir / f"{namespace}_{source_key}.idx"
+
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.seen = set()
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        """Liest den Schnappschuss; ein fehlender oder fremder Cache ergibt einen leeren Index"""
+        self.entries = {}
+        try:
+            with open(self.cache_path, "rb") as f:
+                if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                    return
+                header, entries = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+            return
+
+        if header == (CACHE_FORMAT, self.namespace, self.parser_version):
+            self.entries = entries
+
+    def lookup(self, path) -> Tuple[bool, Any, Optional[Tuple[int, int, str]]]:
+        """(Treffer, Ergebnis, Signatur): bei einem Fehlschlag die Signatur für store()"""
+        path = Path(path)
+        key = str(path.resolve())
+        self.seen.add(key)
+
+        stat = path.stat()
+        entry = self.entries.get(key)
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            self.hits += 1
+            return True, entry["result"], None
+
+        # Größe/mtime geändert: Inhalt vergleichen, bevor neu geparst wird (z.B. nach git checkout)
+        digest = file_digest(path.read_bytes())
+        if entry is not None and entry["sha1"] == digest:
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.dirty = True
+            self.hits += 1
+            return True, entry["result"], None
+
+        self.misses += 1
+        return False, None, (stat.st_size, stat.st_mtime_ns, digest)
+
+    def store(self, path, signature: Tuple[int, int, str], result: Any):
+        """Speichert ein neu geparstes Ergebnis mit der Signatur aus lookup()"""
+        size, mtime_ns, digest = signature
+        self.entries[str(Path(path).resolve())] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "sha1": digest,
+            "result": result
+        }
+        self.dirty = True
+
+    def load_file(self, path, parse: Callable[[Path], Any]) -> Any:
+        """Gibt das gecachte Ergebnis zurück oder parst die Datei neu"""
+        hit, result, signature = self.lookup(path)
+        if hit:
+            return result
+        result = parse(Path(path))
+        self.store(path, signature, result)
+        return result
+
+    def save(self, prune: bool = True) -> bool:
+        """Schreibt den Schnappschuss atomar; prune entfernt Dateien, die nicht mehr geladen wurden"""
+        if prune:
+            stale = [key for key in self.entries if key not in self.seen]
+            for key in stale:
+                del self.entries[key]
+            self.dirty = self.dirty or bool(stale)
+
+        if not self.dirty:
+            return False
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp_path, "wb") as f:
+            f.write(CACHE_MAGIC)
+            pickle.dump(((CACHE_FORMAT, self.namespace, self.parser_version), self.entries), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+        return True
+
+    def clear(self):
+        """Verwirft den Index (im Speicher und auf der Festplatte)"""
+        self.entries = {}
+        self.seen = set()
+        self.dirty = False
+        try:
+            self.cache_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cache_path": str(self.cache_path),
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Marker Loading
+==============
+Paralleles Laden der Marker-Bibliothek
+Verteilt das (CPU-lastige) YAML-Parsing auf einen Prozess-Pool,
+führt die Ergebnisse in Datei-Reihenfolge zusammen und sammelt
+Fehler pro Datei in einem Bericht.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from marker_index_cache import MarkerIndexCache
+
+# Unterhalb dieser Anzahl zu parsender Dateien kostet der Pool-Start mehr als er spart
+PARALLEL_MIN_FILES = 64
+
+
+class MarkerLoadReport:
+    """Bericht eines Ladevorgangs: geladene Dateien, Fehler pro Datei, Modus und Dauer"""
+
+    def __init__(self):
+        self.files = 0
+        self.loaded: List[str] = []
+        self.errors: List[Dict[str, str]] = []
+        self.cached = 0
+        self.parsed = 0
+        self.mode = "serial"
+        self.workers = 1
+        self.duration = 0.0
+
+    def add_error(self, path, error: str):
+        self.errors.append({"file": Path(path).name, "error": error})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "loaded": len(self.loaded),
+            "cached": self.cached,
+            "parsed": self.parsed,
+            "errors": list(self.errors),
+            "mode": self.mode,
+            "workers": self.workers,
+            "duration_ms": self.duration * 1000.0
+        }
+
+    def summary(self) -> str:
+        text = (f"{len(self.loaded)}/{self.files} Dateien geladen "
+                f"({self.cached} aus Cache, {self.parsed} geparst, {self.mode}"
+                f"{f' x{self.workers}' if self.mode == 'parallel' else ''}, {self.duration * 1000.0:.0f} ms)")
+        if self.errors:
+            text += f", {len(self.errors)} Fehler"
+        return text
+
+
+def available_cpus() -> int:
+    """Für diesen Prozess nutzbare CPUs (berücksichtigt CPU-Affinität)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def _parse_safely(parse: Callable[[Path], Any], path: Path) -> Tuple[bool, Any]:
+    """Läuft im Worker: Fehler werden als Text zurückgegeben statt den Pool abzubrechen"""
+    try:
+        return True, parse(path)
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+
+
+def _parse_serial(parse: Callable[[Path], Any], paths: List[Path]) -> List[Tuple[bool, Any]]:
+    return [_parse_safely(parse, path) for path in paths]
+
+
+def _parse_parallel(parse: Callable[[Path], Any], paths: List[Path], workers: int,
+                    chunksize: Optional[int]) -> List[Tuple[bool, Any]]:
+    if chunksize is None:
+        chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(partial(_parse_safely, parse), paths, chunksize=chunksize))
+
+
+def load_marker_files(paths: List[Path], parse: Callable[[Path], Any], cache: MarkerIndexCache = None,
+                      workers: int = None, chunksize: int = None,
+                      parallel_min_files: int = PARALLEL_MIN_FILES) -> Tuple[List[Tuple[Path, Any]], MarkerLoadReport]:
+    """Parst Marker-Dateien (seriell oder parallel) und gibt (Pfad, Ergebnis) in Eingabe-Reihenfolge zurück
+
+    parse muss eine Funktion auf Modulebene sein (für den Prozess-Pool picklebar).
+    Unveränderte Dateien kommen aus dem Index-Cache, nur der Rest wird geparst.
+    """
+    started = time.perf_counter()
+    report = MarkerLoadReport()
+    report.files = len(paths)
+    results: List[Optional[Tuple[bool, Any]]] = [None] * len(paths)
+
+    # Cache-Abfrage im Hauptprozess (stat ist billig)
+    pending = []
+    signatures = {}
+    for index, path in enumerate(paths):
+        if cache is None:
+            pending.append(index)
+            continue
+        try:
+            hit, result, signature = cache.lookup(path)
+        except OSError as e:
+            results[index] = (False, f"{type(e).__name__}: {e}")
+            continue
+        if hit:
+            results[index] = (True, result)
+            report.cached += 1
+        else:
+            signatures[index] = signature
+            pending.append(index)
+
+    if workers is None:
+        workers = available_cpus()
+    pending_paths = [paths[index] for index in pending]
+    parsed = None
+    if workers > 1 and len(pending_paths) >= parallel_min_files:
+        try:
+            parsed = _parse_parallel(parse, pending_paths, min(workers, len(pending_paths)), chunksize)
+            report.mode = "parallel"
+            report.workers = min(workers, len(pending_paths))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # Kein Pool verfügbar (z.B. eingeschränkte Umgebung): seriell weiter
+            parsed = None
+    if parsed is None:
+        parsed = _parse_serial(parse, pending_paths)
+
+    for index, outcome in zip(pending, parsed):
+        results[index] = outcome
+        report.parsed += 1
+        if outcome[0] and cache is not None:
+            cache.store(paths[index], signatures[index], outcome[1])
+
+    loaded = []
+    for path, (ok, value) in zip(paths, results):
+        if ok:
+            loaded.append((path, value))
+            report.loaded.append(Path(path).name)
+        else:
+            report.add_error(path, value)
+
+    report.duration = time.perf_counter() - started
+    return loaded, report
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Marker Matcher
+==============
+Aho-Corasick-Automat für die Marker-Vokabulare
+Findet alle Vokabulare in einem einzigen Durchlauf über den Text,
+unabhängig davon, wie viele Einträge das Marker-Feld enthält.
+"""
+
+from bisect import bisect_left, insort
+from collections import deque, namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Ein Treffer: Kategorie, Begriff, Zeichen-Offsets im (kleingeschriebenen) Text,
+# ob der Treffer auf Wortgrenzen liegt und der Index des Vokabular-Eintrags
+MarkerHit = namedtuple("MarkerHit", ["category", "term", "start", "end", "whole_word", "entry"])
+
+
+def is_word_char(ch: str) -> bool:
+    """Prüft ob ein Zeichen zu einem Wort gehört"""
+    return ch.isalnum() or ch == "_"
+
+
+def remove_overlaps(hits: Iterable[MarkerHit]) -> List[MarkerHit]:
+    """Entfernt überlappende Treffer; längere (bei Gleichstand frühere) Treffer gewinnen"""
+    selected: List[MarkerHit] = []
+    taken: List[Tuple[int, int]] = []
+    for hit in sorted(hits, key=lambda hit: (hit.start - hit.end, hit.start, hit.entry)):
+        index = bisect_left(taken, (hit.start, hit.end))
+        if index and taken[index - 1][1] > hit.start:
+            continue
+        if index < len(taken) and taken[index][0] < hit.end:
+            continue
+        taken.insert(index, (hit.start, hit.end))
+        selected.append(hit)
+    selected.sort(key=lambda hit: (hit.start, hit.end))
+    return selected
+
+
+class MarkerAutomaton:
+    """Kompiliert beliebig viele Vokabulare zu einem Aho-Corasick-Automaten"""
+
+    def __init__(self, vocabularies: Dict[str, Iterable[str]] = None):
+        self.entries: List[Tuple[str, str]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._terminal: List[Tuple[int, ...]] = [()]
+        self.compiled = False
+
+        if vocabularies:
+            for category, terms in vocabularies.items():
+                self.add_all(category, terms)
+            self.compile()
+
+    def add(self, category: str, term: str) -> int:
+        """Fügt einen Begriff hinzu und gibt den Eintrags-Index zurück"""
+        term = term.lower()
+        if not term:
+            return -1
+
+        node = 0
+        for ch in term:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._terminal.append(())
+                self._goto[node][ch] = nxt
+            node = nxt
+
+        entry = len(self.entries)
+        self.entries.append((category, term))
+        self._terminal[node] = self._terminal[node] + (entry,)
+        self.compiled = False
+        return entry
+
+    def add_all(self, category: str, terms: Iterable[str]):
+        """Fügt alle Begriffe einer Kategorie hinzu"""
+        for term in terms:
+            self.add(category, term)
+
+    def compile(self):
+        """Berechnet Fehler-Links und Ausgaben (Breitensuche über den Trie)"""
+        goto = self._goto
+        fail = [0] * len(goto)
+        out = list(self._terminal)
+
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._fail = fail
+        self._out = out
+        self.compiled = True
+
+    def find_all(self, text_lower: str) -> List[MarkerHit]:
+        """Findet alle Treffer im bereits kleingeschriebenen Text"""
+        return self.find_from(text_lower)[0]
+
+    def find_from(self, text_lower: str, start: int = 0, node: int = 0) -> Tuple[List[MarkerHit], int]:
+        """Setzt die Suche ab Position start im Automaten-Zustand node fort (Streaming)"""
+        if not self.compiled:
+            self.compile()
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        entries = self.entries
+        length = len(text_lower)
+        hits = []
+
+        for i, ch in enumerate(text_lower[start:], start):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+
+            end = i + 1
+            for entry in out[node]:
+                category, term = entries[entry]
+                hit_start = end - len(term)
+                whole_word = (hit_start == 0 or not is_word_char(text_lower[hit_start - 1])) and \
+                             (end == length or not is_word_char(text_lower[end]))
+                hits.append(MarkerHit(category, term, hit_start, end, whole_word, entry))
+
+        return hits, node
+
+    def scan(self, text_lower: str) -> "MarkerScan":
+        """Durchsucht den Text und gruppiert die Treffer nach Kategorie"""
+        return MarkerScan(self, self.find_all(text_lower))
+
+
+class MarkerScan:
+    """Ergebnis eines Automaten-Durchlaufs, gruppiert nach Eintrag und Kategorie"""
+
+    def __init__(self, automaton: MarkerAutomaton, hits: List[MarkerHit]):
+        self.hits = hits
+        self.entries = automaton.entries
+
+        by_entry: Dict[int, List[MarkerHit]] = {}
+        for hit in hits:
+            by_entry.setdefault(hit.entry, []).append(hit)
+        self.by_entry = by_entry
+
+        # Einträge in Vokabular-Reihenfolge, damit Ergebnisse stabil bleiben
+        by_category: Dict[str, List[int]] = {}
+        for entry in sorted(by_entry):
+            by_category.setdefault(self.entries[entry][0], []).append(entry)
+        self.by_category = by_category
+        # Zwischenstand von count() pro Eintrag: (Anzahl, Ende des letzten gezählten, ausgewertete Vorkommen)
+        self._counts: Dict[int, Tuple[int, int, int]] = {}
+
+    def terms(self, category: str) -> List[str]:
+        """Gefundene Begriffe einer Kategorie in Vokabular-Reihenfolge"""
+        return [self.entries[entry][1] for entry in self.by_category.get(category, ())]
+
+    def has(self, category: str) -> bool:
+        """Prüft ob eine Kategorie mindestens einen Treffer hat"""
+        return category in self.by_category
+
+    def occurrences(self, entry: int) -> List[MarkerHit]:
+        """Alle Vorkommen eines Eintrags, nach Position sortiert"""
+        return self.by_entry.get(entry, [])
+
+    def first_offset(self, term: str) -> Optional[int]:
+        """Position des ersten Vorkommens eines Begriffs (None wenn nicht gefunden)"""
+        starts = [occurrences[0].start for entry, occurrences in self.by_entry.items()
+                  if self.entries[entry][1] == term]
+        return min(starts) if starts else None
+
+    def extend(self, hits: List[MarkerHit]):
+        """Fügt neue Treffer hinzu (Streaming); Reihenfolge nach Endposition bleibt erhalten"""
+        for hit in hits:
+            self.hits.append(hit)
+            occurrences = self.by_entry.get(hit.entry)
+            if occurrences is None:
+                self.by_entry[hit.entry] = [hit]
+                insort(self.by_category.setdefault(hit.category, []), hit.entry)
+            else:
+                occurrences.append(hit)
+
+    def recheck_boundaries(self, text_lower: str, position: int):
+        """Prüft die rechte Wortgrenze von Treffern am alten Textende nach neuem Text erneut"""
+        if position >= len(text_lower) or not is_word_char(text_lower[position]):
+            return
+        index = len(self.hits) - 1
+        while index >= 0 and self.hits[index].end == position:
+            hit = self.hits[index]
+            if hit.whole_word:
+                updated = hit._replace(whole_word=False)
+                self.hits[index] = updated
+                # Treffer am Textende sind jeweils das letzte Vorkommen ihres Eintrags
+                self.by_entry[hit.entry][-1] = updated
+            index -= 1
+
+    def count(self, entry: int) -> int:
+        """Anzahl nicht-überlappender Vorkommen (wie str.count); beim Streaming nur über neue Treffer"""
+        occurrences = self.occurrences(entry)
+        total, last_end, counted = self._counts.get(entry, (0, 0, 0))
+        for index in range(counted, len(occurrences)):
+            hit = occurrences[index]
+            if hit.start >= last_end:
+                total += 1
+                last_end = hit.end
+        self._counts[entry] = (total, last_end, len(occurrences))
+        return total
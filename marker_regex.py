@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Marker Regex
+============
+Regex-fähige semantic_grab-Patterns
+Alle Patterns werden beim Laden validiert und einmal kompiliert. Pro Pattern
+wird ein Pflicht-Literal (ein Textstück, das jeder Treffer enthalten muss)
+bestimmt; alle Literale laufen in einem Aho-Corasick-Durchlauf über den Text,
+nur Patterns mit gefundenem Literal werden danach als Regex geprüft.
+"""
+
+import re
+import string
+from typing import Dict, List, Optional, Tuple
+
+from marker_matcher import MarkerAutomaton, MarkerHit, is_word_char
+
+# Zeichen, die ein Pattern als regulären Ausdruck kennzeichnen
+REGEX_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+# Zeichen, deren IGNORECASE-Vergleich str.lower() entspricht (nach FOLD_TEXT);
+# andere Zeichen (z.B. griechisches Sigma) beenden ein Pflicht-Literal
+LITERAL_CHARS = frozenset(string.ascii_lowercase + string.digits + string.punctuation + " äöüß")
+
+# re.IGNORECASE setzt "ı" mit "i" und "ſ" mit "s" gleich, str.lower() nicht
+FOLD_TEXT = str.maketrans({"ı": "i", "ſ": "s"})
+
+# Kürzere Pflicht-Literale filtern kaum, das Pattern wird dann immer geprüft
+MIN_LITERAL_LENGTH = 2
+
+
+def is_regex_pattern(pattern: str) -> bool:
+    """Enthält das Pattern Regex-Metazeichen (sonst reicht die wörtliche Suche)"""
+    return any(ch in REGEX_CHARS for ch in pattern)
+
+
+def pattern_error(pattern: str, flags: int = re.IGNORECASE) -> Optional[str]:
+    """Fehlermeldung, falls das Pattern kein gültiger regulärer Ausdruck ist"""
+    try:
+        re.compile(pattern, flags)
+    except re.error as e:
+        return str(e)
+    return None
+
+
+def _skip_class(pattern: str, i: int) -> int:
+    """Position hinter der Zeichenklasse, die bei pattern[i] == '[' beginnt"""
+    i += 1
+    if i < len(pattern) and pattern[i] == "^":
+        i += 1
+    if i < len(pattern) and pattern[i] == "]":
+        i += 1
+    while i < len(pattern) and pattern[i] != "]":
+        i += 2 if pattern[i] == "\\" else 1
+    return i + 1
+
+
+def _skip_group(pattern: str, i: int) -> int:
+    """Position hinter der Gruppe, die bei pattern[i] == '(' beginnt"""
+    depth = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            i = _skip_class(pattern, i)
+            continue
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _skip_escape(pattern: str, i: int) -> int:
+    """Position hinter dem Escape bei pattern[i] == '\\' (mehrstellige wie \\x41, \\N{...} und \\12 ganz)"""
+    i += 2
+    kind = pattern[i - 1] if i - 1 < len(pattern) else ""
+    if kind == "N" and pattern[i:i + 1] == "{":
+        return pattern.find("}", i) + 1 or len(pattern)
+    if kind in "xuU" or kind.isdigit():
+        while i < len(pattern) and pattern[i] in string.hexdigits:
+            i += 1
+    return i
+
+
+COUNTED_QUANTIFIER = re.compile(r"\{(\d*)(?:,\d*)?\}")
+
+
+def _counted_quantifier(pattern: str, i: int) -> Optional[Tuple[int, int]]:
+    """(Mindestanzahl, Position hinter '}') für einen Quantor wie {2}, {0,3} oder {,5} bei pattern[i]
+
+    Wie in re ist ein '{' ohne gültigen Quantor (z.B. "{}" oder "{a}") ein gewöhnliches Zeichen.
+    """
+    match = COUNTED_QUANTIFIER.match(pattern, i)
+    if match is None or match.group() == "{}":
+        return None
+    return int(match.group(1) or 0), match.end()
+
+
+def required_literal(pattern: str) -> str:
+    """Längstes Textstück (kleingeschrieben), das jeder Treffer des Patterns enthält, oder ''
+
+    Betrachtet nur die oberste Ebene: Gruppen, Klassen, Escapes wie \\w und
+    optionale Zeichen beenden ein Literal, ein '|' auf oberster Ebene oder
+    Inline-Flags (z.B. (?x)) schließen ein Literal ganz aus.
+    """
+    if re.match(r"\(\?[aiLmsux]+\)", pattern):
+        return ""
+
+    runs = []
+    run = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            literal, i = pattern[i + 1], i + 2
+        elif ch in REGEX_CHARS:
+            if ch == "|":
+                return ""
+            runs.append("".join(run))
+            run = []
+            quantifier = _counted_quantifier(pattern, i) if ch == "{" else None
+            if quantifier is not None:
+                i = quantifier[1]
+            elif ch == "(":
+                i = _skip_group(pattern, i)
+            elif ch == "[":
+                i = _skip_class(pattern, i)
+            elif ch == "\\":
+                i = _skip_escape(pattern, i)
+            else:
+                i += 1
+            continue
+        else:
+            literal, i = ch, i + 1
+
+        literal = literal.lower()
+        following = pattern[i] if i < len(pattern) else ""
+        quantifier = _counted_quantifier(pattern, i) if following == "{" else None
+        if following in ("*", "?") or (quantifier is not None and quantifier[0] == 0) \
+                or literal not in LITERAL_CHARS:
+            # Optionales (oder nicht sicher vergleichbares) Zeichen
+            runs.append("".join(run))
+            run = []
+        elif following == "+" or quantifier is not None:
+            # Mindestens einmal: gehört dazu, danach kann aber anderes folgen
+            run.append(literal)
+            runs.append("".join(run))
+            run = []
+        else:
+            run.append(literal)
+    runs.append("".join(run))
+
+    longest = max(runs, key=len)
+    return longest if len(longest) >= MIN_LITERAL_LENGTH else ""
+
+
+class RegexMarkerSet:
+    """Validiert und kompiliert Regex-Patterns; findet Treffer über Pflicht-Literale
+
+    Patterns ohne Pflicht-Literal (z.B. "\\w+ung") werden bei jedem Text geprüft.
+    Die Treffer entsprechen denen von re.finditer pro Pattern.
+    """
+
+    def __init__(self, flags: int = re.IGNORECASE, first_entry: int = 0):
+        self.flags = flags
+        # Eintrags-Index des ersten Patterns in den Treffern (z.B. hinter den Automaten-Einträgen)
+        self.first_entry = first_entry
+        self.entries: List[Tuple[str, str]] = []
+        self.regexes: List[re.Pattern] = []
+        self.errors: List[Dict[str, str]] = []
+        self.literals = MarkerAutomaton()
+        # Automaten-Eintrag -> Pattern-Eintrag
+        self._literal_entries: List[int] = []
+        self._unfiltered: List[int] = []
+
+    def add(self, category: str, pattern: str) -> int:
+        """Prüft und übernimmt ein Pattern; gibt den Eintrags-Index oder -1 (ungültig, in errors) zurück"""
+        try:
+            regex = re.compile(pattern, self.flags)
+        except re.error as e:
+            self.errors.append({"marker": category, "pattern": pattern, "error": str(e)})
+            return -1
+
+        entry = len(self.entries)
+        self.entries.append((category, pattern))
+        self.regexes.append(regex)
+        literal = required_literal(pattern)
+        if literal:
+            self.literals.add(category, literal)
+            self._literal_entries.append(entry)
+        else:
+            self._unfiltered.append(entry)
+        return entry
+
+    def compile(self):
+        self.literals.compile()
+
+    def candidates(self, text_lower: str) -> List[int]:
+        """Einträge, deren Pflicht-Literal im Text vorkommt (plus die ohne Literal)"""
+        if not self._literal_entries:
+            return self._unfiltered
+        found = {self._literal_entries[hit.entry] for hit in self.literals.find_all(text_lower.translate(FOLD_TEXT))}
+        return sorted(found.union(self._unfiltered))
+
+    def find_all(self, text_lower: str) -> List[MarkerHit]:
+        """Alle Treffer aller Patterns im kleingeschriebenen Text, sortiert nach Position"""
+        hits = []
+        for entry in self.candidates(text_lower):
+            category, pattern = self.entries[entry]
+            for match in self.regexes[entry].finditer(text_lower):
+                start, end = match.span()
+                whole_word = (start == 0 or not is_word_char(text_lower[start - 1])) and \
+                             (end == len(text_lower) or not is_word_char(text_lower[end]))
+                hits.append(MarkerHit(category, pattern, start, end, whole_word, self.first_entry + entry))
+
+        hits.sort(key=lambda hit: (hit.start, hit.end, hit.entry))
+        return hits
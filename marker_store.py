@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Marker Store
+============
+Kompakte, per mmap lesbare Binärdatei der Marker-Bibliothek
+Mehrere Prozesse (Voice-Agent, Kanban-Executor, Watcher) teilen sich eine
+Kopie im Page-Cache und starten ohne YAML/JSON-Parsing der ganzen Bibliothek.
+
+Aufbau (little-endian, Abschnitte auf 8 Byte ausgerichtet):
+    Header            Magic, Format-Version, Anzahlen, Abschnitts-Offsets, CRC32
+    String-Offsets    u32 * (Strings + 1)
+    String-Daten      UTF-8, dedupliziert
+    Marker-Records    u32 * 5 pro Marker: Schlüssel, Typ, Meta-JSON, erstes Pattern, Anzahl Patterns
+    Pattern-Tabelle   u32 String-Index pro Pattern
+    Sortier-Index     u32 Marker-Index, nach Schlüssel (UTF-8-Bytes) sortiert
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+STORE_MAGIC = b"OTTOMKS\x00"
+# Bei Änderungen am Aufbau hochzählen; ältere Dateien werden abgelehnt
+STORE_FORMAT = 1
+
+HEADER = struct.Struct("<8sHHIIII7QI")
+HEADER_CRC = struct.Struct("<I")
+HEADER_SIZE = HEADER.size + HEADER_CRC.size
+RECORD_FIELDS = 5
+
+# Platzhalter im Meta-JSON: Patterns stehen in der Pattern-Tabelle
+PATTERNS_KEY = "patterns"
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _u32_bytes(values: List[int]) -> bytes:
+    data = array("I", values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+class _StringTable:
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.blobs: List[bytes] = []
+
+    def add(self, text: str) -> int:
+        position = self.index.get(text)
+        if position is None:
+            position = len(self.blobs)
+            self.index[text] = position
+            self.blobs.append(text.encode("utf-8"))
+        return position
+
+
+def write_marker_store(markers: Dict[str, Dict[str, Any]], path, info: Dict[str, Any] = None) -> int:
+    """Schreibt die Marker atomar als Binärdatei und gibt die Dateigröße zurück
+
+    Jeder Marker ist ein Dict; eine Liste von Strings unter 'patterns' landet in
+    der Pattern-Tabelle, alles andere als JSON im Meta-String (nicht-JSON-Werte wie
+    YAML-Datumsangaben werden zu Strings).
+    """
+    strings = _StringTable()
+    records: List[int] = []
+    pattern_table: List[int] = []
+
+    for key, marker in markers.items():
+        meta = dict(marker)
+        patterns = meta.get(PATTERNS_KEY)
+        pattern_start = len(pattern_table)
+        pattern_count = 0
+        if isinstance(patterns, list) and all(isinstance(pattern, str) for pattern in patterns):
+            meta[PATTERNS_KEY] = None
+            pattern_table.extend(strings.add(pattern) for pattern in patterns)
+            pattern_count = len(patterns)
+        marker_type = marker.get("type")
+        records.extend((
+            strings.add(key),
+            strings.add(marker_type if isinstance(marker_type, str) else ""),
+            strings.add(json.dumps(meta, ensure_ascii=False, default=str)),
+            pattern_start,
+            pattern_count
+        ))
+
+    info_string = strings.add(json.dumps(info or {}, ensure_ascii=False, default=str))
+    keys = list(markers)
+    key_bytes = [key.encode("utf-8") for key in keys]
+    sorted_index = sorted(range(len(keys)), key=key_bytes.__getitem__)
+
+    offsets = [0]
+    for blob in strings.blobs:
+        offsets.append(offsets[-1] + len(blob))
+
+    sections = [
+        _u32_bytes(offsets),
+        b"".join(strings.blobs),
+        _u32_bytes(records),
+        _u32_bytes(pattern_table),
+        _u32_bytes(sorted_index)
+    ]
+    section_offsets = []
+    position = _align(HEADER_SIZE)
+    payload = bytearray()
+    for section in sections:
+        section_offsets.append(position)
+        payload += section
+        padding = _align(position + len(section)) - (position + len(section))
+        payload += b"\x00" * padding
+        position += len(section) + padding
+    file_size = _align(HEADER_SIZE) + len(payload)
+
+    header = HEADER.pack(STORE_MAGIC, STORE_FORMAT, HEADER_SIZE, len(keys), len(pattern_table),
+                         len(strings.blobs), info_string, *section_offsets, len(sections[1]),
+                         file_size, zlib.crc32(payload))
+    header += HEADER_CRC.pack(zlib.crc32(header))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f"{path.suffix}.tmp{os.getpid()}")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(b"\x00" * (_align(HEADER_SIZE) - HEADER_SIZE))
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return file_size
+
+
+class MarkerStore(Mapping):
+    """Schreibgeschützte Sicht auf eine Marker-Store-Datei (per mmap, ohne Kopie)
+
+    Verhält sich wie das markers-Dict der Loader (Schlüssel in Export-Reihenfolge);
+    Marker werden erst beim Zugriff aus dem Meta-JSON aufgebaut. verify=False
+    überspringt die Prüfsumme der Nutzdaten (der Header wird immer geprüft).
+    """
+
+    def __init__(self, path, verify: bool = True):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Marker-Store ist leer: {self.path}")
+        self._view = memoryview(self._mmap)
+        try:
+            self._open(verify)
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self, verify: bool):
+        view = self._view
+        if len(view) < HEADER_SIZE or bytes(view[:len(STORE_MAGIC)]) != STORE_MAGIC:
+            raise ValueError(f"Kein Marker-Store: {self.path}")
+
+        fields = HEADER.unpack_from(view)
+        (_, version, header_size, marker_count, pattern_count, string_count, info_string,
+         offsets_at, data_at, records_at, patterns_at, sorted_at, data_size, file_size, payload_crc) = fields
+        if version != STORE_FORMAT:
+            raise ValueError(f"Marker-Store-Format {version} wird nicht unterstützt (erwartet {STORE_FORMAT})")
+        if header_size != HEADER_SIZE or HEADER_CRC.unpack_from(view, HEADER.size)[0] != zlib.crc32(view[:HEADER.size]):
+            raise ValueError(f"Marker-Store-Header beschädigt: {self.path}")
+        if file_size != len(view):
+            raise ValueError(f"Marker-Store abgeschnitten oder verlängert: {self.path}")
+        if verify and zlib.crc32(view[_align(HEADER_SIZE):]) != payload_crc:
+            raise ValueError(f"Marker-Store-Prüfsumme falsch: {self.path}")
+
+        self.marker_count = marker_count
+        self.pattern_count = pattern_count
+        self._offsets = self._u32(offsets_at, string_count + 1)
+        self._data_at = data_at
+        self._records = self._u32(records_at, marker_count * RECORD_FIELDS)
+        self._patterns = self._u32(patterns_at, pattern_count)
+        self._sorted = self._u32(sorted_at, marker_count)
+        if self._offsets[-1] != data_size or data_at + data_size > records_at:
+            raise ValueError(f"Marker-Store-String-Tabelle beschädigt: {self.path}")
+        self.info = json.loads(self._string(info_string))
+
+    def _u32(self, offset: int, count: int):
+        section = self._view[offset:offset + 4 * count]
+        if len(section) != 4 * count:
+            raise ValueError(f"Marker-Store abgeschnitten: {self.path}")
+        if sys.byteorder == "little":
+            return section.cast("I")
+        values = array("I", section.tobytes())
+        values.byteswap()
+        return values
+
+    def _string(self, index: int) -> str:
+        start = self._data_at + self._offsets[index]
+        end = self._data_at + self._offsets[index + 1]
+        return str(self._view[start:end], "utf-8")
+
+    def _field(self, position: int, field: int) -> int:
+        return self._records[position * RECORD_FIELDS + field]
+
+    def key_at(self, position: int) -> str:
+        """Schlüssel des Markers an Position (Export-Reihenfolge)"""
+        return self._string(self._field(position, 0))
+
+    def type_at(self, position: int) -> str:
+        return self._string(self._field(position, 1))
+
+    def patterns_at(self, position: int) -> List[str]:
+        start = self._field(position, 3)
+        return [self._string(self._patterns[index]) for index in range(start, start + self._field(position, 4))]
+
+    def marker_at(self, position: int) -> Dict[str, Any]:
+        """Baut den Marker an Position als Dict (wie im Loader)"""
+        marker = json.loads(self._string(self._field(position, 2)))
+        if PATTERNS_KEY in marker and marker[PATTERNS_KEY] is None:
+            marker[PATTERNS_KEY] = self.patterns_at(position)
+        return marker
+
+    def position(self, key: str) -> Optional[int]:
+        """Position eines Schlüssels (Binärsuche im Sortier-Index, ohne Dekodieren aller Schlüssel)"""
+        target = key.encode("utf-8")
+        low, high = 0, self.marker_count
+        while low < high:
+            middle = (low + high) // 2
+            position = self._sorted[middle]
+            string = self._field(position, 0)
+            start = self._data_at + self._offsets[string]
+            candidate = bytes(self._view[start:self._data_at + self._offsets[string + 1]])
+            if candidate == target:
+                return position
+            if candidate < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def patterns(self, key: str) -> List[str]:
+        """Patterns eines Markers, ohne das Meta-JSON zu dekodieren"""
+        position = self.position(key)
+        if position is None:
+            raise KeyError(key)
+        return self.patterns_at(position)
+
+    def keys_of_type(self, marker_type: str) -> List[str]:
+        return [self.key_at(position) for position in range(self.marker_count)
+                if self.type_at(position) == marker_type]
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        position = self.position(key)
+        if position is None:
+            raise KeyError(key)
+        return self.marker_at(position)
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self.position(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.key_at(position) for position in range(self.marker_count))
+
+    def __len__(self) -> int:
+        return self.marker_count
+
+    def values(self):
+        return [self.marker_at(position) for position in range(self.marker_count)]
+
+    def items(self):
+        return [(self.key_at(position), self.marker_at(position)) for position in range(self.marker_count)]
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Vollständige (veränderbare) Kopie aller Marker"""
+        return dict(self.items())
+
+    def close(self):
+        """Gibt die Abbildung frei; danach ist der Store nicht mehr nutzbar"""
+        for name in ("_offsets", "_records", "_patterns", "_sorted"):
+            values = self.__dict__.pop(name, None)
+            if isinstance(values, memoryview):
+                values.release()
+        view = self.__dict__.pop("_view", None)
+        if view is not None:
+            view.release()
+        mapped = self.__dict__.pop("_mmap", None)
+        if mapped is not None:
+            mapped.close()
+
+    def __enter__(self) -> "MarkerStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
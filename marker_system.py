@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Marker System
+=============
+Gemeinsame Marker-Logik der Sprach-Agenten (Mind Reader, Work Partner)
+Laden der Marker-Bibliothek (Index-Cache, Prozess-Pool, Marker-Store),
+Kompilieren zu Automat, Fuzzy-Index, Regex-Set und Embedding-Index,
+Suche mit Spans und Live-Neuladen geänderter Dateien.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import yaml
+
+from marker_index_cache import MarkerIndexCache
+from marker_loading import load_marker_files
+from marker_matcher import MarkerAutomaton, remove_overlaps
+from marker_fuzzy import FuzzyMarkerIndex
+from marker_regex import RegexMarkerSet, is_regex_pattern, pattern_error
+from marker_embeddings import MarkerEmbeddingIndex, create_embedder
+from marker_store import MarkerStore, write_marker_store
+from marker_watcher import MarkerWatcher, DEFAULT_DEBOUNCE
+
+# Bei Änderungen an parse_marker_file/marker_from_* hochzählen (verwirft den Index-Cache)
+MARKER_PARSER_VERSION = 1
+
+MARKER_DIR = Path("../ALL_SEMANTIC_MARKER_TXT/ALL_NEWMARKER01")
+
+
+def marker_from_data(data: Dict[str, Any], filename: str) -> Tuple[str, Dict[str, Any]]:
+    """Marker aus YAML-Daten"""
+    marker_name = data.get('marker', filename.replace('.yaml', '').replace('.txt', ''))
+    return marker_name, {
+        'name': marker_name,
+        'description': data.get('beschreibung', ''),
+        'examples': data.get('beispiele', []),
+        'patterns': data.get('semantic_grab', {}).get('patterns', []),
+        'tags': data.get('tags', []),
+        'filename': filename
+    }
+
+
+def marker_from_text(content: str, filename: str) -> Tuple[str, Dict[str, Any]]:
+    """Marker aus einer Text-Datei (zeilenweise, für nicht als YAML lesbare Dateien)"""
+    marker_name = filename.replace('.txt', '').replace('.yaml', '')
+    description = ""
+    examples = []
+    patterns = []
+    in_examples = False
+    in_patterns = False
+
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith('marker:'):
+            marker_name = line.split(':', 1)[1].strip()
+        elif line.startswith('beschreibung:'):
+            description = line.split(':', 1)[1].strip()
+        elif line.startswith('beispiele:'):
+            in_examples = True
+            in_patterns = False
+        elif line.startswith('semantic_grab:'):
+            in_examples = False
+            in_patterns = True
+        elif in_examples and line.startswith('- '):
+            examples.append(line[2:].strip('"'))
+        elif in_patterns and line.startswith('- '):
+            patterns.append(line[2:])
+
+    return marker_name, {
+        'name': marker_name,
+        'description': description,
+        'examples': examples,
+        'patterns': patterns,
+        'filename': filename
+    }
+
+
+def parse_marker_file(file_path) -> Dict[str, Dict[str, Any]]:
+    """Parst eine Marker-Datei und gibt deren Marker zurück (Modulebene, damit sie im Prozess-Pool laufen kann)"""
+    file_path = Path(file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Versuche YAML zu parsen
+    try:
+        data = yaml.safe_load(content)
+        if data and isinstance(data, dict):
+            marker_name, marker = marker_from_data(data, file_path.name)
+            return {marker_name: marker}
+    except Exception:
+        pass
+
+    # Fallback: Text-basiertes Parsing
+    marker_name, marker = marker_from_text(content, file_path.name)
+    return {marker_name: marker}
+
+
+class MarkerSystemBase:
+    """Basisklasse für Agenten-Systeme, die Texte auf Marker untersuchen
+
+    Unterklassen setzen cache_name (Namensraum im Index-Cache) und rufen
+    super().__init__(...) mit den Marker-Optionen auf; die Marker werden dort
+    geladen und kompiliert.
+    """
+
+    cache_name = "otto_markers"
+
+    def __init__(self, use_cache=True, workers=None, chunksize=None, fuzzy=False,
+                 fuzzy_max_distance=2, fuzzy_min_similarity=0.75, marker_store=None, regex_patterns=False,
+                 semantic=False, semantic_backend="auto", semantic_top_k=5, semantic_min_score=0.6):
+        self.markers = {}
+        self.marker_dir = MARKER_DIR
+        # Marker pro Datei (für das Neuladen einzelner Dateien) und Index-Cache
+        self.marker_sources = {}
+        self.index_cache = None
+        # Schützt Marker und Automat beim Austausch durch den Watcher
+        self.marker_lock = threading.RLock()
+        self.marker_watcher = None
+        self.use_cache = use_cache
+        self.workers = workers
+        self.chunksize = chunksize
+        self.load_report = None
+        self.marker_matcher = None
+        self.marker_matcher_entries = []
+        self.marker_matcher_always = []
+        self.marker_order = {}
+        # Fehlertolerante Suche für ASR-Transkripte ("sensucht" statt "sehnsucht")
+        self.fuzzy = fuzzy
+        self.fuzzy_max_distance = fuzzy_max_distance
+        self.fuzzy_min_similarity = fuzzy_min_similarity
+        self.fuzzy_matcher = None
+        # semantic_grab-Patterns als reguläre Ausdrücke (Vorfilter über Pflicht-Literale)
+        self.regex_patterns = regex_patterns
+        self.regex_matcher = None
+        self.pattern_errors = []
+        # Semantische Suche über die Beispiele (Umschreibungen), siehe marker_embeddings
+        self.semantic = semantic
+        self.semantic_backend = semantic_backend
+        self.semantic_top_k = semantic_top_k
+        self.semantic_min_score = semantic_min_score
+        self.embedder = None
+        self.semantic_index = None
+        if marker_store:
+            self.load_marker_store(marker_store)
+        else:
+            self.load_all_markers()
+
+    def load_all_markers(self):
+        """Lädt alle Marker aus dem ALL_SEMANTIC_MARKER_TXT Verzeichnis"""
+        marker_dir = self.marker_dir
+
+        if not marker_dir.exists():
+            print(f"⚠️  Marker-Verzeichnis nicht gefunden: {marker_dir}")
+            return
+
+        print(f"🔍 Lade Marker aus: {marker_dir}")
+
+        # Lade alle .txt und .yaml Dateien (nach Dateiname, damit das Ergebnis deterministisch ist)
+        marker_files = sorted(list(marker_dir.glob("*.txt")) + list(marker_dir.glob("*.yaml")),
+                              key=lambda path: path.name)
+
+        # Unveränderte Dateien kommen aus dem kompilierten Index-Cache
+        cache = MarkerIndexCache(marker_dir, self.cache_name, MARKER_PARSER_VERSION) if self.use_cache else None
+        self.index_cache = cache
+
+        # Geänderte Dateien werden (ab einer gewissen Menge) in einem Prozess-Pool geparst
+        loaded, report = load_marker_files(marker_files, parse_marker_file, cache, self.workers, self.chunksize)
+        for file_path, markers in loaded:
+            self.markers.update(markers)
+            self.marker_sources[file_path.name] = markers
+        self.load_report = report
+
+        if cache is not None:
+            try:
+                cache.save()
+            except OSError as e:
+                print(f"⚠️  Index-Cache konnte nicht gespeichert werden: {e}")
+
+        print(f"✅ {len(self.markers)} Marker geladen: {report.summary()}")
+        for error in report.errors:
+            print(f"   ⚠️  {error['file']}: {error['error']}")
+
+        self.compile_marker_matcher()
+
+    def export_marker_store(self, path):
+        """Schreibt die geladenen Marker als mmap-fähige Binärdatei für andere Prozesse"""
+        size = write_marker_store(self.markers, path, {'parser_version': MARKER_PARSER_VERSION})
+        print(f"💾 Marker-Store geschrieben: {path} ({size} Bytes)")
+        return size
+
+    def load_marker_store(self, path, verify=True):
+        """Bindet einen Marker-Store schreibgeschützt ein (geteilte Page-Cache-Kopie, kein YAML-Parsing)"""
+        try:
+            store = MarkerStore(path, verify)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Marker-Store nicht nutzbar ({e}), lade Marker-Dateien")
+            self.load_all_markers()
+            return
+        if store.info.get('parser_version') != MARKER_PARSER_VERSION:
+            store.close()
+            print("⚠️  Marker-Store von anderer Parser-Version, lade Marker-Dateien")
+            self.load_all_markers()
+            return
+
+        self.markers = store
+        print(f"✅ {len(store)} Marker aus Marker-Store: {path}")
+        self.compile_marker_matcher()
+
+    def load_marker_file(self, file_path):
+        """Lädt eine einzelne Marker-Datei"""
+        self.markers.update(parse_marker_file(file_path))
+
+    def process_marker_data(self, data, filename):
+        """Verarbeitet YAML-basierte Marker-Daten"""
+        marker_name, marker = marker_from_data(data, filename)
+        self.markers[marker_name] = marker
+
+    def process_text_marker(self, content, filename):
+        """Verarbeitet Text-basierte Marker-Dateien"""
+        marker_name, marker = marker_from_text(content, filename)
+        self.markers[marker_name] = marker
+
+    def compile_marker_matcher(self):
+        """Kompiliert Beispiele und Patterns aller Marker einmalig zu einem Automaten"""
+        compiled = self.build_marker_matcher(self.markers)
+        self.report_pattern_errors(compiled[2])
+        with self.marker_lock:
+            (self.marker_matcher, self.fuzzy_matcher, self.regex_matcher, self.marker_matcher_entries,
+             self.marker_matcher_always, self.marker_order, self.semantic_index) = compiled
+
+    def build_marker_matcher(self, markers):
+        """Baut Automat, Fuzzy-Index, Regex-Set und Eintrags-Tabellen für ein Marker-Dict (ohne sie zu setzen)
+
+        Im Regex-Modus werden Patterns mit Regex-Metazeichen validiert; gültige
+        landen im Regex-Set, ungültige werden gemeldet und wörtlich gesucht.
+        """
+        matcher = MarkerAutomaton()
+        fuzzy_matcher = FuzzyMarkerIndex(self.fuzzy_max_distance, self.fuzzy_min_similarity) if self.fuzzy else None
+        entries = []
+        always = []
+        regex_terms = []
+        invalid = []
+
+        for marker_name, marker_data in markers.items():
+            for match_type, key in (('example_match', 'examples'), ('pattern_match', 'patterns')):
+                for item, term in enumerate(marker_data.get(key) or []):
+                    if not isinstance(term, str):
+                        continue
+                    if not term:
+                        # Ein leerer Eintrag ist in jedem Text enthalten
+                        always.append((marker_name, match_type, item, term))
+                        continue
+                    if self.regex_patterns and match_type == 'pattern_match' and is_regex_pattern(term):
+                        error = pattern_error(term)
+                        if error is None:
+                            regex_terms.append((marker_name, item, term))
+                            continue
+                        invalid.append({'marker': marker_name, 'pattern': term, 'error': error})
+                    # Eintrags-Index des Automaten == Index in entries
+                    matcher.add(marker_name, term)
+                    if fuzzy_matcher is not None:
+                        fuzzy_matcher.add(marker_name, term)
+                    entries.append((match_type, item, term))
+
+        matcher.compile()
+
+        regex_matcher = None
+        if self.regex_patterns:
+            # Regex-Einträge folgen in entries auf die des Automaten
+            regex_matcher = RegexMarkerSet(first_entry=len(entries))
+            for marker_name, item, term in regex_terms:
+                regex_matcher.add(marker_name, term)
+                entries.append(('pattern_match', item, term))
+            regex_matcher.errors.extend(invalid)
+            regex_matcher.compile()
+
+        order = {marker_name: index for index, marker_name in enumerate(markers)}
+        semantic_index = self.build_semantic_index(markers) if self.semantic else None
+        return matcher, fuzzy_matcher, regex_matcher, entries, always, order, semantic_index
+
+    def build_semantic_index(self, markers):
+        """Bettet alle Beispiele ein (Vektoren liegen neben dem Index-Cache, nur neue werden berechnet)"""
+        if self.embedder is None:
+            self.embedder = create_embedder(self.semantic_backend)
+        cache_path = None
+        if self.index_cache is not None:
+            cache_path = self.index_cache.cache_path.with_suffix(f".{self.embedder.name}.npz")
+
+        semantic_index = MarkerEmbeddingIndex(self.embedder, cache_path)
+        semantic_index.build([(marker_name, item, example)
+                              for marker_name, marker_data in markers.items()
+                              for item, example in enumerate(marker_data.get('examples') or [])
+                              if isinstance(example, str) and example.strip()])
+        return semantic_index
+
+    def report_pattern_errors(self, regex_matcher):
+        """Meldet ungültige Regex-Patterns einmal (beim Neuladen nur neu hinzugekommene)"""
+        if regex_matcher is None:
+            return
+        known = {(error['marker'], error['pattern']) for error in self.pattern_errors}
+        new_errors = [error for error in regex_matcher.errors if (error['marker'], error['pattern']) not in known]
+        if new_errors:
+            print(f"⚠️  {len(new_errors)} ungültige Regex-Patterns (werden wörtlich gesucht):")
+            for error in new_errors:
+                print(f"   ⚠️  {error['marker']}: {error['pattern']!r} - {error['error']}")
+        self.pattern_errors = list(regex_matcher.errors)
+
+    def apply_marker_changes(self, paths):
+        """Parst nur die geänderten Marker-Dateien neu und tauscht Marker und Automat atomar aus
+
+        Neue und geänderte Dateien werden neu geparst, gelöschte entfernt. Leser
+        (analyze_text_for_markers) sehen entweder den alten oder den neuen Stand.
+        """
+        changes = {'updated': [], 'removed': [], 'errors': []}
+        if isinstance(self.markers, MarkerStore):
+            print("⚠️  Marker aus Marker-Store sind schreibgeschützt - Änderungen ignoriert")
+            return changes
+
+        sources = dict(self.marker_sources)
+        for path in paths:
+            path = Path(path)
+            if path.suffix not in ('.txt', '.yaml'):
+                continue
+            if not path.exists():
+                if sources.pop(path.name, None) is not None:
+                    changes['removed'].append(path.name)
+                continue
+            try:
+                if self.index_cache is not None:
+                    markers = self.index_cache.load_file(path, parse_marker_file)
+                else:
+                    markers = parse_marker_file(path)
+            except Exception as e:
+                # z.B. halb geschriebene Datei: alter Stand bleibt bis zur nächsten Änderung
+                changes['errors'].append({'file': path.name, 'error': f"{type(e).__name__}: {e}"})
+                continue
+            sources[path.name] = markers
+            changes['updated'].append(path.name)
+
+        for error in changes['errors']:
+            print(f"   ⚠️  {error['file']}: {error['error']}")
+        if not changes['updated'] and not changes['removed']:
+            return changes
+
+        # Gleiche Reihenfolge wie load_all_markers (nach Dateiname)
+        markers = {}
+        for name in sorted(sources):
+            markers.update(sources[name])
+        compiled = self.build_marker_matcher(markers)
+        self.report_pattern_errors(compiled[2])
+
+        with self.marker_lock:
+            self.markers = markers
+            self.marker_sources = sources
+            (self.marker_matcher, self.fuzzy_matcher, self.regex_matcher, self.marker_matcher_entries,
+             self.marker_matcher_always, self.marker_order, self.semantic_index) = compiled
+
+        if self.index_cache is not None:
+            try:
+                self.index_cache.save(prune=False)
+            except OSError as e:
+                print(f"⚠️  Index-Cache konnte nicht gespeichert werden: {e}")
+
+        print(f"🔄 Marker aktualisiert: {', '.join(changes['updated'] + changes['removed'])} "
+              f"({len(markers)} Marker)")
+        return changes
+
+    def watch_markers(self, debounce=DEFAULT_DEBOUNCE):
+        """Beobachtet das Marker-Verzeichnis und lädt geänderte Dateien live nach (benötigt watchdog)"""
+        if self.marker_watcher is not None:
+            return self.marker_watcher
+        if isinstance(self.markers, MarkerStore):
+            print("⚠️  Marker aus Marker-Store werden nicht beobachtet")
+            return None
+
+        watcher = MarkerWatcher(self.marker_dir, self.apply_marker_changes, ('.txt', '.yaml'), debounce)
+        if not watcher.start():
+            return None
+        self.marker_watcher = watcher
+        print(f"👀 Beobachte Marker-Verzeichnis: {self.marker_dir}")
+        return watcher
+
+    def stop_watching(self):
+        """Beendet die Beobachtung des Marker-Verzeichnisses"""
+        if self.marker_watcher is not None:
+            self.marker_watcher.stop()
+            self.marker_watcher = None
+
+    def find_marker_spans(self, text, remove_overlapping=False, fuzzy=None):
+        """Alle Beispiel- und Pattern-Treffer mit Zeichen-Spans in einem Durchlauf
+
+        Mit fuzzy kommen unscharfe Treffer (FuzzyHit mit distance/similarity) hinzu.
+        Im Regex-Modus kommen die Treffer der Regex-Patterns (RegexMarkerSet) hinzu.
+        """
+        fuzzy = self.fuzzy if fuzzy is None else fuzzy
+        with self.marker_lock:
+            if self.marker_matcher is None or len(self.marker_order) != len(self.markers) or \
+                    (fuzzy and self.fuzzy_matcher is None) or (self.regex_patterns and self.regex_matcher is None):
+                self.fuzzy = self.fuzzy or fuzzy
+                self.compile_marker_matcher()
+            matcher, fuzzy_matcher, regex_matcher = self.marker_matcher, self.fuzzy_matcher, self.regex_matcher
+
+        text_lower = text.lower()
+        hits = matcher.find_all(text_lower)
+        if regex_matcher is not None and regex_matcher.entries:
+            hits = sorted(hits + regex_matcher.find_all(text_lower), key=lambda hit: (hit.start, hit.end))
+        if fuzzy:
+            hits = sorted(hits + fuzzy_matcher.find(text_lower), key=lambda hit: (hit.start, hit.end))
+        if remove_overlapping:
+            hits = remove_overlaps(hits)
+        return hits
+
+    def analyze_text_for_markers(self, text, fuzzy=None, semantic=None):
+        """Analysiert Text auf Marker (pro Marker erstes passendes Beispiel und Pattern, mit Span)
+
+        Im Fuzzy-Modus gewinnt pro Marker der Treffer mit der kleinsten Distanz;
+        Ergebnisse enthalten dann zusätzlich 'distance' und 'similarity'.
+        Mit semantic kommen Marker hinzu, deren Beispiele der Äußerung ähneln
+        (Typ 'semantic_match', 'similarity' = Kosinus-Ähnlichkeit).
+        """
+        fuzzy = self.fuzzy if fuzzy is None else fuzzy
+        semantic = self.semantic if semantic is None else semantic
+        # Treffer, Eintrags-Tabellen und Marker aus demselben Stand (Watcher tauscht sie aus)
+        with self.marker_lock:
+            hits = self.find_marker_spans(text, fuzzy=fuzzy)
+
+            # Pro Marker und Typ zählt wie bisher der erste passende Eintrag der Liste
+            best = {}
+            for marker_name, match_type, item, term in self.marker_matcher_always:
+                key = (marker_name, match_type)
+                if key not in best or item < best[key][1]:
+                    best[key] = (0, item, term, 0, 0, 1.0)
+            for hit in hits:
+                match_type, item, term = self.marker_matcher_entries[hit.entry]
+                key = (hit.category, match_type)
+                distance = getattr(hit, 'distance', 0)
+                current = best.get(key)
+                if current is None or (distance, item, hit.start) < (current[0], current[1], current[3]):
+                    best[key] = (distance, item, term, hit.start, hit.end, getattr(hit, 'similarity', 1.0))
+
+            found_markers = []
+            for (marker_name, match_type), (distance, item, term, start, end, similarity) in sorted(
+                    best.items(), key=lambda entry: (self.marker_order[entry[0][0]], entry[0][1] != 'example_match')):
+                marker = {
+                    'marker': marker_name,
+                    'type': match_type,
+                    'confidence': 0.8 if match_type == 'example_match' else 0.9,
+                    'description': self.markers[marker_name]['description'],
+                    'match': term,
+                    'span': [start, end]
+                }
+                if fuzzy:
+                    marker['confidence'] *= similarity
+                    marker['distance'] = distance
+                    marker['similarity'] = similarity
+                found_markers.append(marker)
+
+            if semantic:
+                found_markers.extend(self.find_semantic_markers(text, {marker['marker'] for marker in found_markers}))
+            return found_markers
+
+    def find_semantic_markers(self, text, exclude=()):
+        """Marker mit ähnlichen Beispielen (bestes Beispiel pro Marker, nach Ähnlichkeit sortiert)"""
+        with self.marker_lock:
+            if self.semantic_index is None:
+                self.semantic = True
+                self.compile_marker_matcher()
+            semantic_index = self.semantic_index
+
+            found_markers = []
+            seen = set(exclude)
+            for score, entry in semantic_index.query(text, self.semantic_top_k, self.semantic_min_score):
+                marker_name, item, example = semantic_index.entries[entry]
+                if marker_name in seen:
+                    continue
+                seen.add(marker_name)
+                found_markers.append({
+                    'marker': marker_name,
+                    'type': 'semantic_match',
+                    'confidence': 0.8 * score,
+                    'description': self.markers[marker_name]['description'],
+                    'match': example,
+                    'span': [0, len(text)],
+                    'similarity': score
+                })
+            return found_markers
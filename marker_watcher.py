@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Marker Watcher
+==============
+Live-Beobachtung des Marker-Verzeichnisses (optional, benötigt watchdog)
+Ereignisse werden gesammelt und nach einer Ruhepause (Debounce) gebündelt
+an den Loader gemeldet, der nur die betroffenen Dateien neu parst.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# Editoren speichern oft in mehreren Schritten (temporäre Datei, rename, touch)
+DEFAULT_DEBOUNCE = 0.5
+
+
+class _MarkerEventHandler(FileSystemEventHandler):
+    def __init__(self, watcher: "MarkerWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.src_path)
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.src_path)
+            self.watcher.notify(event.dest_path)
+
+
+class MarkerWatcher:
+    """Beobachtet ein Marker-Verzeichnis und meldet geänderte Dateien gebündelt
+
+    apply_changes bekommt die Pfade aller seit der letzten Meldung geänderten
+    Dateien (sortiert); ob eine Datei angelegt, geändert oder gelöscht wurde,
+    entscheidet der Loader anhand des aktuellen Dateisystems.
+    """
+
+    def __init__(self, directory, apply_changes: Callable[[List[Path]], object],
+                 suffixes: Iterable[str] = (".txt", ".yaml"), debounce: float = DEFAULT_DEBOUNCE):
+        self.directory = Path(directory)
+        self.apply_changes = apply_changes
+        self.suffixes = tuple(suffixes) if suffixes else None
+        self.debounce = debounce
+        self.observer = None
+        self.batches = 0
+        self._pending = set()
+        self._deadline = 0.0
+        self._condition = threading.Condition()
+        self._running = False
+        self._worker: Optional[threading.Thread] = None
+
+    @staticmethod
+    def available() -> bool:
+        return Observer is not None
+
+    def notify(self, path):
+        """Merkt eine geänderte Datei vor und verschiebt die Meldung um debounce Sekunden"""
+        path = Path(path)
+        if path.parent.resolve() != self.directory.resolve():
+            return
+        if self.suffixes and path.suffix not in self.suffixes:
+            return
+        with self._condition:
+            self._pending.add(path)
+            self._deadline = time.monotonic() + self.debounce
+            self._condition.notify()
+
+    def start(self) -> bool:
+        """Startet Beobachtung und Debounce-Thread (False wenn watchdog fehlt)"""
+        if Observer is None:
+            print("⚠️  watchdog nicht installiert - Marker-Verzeichnis wird nicht beobachtet")
+            return False
+        if self._running:
+            return True
+        if not self.directory.exists():
+            print(f"⚠️  Marker-Verzeichnis nicht gefunden: {self.directory}")
+            return False
+
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name="marker-watcher", daemon=True)
+        self._worker.start()
+        self.observer = Observer()
+        self.observer.schedule(_MarkerEventHandler(self), str(self.directory), recursive=False)
+        self.observer.start()
+        return True
+
+    def stop(self, flush: bool = True):
+        """Beendet die Beobachtung; flush meldet noch ausstehende Änderungen sofort"""
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        if flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """Meldet ausstehende Änderungen sofort (ohne Debounce); gibt die Anzahl Dateien zurück"""
+        with self._condition:
+            paths = sorted(self._pending)
+            self._pending.clear()
+        if paths:
+            self._apply(paths)
+        return len(paths)
+
+    def _apply(self, paths: List[Path]):
+        self.batches += 1
+        try:
+            self.apply_changes(paths)
+        except Exception as e:
+            print(f"❌ Marker-Aktualisierung fehlgeschlagen: {e}")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and (not self._pending or time.monotonic() < self._deadline):
+                    timeout = self._deadline - time.monotonic() if self._pending else None
+                    self._condition.wait(timeout)
+                if not self._running:
+                    return
+                paths = sorted(self._pending)
+                self._pending.clear()
+            self._apply(paths)
+
+    def __enter__(self) -> "MarkerWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
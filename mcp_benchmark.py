@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+MCP Benchmark
+=============
+Reproduzierbarer Durchsatz- und Latenz-Benchmark für den MCP Kernel
+und die determine_mcp_level-Heuristiken der Agenten
+
+Erzeugt mit festem Seed deutsche Äußerungen mit Markern in kontrollierter
+Dichte, misst Äußerungen/Sekunde sowie p50/p99 über Textlängen und
+Vokabulargrößen und vergleicht optional mit einer gespeicherten Baseline.
+
+    python mcp_benchmark.py --output mcp_bench.json
+    python mcp_benchmark.py --baseline mcp_bench.json --threshold 0.25
+"""
+
+import argparse
+import contextlib
+import importlib
+import inspect
+import io
+import json
+import math
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from mcp_kernel import DEFAULT_MARKER_FIELD, LEVEL_RULE_TABLES, MCPKernel, classify_level
+
+DEFAULT_LENGTHS = [5, 20, 100, 500, 2000]
+DEFAULT_VOCAB_SIZES = [0, 500, 5000]
+DEFAULT_DENSITY = 0.05
+DEFAULT_SEED = 42
+DEFAULT_THRESHOLD = 0.25
+
+# Obergrenze für Wörter pro Messreihe, damit lange Texte nicht ewig laufen
+WORD_BUDGET = 200000
+
+# Füllwörter ohne Marker-Bedeutung
+FILLER_WORDS = [
+    "ich", "du", "wir", "heute", "morgen", "noch", "einfach", "vielleicht", "eigentlich",
+    "der", "die", "das", "ein", "eine", "und", "oder", "aber", "weil", "dass", "wenn",
+    "haus", "arbeit", "tag", "woche", "zeit", "weg", "frage", "antwort", "idee", "plan",
+    "gehe", "komme", "sehe", "sage", "habe", "bin", "war", "wird", "kann", "soll",
+    "schnell", "langsam", "gut", "schwer", "klar", "neu", "alt", "lang", "kurz", "viel",
+    "mit", "ohne", "über", "unter", "nach", "vor", "bei", "für", "gegen", "zwischen",
+    "kaffee", "projekt", "termin", "gespräch", "nachricht", "garten", "buch", "musik"
+]
+
+# Silben für synthetische Marker-Begriffe (größere Vokabulare)
+SYLLABLES = [
+    "ber", "din", "fal", "gor", "hen", "kla", "lum", "mer", "nor", "pet",
+    "ral", "sen", "tir", "ung", "vol", "wes", "zak", "ach", "eil", "ost"
+]
+
+# determine_mcp_level-Varianten: Modul -> Klasse
+LEVEL_HEURISTICS = {
+    "otto_claude_enhanced": "OttoClaudeEnhanced",
+    "otto_mcp_working": "OttoMCPWorking",
+    "otto_claude_elevenlabs": "OttoClaudeElevenLabs",
+    "otto_claude_only": "OttoClaudeOnly",
+    "otto_claude_priority": "OttoClaudePriority",
+    "otto_adaptive_learning": "AdaptiveLearningSystem",
+    "otto_final_clean": "MCPSystem"
+}
+
+# Wörter, die die Level-Heuristiken auslösen
+LEVEL_WORDS = [
+    "fühle", "liebe", "mache", "entscheide", "system", "muster", "zusammenhang",
+    "denke", "verstehe", "analysiere", "entwicklung", "wachstum", "lernen",
+    "systemisch", "reflexion", "aufgabe", "organisieren", "hallo", "test"
+]
+
+
+def synthetic_marker_field(size: int, seed: int = DEFAULT_SEED) -> Dict[str, List[str]]:
+    """Standard-Marker-Feld, mit synthetischen Begriffen auf size Einträge aufgefüllt"""
+    marker_field = {category: list(markers) for category, markers in DEFAULT_MARKER_FIELD.items()}
+    categories = list(marker_field)
+    existing = {marker for markers in marker_field.values() for marker in markers}
+
+    rng = random.Random(seed)
+    total = len(existing)
+    while total < size:
+        term = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if term in existing:
+            continue
+        existing.add(term)
+        marker_field[categories[total % len(categories)]].append(term)
+        total += 1
+
+    return marker_field
+
+
+class UtteranceGenerator:
+    """Erzeugt deutsche Äußerungen mit Markern in kontrollierter Dichte (deterministisch)"""
+
+    def __init__(self, marker_field: Dict[str, List[str]], density: float = DEFAULT_DENSITY,
+                 seed: int = DEFAULT_SEED, extra_words: List[str] = None):
+        self.markers = [marker for markers in marker_field.values() for marker in markers]
+        self.density = density
+        self.extra_words = extra_words or []
+        self.rng = random.Random(seed)
+
+    def utterance(self, words: int) -> str:
+        """Eine Äußerung mit ungefähr words Wörtern"""
+        rng = self.rng
+        parts = []
+        count = 0
+        while count < words:
+            if rng.random() < self.density:
+                phrase = rng.choice(self.markers)
+            elif self.extra_words and rng.random() < self.density:
+                phrase = rng.choice(self.extra_words)
+            else:
+                phrase = rng.choice(FILLER_WORDS)
+            parts.append(phrase)
+            count += phrase.count(" ") + 1
+            # Satzgrenzen etwa alle zwölf Wörter
+            if rng.random() < 1 / 12:
+                parts[-1] += rng.choice(".!?")
+
+        text = " ".join(parts)
+        return text[0].upper() + text[1:]
+
+    def corpus(self, count: int, words: int) -> List[str]:
+        return [self.utterance(words) for _ in range(count)]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-Rank-Perzentil einer sortierten Liste"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(func: Callable[[str], object], texts: List[str], warmup: int = 3) -> Dict:
+    """Misst jede Äußerung einzeln; Durchsatz aus der Gesamtzeit"""
+    for text in texts[:warmup]:
+        func(text)
+
+    durations = []
+    perf_counter = time.perf_counter
+    for text in texts:
+        started = perf_counter()
+        func(text)
+        durations.append(perf_counter() - started)
+
+    total = sum(durations)
+    durations.sort()
+    return {
+        "utterances": len(texts),
+        "per_second": len(texts) / total if total else 0.0,
+        "mean_ms": total / len(texts) * 1000.0,
+        "p50_ms": percentile(durations, 0.5) * 1000.0,
+        "p99_ms": percentile(durations, 0.99) * 1000.0
+    }
+
+
+def utterance_count(words: int, utterances: int) -> int:
+    return max(10, min(utterances, WORD_BUDGET // words))
+
+
+def build_kernel(marker_field: Dict[str, List[str]]) -> MCPKernel:
+    """Kernel mit festem Marker-Feld (ohne Marker-Dateien aus dem Home-Verzeichnis)"""
+    marker_dir = Path(tempfile.mkdtemp(prefix="mcp_bench_markers_"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        kernel = MCPKernel(marker_dir=marker_dir, verbose=False)
+        kernel.marker_field = marker_field
+        kernel.compile_marker_field()
+        kernel.init_behavior_logic()
+    return kernel
+
+
+def load_level_heuristics() -> Dict[str, Optional[Callable[[str], int]]]:
+    """Importiert die Agenten-Module; fehlende Abhängigkeiten werden übersprungen (None)"""
+    heuristics = {}
+    for module_name, class_name in LEVEL_HEURISTICS.items():
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                module = importlib.import_module(module_name)
+            method = getattr(getattr(module, class_name), "determine_mcp_level")
+        except Exception as e:
+            print(f"⚠️  {module_name}.determine_mcp_level übersprungen: {e}")
+            heuristics[module_name] = None
+            continue
+
+        # Die Heuristiken nutzen self nicht; ältere Varianten erwarten zusätzlich die Analyse
+        if len(inspect.signature(method).parameters) > 2:
+            heuristics[module_name] = lambda text, method=method: method(None, text, {})
+        else:
+            heuristics[module_name] = lambda text, method=method: method(None, text)
+    return heuristics
+
+
+def run_benchmarks(lengths: List[int] = None, vocab_sizes: List[int] = None,
+                   density: float = DEFAULT_DENSITY, seed: int = DEFAULT_SEED,
+                   utterances: int = 200, levels: bool = True) -> Dict:
+    """Führt alle Messreihen aus und gibt das Ergebnis-Dict zurück"""
+    lengths = lengths or DEFAULT_LENGTHS
+    vocab_sizes = vocab_sizes if vocab_sizes is not None else DEFAULT_VOCAB_SIZES
+    results = []
+
+    for vocab_size in vocab_sizes:
+        marker_field = synthetic_marker_field(vocab_size, seed)
+        vocabulary = sum(len(markers) for markers in marker_field.values())
+        kernel = build_kernel(marker_field)
+
+        for words in lengths:
+            generator = UtteranceGenerator(marker_field, density, seed + words)
+            texts = generator.corpus(utterance_count(words, utterances), words)
+            stats = measure(kernel.process_input, texts)
+            results.append({"case": f"process_input/words={words}/vocab={vocabulary}",
+                            "target": "process_input", "words": words, "vocab": vocabulary, **stats})
+            print(f"⏱️  process_input  words={words:<5} vocab={vocabulary:<5} "
+                  f"{stats['per_second']:>10.1f} utt/s  p50={stats['p50_ms']:.3f}ms  p99={stats['p99_ms']:.3f}ms")
+
+    if levels:
+        heuristics = load_level_heuristics()
+        for words in lengths:
+            generator = UtteranceGenerator(DEFAULT_MARKER_FIELD, density, seed + words, LEVEL_WORDS)
+            texts = generator.corpus(utterance_count(words, utterances), words)
+            for name, func in heuristics.items():
+                if func is None:
+                    continue
+                stats = measure(func, texts)
+                results.append({"case": f"determine_mcp_level/{name}/words={words}",
+                                "target": f"determine_mcp_level:{name}", "words": words, **stats})
+                print(f"⏱️  {name:<24} words={words:<5} {stats['per_second']:>10.1f} utt/s  "
+                      f"p99={stats['p99_ms']:.3f}ms")
+            for table in LEVEL_RULE_TABLES:
+                stats = measure(lambda text, variant=table.name: classify_level(text, variant), texts)
+                results.append({"case": f"classify_level/{table.name}/words={words}",
+                                "target": f"classify_level:{table.name}", "words": words, **stats})
+                print(f"⏱️  {'classify:' + table.name:<24} words={words:<5} {stats['per_second']:>10.1f} utt/s  "
+                      f"p99={stats['p99_ms']:.3f}ms")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "density": density,
+            "lengths": lengths,
+            "vocab_sizes": vocab_sizes
+        },
+        "results": results
+    }
+
+
+def compare_with_baseline(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Liste der Regressionen: Durchsatz oder p99 um mehr als threshold schlechter"""
+    baseline_cases = {result["case"]: result for result in baseline.get("results", [])}
+    regressions = []
+
+    for result in current.get("results", []):
+        reference = baseline_cases.get(result["case"])
+        if reference is None:
+            continue
+        if reference["per_second"] and result["per_second"] < reference["per_second"] * (1 - threshold):
+            regressions.append(f"{result['case']}: {result['per_second']:.1f} utt/s "
+                               f"(Baseline {reference['per_second']:.1f})")
+        if reference["p99_ms"] and result["p99_ms"] > reference["p99_ms"] * (1 + threshold):
+            regressions.append(f"{result['case']}: p99 {result['p99_ms']:.3f}ms "
+                               f"(Baseline {reference['p99_ms']:.3f}ms)")
+
+    return regressions
+
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="MCP Kernel Benchmark")
+    parser.add_argument("--lengths", type=parse_int_list, default=DEFAULT_LENGTHS,
+                        help="Wörter pro Äußerung, kommagetrennt (Standard: 5,20,100,500,2000)")
+    parser.add_argument("--vocab", type=parse_int_list, default=DEFAULT_VOCAB_SIZES,
+                        help="Vokabulargrößen, kommagetrennt (0 = Standard-Marker-Feld)")
+    parser.add_argument("--density", type=float, default=DEFAULT_DENSITY, help="Anteil Marker-Wörter")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--utterances", type=int, default=200, help="Äußerungen pro Messreihe (max.)")
+    parser.add_argument("--no-levels", action="store_true", help="determine_mcp_level nicht messen")
+    parser.add_argument("--output", default="mcp_benchmark.json", help="Ergebnis-Datei (JSON)")
+    parser.add_argument("--baseline", help="Baseline-Datei zum Vergleich")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Erlaubte Verschlechterung gegenüber der Baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.lengths, args.vocab, args.density, args.seed,
+                             args.utterances, not args.no_levels)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"💾 Ergebnisse gespeichert: {output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} Regression(en) gegenüber {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print(f"✅ Keine Regression gegenüber {args.baseline} (Schwelle {args.threshold:.0%})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,29 +10,570 @@ import yaml
 import json
 import re
 import time
+import hashlib
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+from functools import cached_property
+from bisect import bisect_right
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, namedtuple, OrderedDict
+
+from marker_matcher import MarkerAutomaton, MarkerScan
+from marker_fuzzy import FuzzyMarkerIndex, WORD
+from mcp_metrics import LatencyRecorder, NULL_STAGE
+
+# Standard-Marker; Dateien im Marker-Verzeichnis ergänzen oder überschreiben Kategorien
+DEFAULT_MARKER_FIELD = {
+    "strudel_markers": [
+        "sehne mich", "verlangen", "wünsche", "träume", "hoffnung",
+        "sehnen", "drang", "sehnsucht", "verlangen nach"
+    ],
+    "knoten_markers": [
+        "muss immer", "zwang", "pflicht", "druck", "verpflichtung",
+        "erwartung", "anforderung", "muss", "sollte", "habe zu"
+    ],
+    "kristall_markers": [
+        "erkannt dass", "verstanden", "einsicht", "klarheit",
+        "erkenntnis", "durchbruch", "transformation", "realisiert"
+    ],
+    "resonance_markers": [
+        "fühlt sich", "spüre", "resoniert", "schwingt", "vibriert",
+        "harmonisiert", "klingt", "echo", "widerhall"
+    ],
+    "context_markers": [
+        "im kontext", "vor dem hintergrund", "in bezug auf",
+        "angesichts", "mit rücksicht auf", "unter berücksichtigung"
+    ]
+}
+
+MARKER_FILE_SUFFIXES = (".yaml", ".yml")
+
+# Interne Vokabulare der Analyse-Stufen (werden zusammen mit dem Marker-Feld kompiliert)
+EMOTIONAL_WORDS = {
+    "positive": ["freude", "glück", "liebe", "begeisterung", "zufriedenheit"],
+    "negative": ["traurigkeit", "wut", "angst", "frustration", "enttäuschung"],
+    "neutral": ["ruhig", "ausgeglichen", "neutral", "sachlich"]
+}
+TEMPORAL_PATTERNS = ["jetzt", "gerade", "später", "vorher", "heute", "gestern"]
+SYSTEMIC_INDICATORS = [
+    "zusammenhang", "verbindung", "interaktion", "wechselwirkung",
+    "system", "ganzheitlich", "vernetzt", "integriert"
+]
+CONNECTION_INDICATORS = [
+    "und", "sowie", "auch", "gleichzeitig", "parallel",
+    "zusammen", "gemeinsam", "verbunden"
+]
+STABILITY_WORDS = ["stabil", "konstant", "gleichbleibend", "beständig", "ruhig"]
+CHANGE_WORDS = ["verändert", "entwickelt", "evolution", "wandlung", "transformation"]
+
+ANALYSIS_VOCABULARIES = {
+    **{f"analysis:emotion_{category}": words for category, words in EMOTIONAL_WORDS.items()},
+    "analysis:temporal": TEMPORAL_PATTERNS,
+    "analysis:systemic": SYSTEMIC_INDICATORS,
+    "analysis:connection": CONNECTION_INDICATORS,
+    "analysis:stability": STABILITY_WORDS,
+    "analysis:change": CHANGE_WORDS
+}
+
+# Teile des Kontexts, die das Ergebnis von process_input beeinflussen
+CONTEXT_RESULT_KEYS = ("previous_interactions", "established_patterns", "user_preferences", "system_state")
+
+SENTENCE_SEPARATORS = ".!?"
+
+# Ergebnis der Level-Klassifikation: Level, auslösende Begriffe und (bei score) der Punktwert
+LevelResult = namedtuple("LevelResult", ["level", "evidence", "score"])
+
+class AnalyzedText:
+    """Einmal pro Eingabe vorverarbeiteter Text, den alle Pipeline-Stufen teilen"""
+    
+    SENTENCE_SEPARATOR = re.compile(r'[.!?]')
+    TOKEN = re.compile(r'\S+')
+    
+    def __init__(self, text: str, scan: MarkerScan = None, field: "CompiledMarkerField" = None):
+        self.text = text
+        self.lower = text.lower()
+        self.tokens = text.split()
+        self.token_count = len(self.tokens)
+        self.unique_token_count = len(set(self.tokens))
+        self.scan = scan
+        self.field = field
+    
+    @cached_property
+    def token_offsets(self) -> List[Tuple[int, int]]:
+        """Zeichen-Spannen der Tokens im Originaltext"""
+        return [match.span() for match in self.TOKEN.finditer(self.text)]
+    
+    @cached_property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        """Satz-Spannen im Originaltext (wie re.split(r'[.!?]', text))"""
+        spans = []
+        start = 0
+        for match in self.SENTENCE_SEPARATOR.finditer(self.text):
+            spans.append((start, match.start()))
+            start = match.end()
+        spans.append((start, len(self.text)))
+        return spans
+    
+    def best_fuzzy_hits(self, index: FuzzyMarkerIndex) -> Dict[Tuple[str, str], Tuple]:
+        """Bester unscharfer Treffer pro (Kategorie, Begriff) im Text"""
+        return merge_best_fuzzy_hits({}, index.find(self.lower))
+    
+    def sentence_lower(self, span: Tuple[int, int]) -> str:
+        """Kleingeschriebener Satz zu einer Spanne"""
+        start, end = span
+        # lower() kann bei einzelnen Unicode-Zeichen die Länge ändern
+        if len(self.lower) == len(self.text):
+            return self.lower[start:end]
+        return self.text[start:end].lower()
+    
+    def sentence_around(self, offset: int) -> Optional[Tuple[int, int]]:
+        """Spanne des Satzes, der die Position enthält (None wenn Offsets nicht passen)"""
+        if len(self.lower) != len(self.text):
+            return None
+        text = self.text
+        start = max(text.rfind(separator, 0, offset) for separator in SENTENCE_SEPARATORS) + 1
+        ends = [position for position in (text.find(separator, offset) for separator in SENTENCE_SEPARATORS)
+                if position >= 0]
+        return start, min(ends) if ends else len(text)
+
+
+class StreamingText(AnalyzedText):
+    """Wachsender Text eines Streams; Tokens und Treffer werden nur für den neuen Teil berechnet"""
+    
+    def __init__(self, field: "CompiledMarkerField"):
+        super().__init__("", scan=MarkerScan(field.automaton, []), field=field)
+        self.node = 0
+        self._token_counts = {}
+        self._open_token = False
+        # Spannen bis zum jeweils gelesenen Textende; nur der Rest wird beim Zugriff ergänzt
+        self._token_offsets = []
+        self._token_end = 0
+        self._sentence_spans = [(0, 0)]
+        self._sentence_end = 0
+        # Unscharfe Treffer: vor dem Suchfenster zusammengefasst, im Fenster als Liste;
+        # dazu die Anfänge der Wörter (für das Suchfenster am Ende)
+        self._fuzzy_index = None
+        self._fuzzy_best = {}
+        self._fuzzy_tail = []
+        self._fuzzy_words = []
+        self._fuzzy_end = 0
+    
+    @property
+    def token_offsets(self) -> List[Tuple[int, int]]:
+        offsets = self._token_offsets
+        if self._token_end < len(self.text):
+            start = self._token_end
+            # Ein am alten Ende offenes Token kann sich fortgesetzt haben
+            if offsets and offsets[-1][1] == start:
+                start = offsets.pop()[0]
+            offsets.extend(match.span() for match in self.TOKEN.finditer(self.text, start))
+            self._token_end = len(self.text)
+        return offsets
+    
+    @property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        spans = self._sentence_spans
+        if self._sentence_end < len(self.text):
+            # Der letzte (offene) Satz reicht bis zum Textende und wird fortgesetzt
+            start = spans.pop()[0]
+            for match in self.SENTENCE_SEPARATOR.finditer(self.text, self._sentence_end):
+                spans.append((start, match.start()))
+                start = match.end()
+            spans.append((start, len(self.text)))
+            self._sentence_end = len(self.text)
+        return spans
+    
+    def best_fuzzy_hits(self, index: FuzzyMarkerIndex) -> Dict[Tuple[str, str], Tuple]:
+        """Wie AnalyzedText.best_fuzzy_hits; durchsucht wird nur das Ende ab dem ersten Wort,
+        das mit dem letzten (evtl. noch offenen) Wort einen Begriff bilden kann"""
+        if index is not self._fuzzy_index:
+            self._fuzzy_index = index
+            self._fuzzy_best = {}
+            self._fuzzy_tail = []
+            self._fuzzy_words = []
+            self._fuzzy_end = 0
+        if self._fuzzy_end < len(self.lower):
+            words = self._fuzzy_words
+            first = max(0, len(words) - max(index.max_term_words, 1))
+            restart = words[first] if words else 0
+            # Treffer vor dem Fenster ändern sich nicht mehr (das Fenster wandert nur nach hinten)
+            tail = self._fuzzy_tail
+            settled = 0
+            while settled < len(tail) and tail[settled].start < restart:
+                settled += 1
+            merge_best_fuzzy_hits(self._fuzzy_best, tail[:settled])
+            self._fuzzy_tail = index.find(self.lower, restart)
+            # Das letzte Wort kann sich fortgesetzt haben, sein Anfang bleibt gleich
+            resume = words.pop() if words else 0
+            words.extend(match.start() for match in WORD.finditer(self.lower, resume))
+            self._fuzzy_end = len(self.lower)
+        return merge_best_fuzzy_hits(dict(self._fuzzy_best), self._fuzzy_tail)
+    
+    def append(self, chunk: str) -> List:
+        """Hängt Text an und gibt die neuen Marker-Treffer zurück"""
+        previous_length = len(self.lower)
+        self.text += chunk
+        self.lower += chunk.lower()
+        self._append_tokens(chunk)
+        
+        self.scan.recheck_boundaries(self.lower, previous_length)
+        hits, self.node = self.field.automaton.find_from(self.lower, previous_length, self.node)
+        self.scan.extend(hits)
+        return hits
+    
+    def _append_tokens(self, chunk: str):
+        tokens = chunk.split()
+        if tokens:
+            # Ein am Ende offenes Token setzt sich im neuen Chunk fort
+            if self._open_token and not chunk[0].isspace() and self.tokens:
+                last = self.tokens.pop()
+                self._forget_token(last)
+                tokens[0] = last + tokens[0]
+            for token in tokens:
+                self.tokens.append(token)
+                self._token_counts[token] = self._token_counts.get(token, 0) + 1
+        if chunk:
+            self._open_token = not chunk[-1].isspace()
+        self.token_count = len(self.tokens)
+        self.unique_token_count = len(self._token_counts)
+    
+    def _forget_token(self, token: str):
+        count = self._token_counts.get(token, 0) - 1
+        if count > 0:
+            self._token_counts[token] = count
+        else:
+            self._token_counts.pop(token, None)
+
+
+TextInput = Union[str, AnalyzedText]
+
+
+def merge_best_fuzzy_hits(best: Dict, hits) -> Dict:
+    """Übernimmt Treffer (nach Position) in best: pro (Kategorie, Begriff) die kleinste Distanz, bei Gleichstand der erste"""
+    for hit in hits:
+        key = (hit.category, hit.term)
+        current = best.get(key)
+        if current is None or hit.distance < current.distance:
+            best[key] = hit
+    return best
+
+
+def clone_result(value):
+    """Kopiert ein Ergebnis-Dict (nur dicts/lists, schneller als deepcopy)"""
+    if isinstance(value, dict):
+        return {key: clone_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [clone_result(item) for item in value]
+    return value
+
+
+def context_fingerprint(context: Dict = None) -> Optional[str]:
+    """Stabiler Hash der ergebnisrelevanten Kontext-Teile"""
+    if not context:
+        return None
+    relevant = {key: context.get(key) for key in CONTEXT_RESULT_KEYS}
+    payload = json.dumps(relevant, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Größenbegrenzter LRU-Cache für Ergebnisse von process_input"""
+    
+    # Ohne Lock: die einzelnen OrderedDict-Operationen sind unter dem GIL atomar,
+    # Wettläufe beim Verdrängen werden abgefangen; Zähler sind unter Last nur ungefähr
+    
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+    
+    def get(self, key) -> Optional[Dict]:
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            pass
+        self.hits += 1
+        return result
+    
+    def put(self, key, result: Dict):
+        entries = self._entries
+        entries[key] = result
+        try:
+            entries.move_to_end(key)
+        except KeyError:
+            pass
+        while len(entries) > self.max_size:
+            try:
+                entries.popitem(last=False)
+            except KeyError:
+                break
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+class CompiledMarkerField:
+    """Unveränderlicher Schnappschuss aus Marker-Feld und kompiliertem Automaten"""
+    
+    def __init__(self, marker_field: Dict[str, List[str]], version: int = 0):
+        self.marker_field = {category: list(markers) for category, markers in marker_field.items()}
+        self.version = version
+        
+        automaton = MarkerAutomaton()
+        for category, markers in self.marker_field.items():
+            automaton.add_all(category, markers)
+        for category, words in ANALYSIS_VOCABULARIES.items():
+            automaton.add_all(category, words)
+        automaton.compile()
+        self.automaton = automaton
+        self._fuzzy_indexes = {}
+    
+    def fuzzy_index(self, max_distance: int, min_similarity: float) -> FuzzyMarkerIndex:
+        """Trigramm-Index über das Marker-Feld (einmal pro Einstellung gebaut)"""
+        key = (max_distance, min_similarity)
+        index = self._fuzzy_indexes.get(key)
+        if index is None:
+            index = FuzzyMarkerIndex(max_distance, min_similarity)
+            for category, markers in self.marker_field.items():
+                index.add_all(category, markers)
+            index.compile()
+            self._fuzzy_indexes[key] = index
+        return index
+
+
+class MCPBatchResult:
+    """Spaltenorientiertes Ergebnis von MCPKernel.process_batch (Zeilen = Texte)"""
+    
+    def __init__(self, texts: List[str], categories: List[str], resonance_markers: List[str],
+                 counts: np.ndarray, token_counts: np.ndarray, marker_density: np.ndarray,
+                 pattern_strength: np.ndarray, contextual_relevance: np.ndarray,
+                 resonance_counts: np.ndarray, resonance_strength: np.ndarray, complexity: np.ndarray,
+                 fuzzy_matches: List[List[Dict]] = None):
+        self.texts = texts
+        self.categories = categories
+        self.resonance_markers = resonance_markers
+        self.counts = counts
+        self.token_counts = token_counts
+        self.marker_density = marker_density
+        self.pattern_strength = pattern_strength
+        self.contextual_relevance = contextual_relevance
+        self.resonance_counts = resonance_counts
+        self.resonance_strength = resonance_strength
+        self.complexity = complexity
+        # Pro Text die unscharfen Treffer (nur mit aktivem Fuzzy-Modus, sonst None)
+        self.fuzzy_matches = fuzzy_matches
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def row(self, index: int) -> Dict:
+        """Kompakte Zusammenfassung eines einzelnen Textes"""
+        detected = self.counts[index] > 0
+        resonant = self.resonance_counts[index] > 0
+        row = {
+            "input": self.texts[index],
+            "marker_density": {category: float(value) for category, value, hit
+                               in zip(self.categories, self.marker_density[index], detected) if hit},
+            "pattern_strength": {category: float(value) for category, value, hit
+                                 in zip(self.categories, self.pattern_strength[index], detected) if hit},
+            "contextual_relevance": float(self.contextual_relevance[index]),
+            "resonance_strength": {marker: float(value) for marker, value, hit
+                                   in zip(self.resonance_markers, self.resonance_strength[index], resonant) if hit},
+            "complexity": float(self.complexity[index])
+        }
+        if self.fuzzy_matches is not None:
+            row["fuzzy_matches"] = self.fuzzy_matches[index]
+        return row
+
+
+class LevelRuleTable:
+    """Regeltabelle einer determine_mcp_level-Variante
+    
+    rules: Liste aus (Wert, Begriffe). Je nach mode ist der Wert ein Level oder ein Gewicht:
+      - "last_match":  Level der letzten Regel mit Treffer (kumulative if-Kette)
+      - "first_match": Level der ersten Regel mit Treffer (if/elif-Kette)
+      - "score":       Wortanzahl * word_weight + Gewicht je gefundenem Begriff,
+                       Level = Anzahl der erreichten thresholds
+    """
+    
+    MODES = ("last_match", "first_match", "score")
+    
+    def __init__(self, name: str, mode: str, rules: List[Tuple[float, List[str]]], default: int = 0,
+                 word_weight: float = 0.0, thresholds: List[float] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unbekannter Level-Modus: {mode}")
+        self.name = name
+        self.mode = mode
+        self.rules = [(value, [word.lower() for word in words]) for value, words in rules]
+        self.default = default
+        self.word_weight = word_weight
+        self.thresholds = sorted(thresholds or [])
+    
+    @property
+    def vocabulary(self) -> List[str]:
+        """Alle Begriffe der Tabelle ohne Duplikate"""
+        return list(dict.fromkeys(word for _, words in self.rules for word in words))
+    
+    def evaluate(self, found: set, token_count: int) -> LevelResult:
+        """Bestimmt das Level aus der Menge der im Text gefundenen Begriffe"""
+        if self.mode == "score":
+            evidence = []
+            score = token_count * self.word_weight
+            for value, words in self.rules:
+                for word in words:
+                    if word in found:
+                        score += value
+                        evidence.append(word)
+            return LevelResult(bisect_right(self.thresholds, score), evidence, score)
+        
+        rules = reversed(self.rules) if self.mode == "last_match" else self.rules
+        for value, words in rules:
+            evidence = [word for word in words if word in found]
+            if evidence:
+                return LevelResult(value, evidence, None)
+        return LevelResult(self.default, [], None)
+
+
+# Regeltabellen der Agenten (bisher jeweils eigene determine_mcp_level-Implementierungen)
+LEVEL_RULE_TABLES = [
+    # otto_claude_enhanced, otto_mcp_working, otto_claude_elevenlabs, otto_claude_only
+    LevelRuleTable("cumulative", "last_match", [
+        (1, ["fühle", "empfinde", "liebe", "hasse", "freue", "traurig", "glücklich"]),
+        (2, ["mache", "tue", "verhalte", "reagiere", "handele", "entscheide"]),
+        (3, ["system", "zusammenhang", "muster", "struktur", "ganzheitlich"]),
+        (4, ["denke", "reflektiere", "überlege", "analysiere", "verstehe"]),
+        (5, ["emergenz", "komplexität", "evolution", "entwicklung", "wachstum"])
+    ], default=0),
+    # otto_claude_priority
+    LevelRuleTable("complexity_score", "score", [
+        (2, ["systemisch", "emergent", "meta", "transzendent", "reflexion"]),
+        (1, ["fühle", "empfinde", "verstehe", "denke", "glaube"])
+    ], word_weight=0.1, thresholds=[1, 2, 3, 4, 5]),
+    # otto_adaptive_learning
+    LevelRuleTable("adaptive_learning", "first_match", [
+        (5, ["lernen", "entwickeln", "wachsen", "systemisch", "muster"]),
+        (4, ["verstehen", "analysieren", "zusammenhang"]),
+        (3, ["aufgabe", "strukturieren", "organisieren"]),
+        (1, ["hallo", "test", "funktioniert"])
+    ], default=2),
+    # otto_final_clean
+    LevelRuleTable("final_clean", "first_match", [
+        (5, ["lernen", "entwickeln", "wachsen", "systemisch"]),
+        (4, ["verstehen", "analysieren", "muster"]),
+        (3, ["zusammenhang", "kontext", "beziehung"]),
+        (2, ["aufgabe", "strukturieren", "organisieren"]),
+        (1, ["hallo", "test", "funktioniert"])
+    ], default=0)
+]
+
+
+class LevelClassifier:
+    """Bestimmt MCP-Level für alle Agenten-Varianten; der Text wird nur einmal aufbereitet"""
+    
+    def __init__(self, tables: List[LevelRuleTable] = None):
+        self.tables = {}
+        self.vocabulary = []
+        for table in tables if tables is not None else LEVEL_RULE_TABLES:
+            self.tables[table.name] = table
+        self.compile()
+    
+    def register(self, table: LevelRuleTable):
+        """Fügt eine Regeltabelle hinzu oder ersetzt sie"""
+        self.tables[table.name] = table
+        self.compile()
+    
+    def compile(self):
+        """Gemeinsames Vokabular aller Tabellen (jeder Begriff wird nur einmal gesucht)"""
+        vocabulary = {}
+        for table in self.tables.values():
+            vocabulary.update(dict.fromkeys(table.vocabulary))
+        self.vocabulary = list(vocabulary)
+        self._table_vocabularies = {name: table.vocabulary for name, table in self.tables.items()}
+    
+    def find(self, text: TextInput, vocabulary: List[str], count_tokens: bool = True) -> Tuple[set, int]:
+        """Gefundene Begriffe und Wortanzahl; ein lower() pro Text"""
+        if isinstance(text, AnalyzedText):
+            text_lower, token_count = text.lower, text.token_count
+        else:
+            text_lower, token_count = text.lower(), None
+        # Substring-Suche wie bisher ("fühle" trifft auch "fühlen")
+        found = {word for word in vocabulary if word in text_lower}
+        if token_count is None:
+            token_count = len(text_lower.split()) if count_tokens else 0
+        return found, token_count
+    
+    def classify(self, text: TextInput, variant: str = "cumulative") -> LevelResult:
+        """Level und auslösende Begriffe für eine Variante"""
+        table = self.tables[variant]
+        found, token_count = self.find(text, self._table_vocabularies[variant], table.word_weight != 0)
+        return table.evaluate(found, token_count)
+    
+    def classify_all(self, text: TextInput) -> Dict[str, LevelResult]:
+        """Alle Varianten aus einer gemeinsamen Suche"""
+        found, token_count = self.find(text, self.vocabulary)
+        return {name: table.evaluate(found, token_count) for name, table in self.tables.items()}
+    
+    def classify_batch(self, texts: List[TextInput], variant: str = "cumulative") -> List[LevelResult]:
+        """Klassifiziert viele Texte mit derselben Regeltabelle"""
+        table = self.tables[variant]
+        vocabulary = self._table_vocabularies[variant]
+        count_tokens = table.word_weight != 0
+        results = []
+        for text in texts:
+            found, token_count = self.find(text, vocabulary, count_tokens)
+            results.append(table.evaluate(found, token_count))
+        return results
+    
+    def levels(self, texts: List[TextInput], variant: str = "cumulative") -> np.ndarray:
+        """Nur die Level eines Batches als Array"""
+        return np.array([result.level for result in self.classify_batch(texts, variant)], dtype=np.int8)
+
 
 class MCPKernel:
-    def __init__(self, marker_stream=True, semantic_resonance=True):
+    def __init__(self, marker_stream=True, semantic_resonance=True, cache_size=0, marker_dir=None,
+                 field_source: "MCPKernel" = None, verbose=True):
         self.marker_stream = marker_stream
         self.semantic_resonance = semantic_resonance
         self.resonance_patterns = defaultdict(list)
         self.context_memory = {}
         self.behavior_logic = {}
         self.marker_field = {}
+        self.compiled_field = None
+        self.field_source = field_source
+        self.marker_dir = Path(marker_dir) if marker_dir else Path.home() / "Documents" / "Otto_Mind_System" / "Markers"
+        self.marker_manifest = {}
+        self.marker_file_categories = {}
+        self._refresh_lock = threading.Lock()
+        self.latency_recorder = None
+        self.result_cache = ResultCache(cache_size) if cache_size else None
+        self.fuzzy_settings = None
         
         # Systemische Parameter
         self.resonance_threshold = 0.7
         self.context_decay_rate = 0.1
         self.pattern_evolution_rate = 0.05
         
-        print("🧠 MCP Kernel initialisiert")
-        print(f"   Marker Stream: {marker_stream}")
-        print(f"   Semantic Resonance: {semantic_resonance}")
+        if verbose:
+            print("🧠 MCP Kernel initialisiert")
+            print(f"   Marker Stream: {marker_stream}")
+            print(f"   Semantic Resonance: {semantic_resonance}")
 
     def init(self, marker_stream=True, semantic_resonance=True):
         """Initialisiert den MCP Kernel"""
@@ -49,34 +590,109 @@ class MCPKernel:
 
     def load_marker_field(self):
         """Lädt das Marker-Feld aus YAML-Dateien"""
-        marker_dir = Path.home() / "Documents" / "Otto_Mind_System" / "Markers"
-        marker_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Standard-Marker laden
-        self.marker_field = {
-            "strudel_markers": [
-                "sehne mich", "verlangen", "wünsche", "träume", "hoffnung",
-                "sehnen", "drang", "sehnsucht", "verlangen nach"
-            ],
-            "knoten_markers": [
-                "muss immer", "zwang", "pflicht", "druck", "verpflichtung",
-                "erwartung", "anforderung", "muss", "sollte", "habe zu"
-            ],
-            "kristall_markers": [
-                "erkannt dass", "verstanden", "einsicht", "klarheit",
-                "erkenntnis", "durchbruch", "transformation", "realisiert"
-            ],
-            "resonance_markers": [
-                "fühlt sich", "spüre", "resoniert", "schwingt", "vibriert",
-                "harmonisiert", "klingt", "echo", "widerhall"
-            ],
-            "context_markers": [
-                "im kontext", "vor dem hintergrund", "in bezug auf",
-                "angesichts", "mit rücksicht auf", "unter berücksichtigung"
-            ]
-        }
+        self.marker_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Vollständig neu laden: Manifest verwerfen
+        self.marker_manifest = {}
+        self.marker_file_categories = {}
+        self.refresh(force=True)
+        
+        print(f"📊 Marker-Feld geladen: {len(self.marker_field)} Kategorien "
+              f"({len(self.marker_file_categories)} Dateien aus {self.marker_dir})")
+
+    def refresh(self, force: bool = False) -> bool:
+        """Liest nur geänderte Marker-Dateien neu ein und tauscht das Feld atomar aus"""
+        with self._refresh_lock:
+            current = {}
+            if self.marker_dir.exists():
+                for path in sorted(self.marker_dir.iterdir()):
+                    if path.suffix not in MARKER_FILE_SUFFIXES:
+                        continue
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    current[str(path)] = (stat.st_mtime_ns, stat.st_size)
+            
+            changed = [path for path, signature in current.items()
+                       if self.marker_manifest.get(path) != signature]
+            removed = [path for path in self.marker_manifest if path not in current]
+            if not changed and not removed and not force:
+                return False
+            
+            for path in removed:
+                self.marker_file_categories.pop(path, None)
+            for path in changed:
+                parsed = self.read_marker_file(Path(path))
+                # Bei Fehlern bleibt die letzte gültige Version der Kategorie aktiv
+                if parsed is not None:
+                    self.marker_file_categories[path] = parsed
+            self.marker_manifest = current
+            
+            marker_field = {category: list(markers) for category, markers in DEFAULT_MARKER_FIELD.items()}
+            for path in sorted(self.marker_file_categories):
+                category, markers = self.marker_file_categories[path]
+                marker_field[category] = markers
+            
+            self.marker_field = marker_field
+            self.compile_marker_field()
+            
+            if not force:
+                print(f"🔄 Marker-Feld aktualisiert: {len(changed)} geändert, {len(removed)} entfernt")
+            return True
+
+    def read_marker_file(self, path: Path) -> Optional[Tuple[str, List[str]]]:
+        """Liest eine Marker-Datei (Liste oder {category, markers}) ein"""
+        try:
+            data = yaml.safe_load(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"⚠️  Fehler beim Laden von {path.name}: {e}")
+            return None
+        
+        category = path.stem
+        if isinstance(data, dict):
+            category = str(data.get("category", category))
+            markers = data.get("markers") or []
+        elif isinstance(data, list):
+            markers = data
+        else:
+            markers = []
+        
+        return category, [str(marker).lower() for marker in markers if marker]
+
+    def compile_marker_field(self):
+        """Kompiliert Marker-Feld und Analyse-Vokabulare und tauscht den Schnappschuss atomar aus"""
+        version = self.compiled_field.version + 1 if self.compiled_field else 1
+        self.compiled_field = CompiledMarkerField(self.marker_field, version)
+        self.clear_cache()
+
+    def current_field(self) -> "CompiledMarkerField":
+        """Aktueller kompilierter Schnappschuss (wird bei Bedarf erzeugt)"""
+        # Session-Kernel teilen sich das Feld ihres Quell-Kernels
+        if self.field_source is not None:
+            return self.field_source.current_field()
+        
+        field = self.compiled_field
+        if field is None:
+            self.compile_marker_field()
+            field = self.compiled_field
+        return field
+
+    def scan(self, text: TextInput) -> MarkerScan:
+        """Findet alle Vokabular-Treffer mit Kategorie, Offset und Wortgrenzen in einem Durchlauf"""
+        return self.analyze_text(text).scan
+
+    def analyze_text(self, text: TextInput, field: "CompiledMarkerField" = None) -> AnalyzedText:
+        """Bereitet den Text einmal für alle Pipeline-Stufen auf"""
+        if isinstance(text, AnalyzedText):
+            return text
+        
+        if field is None:
+            field = self.current_field()
         
-        print(f"📊 Marker-Feld geladen: {len(self.marker_field)} Kategorien")
+        analyzed = AnalyzedText(text, field=field)
+        analyzed.scan = field.automaton.scan(analyzed.lower)
+        return analyzed
 
     def init_behavior_logic(self):
         """Initialisiert die Verhaltenslogik"""
@@ -103,12 +719,81 @@ class MCPKernel:
             }
         }
         
+        self.clear_cache()
+        
         print(f"⚙️  Verhaltenslogik initialisiert: {len(self.behavior_logic)} Module")
 
+    def enable_cache(self, max_size: int = 256):
+        """Aktiviert den Ergebnis-Cache (LRU, begrenzt auf max_size Einträge)"""
+        self.result_cache = ResultCache(max_size)
+
+    def disable_cache(self):
+        """Deaktiviert den Ergebnis-Cache"""
+        self.result_cache = None
+
+    def clear_cache(self):
+        """Verwirft alle gecachten Ergebnisse (z.B. nach Konfigurationsänderung)"""
+        if self.result_cache is not None:
+            self.result_cache.clear()
+
+    def enable_fuzzy(self, max_distance: int = 2, min_similarity: float = 0.75):
+        """Aktiviert fehlertolerante Marker-Erkennung (ASR-Fehler) in analyze_markers, process_batch und stream"""
+        self.fuzzy_settings = (max_distance, min_similarity)
+        self.clear_cache()
+
+    def disable_fuzzy(self):
+        """Nur noch exakte Marker-Treffer"""
+        self.fuzzy_settings = None
+        self.clear_cache()
+
+    def cache_stats(self) -> Dict:
+        """Gibt Hit/Miss-Zähler des Ergebnis-Caches zurück"""
+        if self.result_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.result_cache.stats()}
+
+    def cache_key(self, text: str, context: Dict = None, field: "CompiledMarkerField" = None) -> Tuple:
+        """Cache-Schlüssel aus Text, Kontext-Hash und Feld-Version"""
+        # Der Text bleibt unverändert: Groß-/Kleinschreibung fließt in Komplexität und
+        # Resonanz-Kontext ein, Leerraum am Rand verschiebt Spans und Satz-Ausschnitte
+        field = field or self.current_field()
+        return (text, self.semantic_resonance, context_fingerprint(context), field.version,
+                self.fuzzy_settings)
+
     def process_input(self, text: str, context: Dict = None) -> Dict:
         """Verarbeitet Eingabe mit systemischem Verständnis"""
+        recorder = self.latency_recorder
+        started = time.perf_counter() if recorder is not None else 0.0
+        
+        field = self.current_field()
+        cache_key = None
+        if self.result_cache is not None and isinstance(text, str):
+            cache_key = self.cache_key(text, context, field)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                result = clone_result(cached)
+                result["input"] = text
+                result["timestamp"] = datetime.now().isoformat()
+                if recorder is not None:
+                    recorder.record("process_input_cached", time.perf_counter() - started)
+                return result
+        
+        with self.stage("analyze_text"):
+            analyzed = self.analyze_text(text, field)
+        result = self.run_pipeline(analyzed, context)
+        
+        if cache_key is not None:
+            self.result_cache.put(cache_key, clone_result(result))
+        
+        if recorder is not None:
+            recorder.record("process_input", time.perf_counter() - started)
+        
+        return result
+
+    def run_pipeline(self, analyzed: AnalyzedText, context: Dict = None) -> Dict:
+        """Führt die fünf Analyse-Stufen auf einem vorbereiteten Text aus"""
         result = {
-            "input": text,
+            "input": analyzed.text,
             "timestamp": datetime.now().isoformat(),
             "marker_analysis": {},
             "resonance_patterns": [],
@@ -118,24 +803,208 @@ class MCPKernel:
         }
         
         # 1. Marker-Analyse
-        result["marker_analysis"] = self.analyze_markers(text)
+        with self.stage("analyze_markers"):
+            result["marker_analysis"] = self.analyze_markers(analyzed)
         
         # 2. Resonanzmuster-Verarbeitung
         if self.semantic_resonance:
-            result["resonance_patterns"] = self.process_resonance_patterns(text)
+            with self.stage("process_resonance_patterns"):
+                result["resonance_patterns"] = self.process_resonance_patterns(analyzed)
         
         # 3. Kontext-Verständnis
-        result["context_understanding"] = self.understand_context(text, context)
+        with self.stage("understand_context"):
+            result["context_understanding"] = self.understand_context(analyzed, context)
         
         # 4. Verhaltenslogik anwenden
-        result["behavioral_response"] = self.apply_behavior_logic(result)
+        with self.stage("apply_behavior_logic"):
+            result["behavioral_response"] = self.apply_behavior_logic(result)
         
         # 5. Systemische Einsichten
+        with self.stage("generate_systemic_insights"):
+            result["systemic_insights"] = self.generate_systemic_insights(result)
+        
+        return result
+
+    def stream(self, context: Dict = None, on_update=None) -> "MCPStream":
+        """Startet eine inkrementelle Analyse für wachsende Teil-Transkripte"""
+        return MCPStream(self, context, on_update)
+
+    def stage(self, name: str):
+        """Zeitmessung einer Pipeline-Stufe (No-op ohne aktive Instrumentierung)"""
+        recorder = self.latency_recorder
+        if recorder is None:
+            return NULL_STAGE
+        return recorder.stage(name)
+
+    def enable_instrumentation(self, bounds_ms: List[float] = None) -> LatencyRecorder:
+        """Aktiviert die Latenz-Histogramme pro Stufe"""
+        self.latency_recorder = LatencyRecorder(bounds_ms)
+        return self.latency_recorder
+
+    def disable_instrumentation(self):
+        """Deaktiviert die Latenzmessung"""
+        self.latency_recorder = None
+
+    def latency_stats(self) -> Dict[str, Dict]:
+        """Histogramme aller gemessenen Stufen"""
+        if self.latency_recorder is None:
+            return {}
+        return self.latency_recorder.snapshot()
+
+    def dump_latency(self, path, reset: bool = False) -> int:
+        """Schreibt die Histogramme als JSON-Lines (eine Zeile pro Stufe)"""
+        if self.latency_recorder is None:
+            return 0
+        return self.latency_recorder.dump_jsonl(path, reset)
+
+    def process_batch(self, texts: List[str], contexts: List[Dict] = None, columnar: bool = False):
+        """Verarbeitet viele Texte auf einmal, Kennzahlen als NumPy-Matrizen (Texte × Kategorien)"""
+        field = self.current_field()
+        analyzed = [self.analyze_text(text, field) for text in texts]
+        scores = self.score_batch(analyzed, field)
+        
+        if columnar:
+            return scores
+        
+        if contexts is None:
+            contexts = [None] * len(analyzed)
+        elif len(contexts) != len(analyzed):
+            raise ValueError("contexts muss genauso viele Einträge haben wie texts")
+        
+        return [self.assemble_batch_result(scores, index, item, context)
+                for index, (item, context) in enumerate(zip(analyzed, contexts))]
+
+    def score_batch(self, analyzed: List[AnalyzedText], field: "CompiledMarkerField" = None) -> MCPBatchResult:
+        """Berechnet Marker-Dichte, Pattern-, Resonanz-Stärke und Komplexität vektorisiert
+        
+        Im Fuzzy-Modus zählen unscharfe Treffer wie in analyze_markers zu ihrer Kategorie.
+        """
+        if field is None:
+            field = analyzed[0].field if analyzed else self.current_field()
+        marker_field = field.marker_field
+        categories = list(marker_field)
+        column = {category: index for index, category in enumerate(categories)}
+        entries = field.automaton.entries
+        entry_columns = np.array([column.get(category, -1) for category, _ in entries], dtype=np.intp)
+        resonance_entries = [entry for entry, (category, _) in enumerate(entries)
+                             if category == "resonance_markers"]
+        resonance_column = {entry: index for index, entry in enumerate(resonance_entries)}
+        
+        # Nur die Treffer werden in Python durchlaufen, die Bewertung erfolgt auf den Matrizen
+        hit_rows, hit_entries = [], []
+        resonance_rows, resonance_cols, resonance_values = [], [], []
+        for row, item in enumerate(analyzed):
+            for entry in item.scan.by_entry:
+                hit_rows.append(row)
+                hit_entries.append(entry)
+                if entry in resonance_column:
+                    resonance_rows.append(row)
+                    resonance_cols.append(resonance_column[entry])
+                    resonance_values.append(item.scan.count(entry))
+        
+        size = len(analyzed)
+        counts = np.zeros((size, len(categories)), dtype=np.int64)
+        if hit_rows:
+            cols = entry_columns[np.asarray(hit_entries, dtype=np.intp)]
+            mask = cols >= 0
+            np.add.at(counts, (np.asarray(hit_rows, dtype=np.intp)[mask], cols[mask]), 1)
+        
+        fuzzy_matches = None
+        if self.fuzzy_settings is not None:
+            fuzzy_matches = [self.find_fuzzy_markers(item) for item in analyzed]
+            for row, matches in enumerate(fuzzy_matches):
+                for match in matches:
+                    counts[row, column[match["category"]]] += 1
+        
+        resonance_counts = np.zeros((size, len(resonance_entries)), dtype=np.int64)
+        if resonance_rows:
+            resonance_counts[resonance_rows, resonance_cols] = resonance_values
+        
+        token_counts = np.fromiter((item.token_count for item in analyzed), dtype=np.int64, count=size)
+        unique_counts = np.fromiter((item.unique_token_count for item in analyzed), dtype=np.int64, count=size)
+        category_sizes = np.array([len(marker_field[category]) for category in categories], dtype=np.float64)
+        text_length = np.maximum(token_counts, 1)[:, None]
+        
+        marker_density = np.divide(counts, category_sizes, out=np.zeros(counts.shape), where=category_sizes > 0)
+        pattern_strength = np.minimum(counts / text_length, 1.0)
+        detected_categories = (counts > 0).sum(axis=1)
+        contextual_relevance = np.where(
+            detected_categories > 0,
+            np.minimum(pattern_strength.sum(axis=1) / np.maximum(detected_categories, 1), 1.0),
+            0.0
+        )
+        resonance_strength = np.minimum(resonance_counts / text_length * 2, 1.0)
+        complexity = np.where(token_counts > 0, np.minimum(unique_counts / np.maximum(token_counts, 1), 1.0), 0.0)
+        
+        return MCPBatchResult(
+            texts=[item.text for item in analyzed],
+            categories=categories,
+            resonance_markers=[entries[entry][1] for entry in resonance_entries],
+            counts=counts,
+            token_counts=token_counts,
+            marker_density=marker_density,
+            pattern_strength=pattern_strength,
+            contextual_relevance=contextual_relevance,
+            resonance_counts=resonance_counts,
+            resonance_strength=resonance_strength,
+            complexity=complexity,
+            fuzzy_matches=fuzzy_matches
+        )
+
+    def assemble_batch_result(self, scores: MCPBatchResult, index: int, analyzed: AnalyzedText,
+                              context: Dict = None) -> Dict:
+        """Baut das von process_input bekannte Ergebnis aus einer Batch-Zeile"""
+        marker_analysis = {
+            "detected_markers": [],
+            "marker_density": {},
+            "pattern_strength": {},
+            "contextual_relevance": float(scores.contextual_relevance[index])
+        }
+        fuzzy_terms = {}
+        if scores.fuzzy_matches is not None:
+            marker_analysis["fuzzy_matches"] = scores.fuzzy_matches[index]
+            for match in marker_analysis["fuzzy_matches"]:
+                fuzzy_terms.setdefault(match["category"], []).append(match["marker"])
+        
+        density = scores.marker_density[index].tolist()
+        strength = scores.pattern_strength[index].tolist()
+        for column, category in enumerate(scores.categories):
+            if density[column] > 0:
+                marker_analysis["detected_markers"].extend(analyzed.scan.terms(category))
+                marker_analysis["detected_markers"].extend(fuzzy_terms.get(category, ()))
+                marker_analysis["marker_density"][category] = density[column]
+                marker_analysis["pattern_strength"][category] = strength[column]
+        
+        result = {
+            "input": analyzed.text,
+            "timestamp": datetime.now().isoformat(),
+            "marker_analysis": marker_analysis,
+            "resonance_patterns": [],
+            "context_understanding": {},
+            "behavioral_response": {},
+            "systemic_insights": []
+        }
+        
+        if self.semantic_resonance:
+            resonance_strength = dict(zip(scores.resonance_markers, scores.resonance_strength[index].tolist()))
+            for marker in analyzed.scan.terms("resonance_markers"):
+                result["resonance_patterns"].append({
+                    "type": "resonance",
+                    "marker": marker,
+                    "strength": resonance_strength[marker],
+                    "context": self.extract_resonance_context(analyzed, marker)
+                })
+            emotional_pattern = self.analyze_emotional_resonance(analyzed)
+            if emotional_pattern:
+                result["resonance_patterns"].append(emotional_pattern)
+        
+        result["context_understanding"] = self.understand_context(analyzed, context)
+        result["behavioral_response"] = self.apply_behavior_logic(result)
         result["systemic_insights"] = self.generate_systemic_insights(result)
         
         return result
 
-    def analyze_markers(self, text: str) -> Dict:
+    def analyze_markers(self, text: TextInput) -> Dict:
         """Analysiert Marker im Text"""
         analysis = {
             "detected_markers": [],
@@ -144,31 +1013,51 @@ class MCPKernel:
             "contextual_relevance": 0.0
         }
         
-        text_lower = text.lower()
+        analyzed = self.analyze_text(text)
         
-        for category, markers in self.marker_field.items():
-            detected = []
-            for marker in markers:
-                if marker in text_lower:
-                    detected.append(marker)
+        fuzzy_terms = {}
+        if self.fuzzy_settings is not None:
+            analysis["fuzzy_matches"] = self.find_fuzzy_markers(analyzed)
+            for match in analysis["fuzzy_matches"]:
+                fuzzy_terms.setdefault(match["category"], []).append(match["marker"])
+        
+        for category, markers in analyzed.field.marker_field.items():
+            detected = analyzed.scan.terms(category)
+            if category in fuzzy_terms:
+                detected = detected + fuzzy_terms[category]
             
             if detected:
                 analysis["detected_markers"].extend(detected)
                 analysis["marker_density"][category] = len(detected) / len(markers)
-                analysis["pattern_strength"][category] = self.calculate_pattern_strength(detected, text)
+                analysis["pattern_strength"][category] = self.calculate_pattern_strength(detected, analyzed)
         
         # Kontextuelle Relevanz berechnen
         analysis["contextual_relevance"] = self.calculate_contextual_relevance(analysis)
         
         return analysis
 
-    def calculate_pattern_strength(self, markers: List[str], text: str) -> float:
+    def find_fuzzy_markers(self, analyzed: AnalyzedText) -> List[Dict]:
+        """Unscharfe Treffer für Marker, die nicht exakt im Text stehen (bester Treffer pro Marker)"""
+        index = analyzed.field.fuzzy_index(*self.fuzzy_settings)
+        best = [hit for hit in analyzed.best_fuzzy_hits(index).values()
+                if hit.term.lower() not in analyzed.scan.terms(hit.category)]
+        
+        return [{
+            "marker": hit.term,
+            "category": hit.category,
+            "heard": analyzed.lower[hit.start:hit.end],
+            "span": [hit.start, hit.end],
+            "distance": hit.distance,
+            "similarity": hit.similarity
+        } for hit in sorted(best, key=lambda hit: (hit.start, hit.entry))]
+
+    def calculate_pattern_strength(self, markers: List[str], text: TextInput) -> float:
         """Berechnet die Stärke eines Patterns"""
         if not markers:
             return 0.0
         
         # Einfache Heuristik: Anzahl der Marker relativ zur Textlänge
-        text_length = len(text.split())
+        text_length = self.analyze_text(text).token_count
         marker_count = len(markers)
         
         return min(marker_count / max(text_length, 1), 1.0)
@@ -182,61 +1071,66 @@ class MCPKernel:
         total_strength = sum(analysis["pattern_strength"].values())
         return min(total_strength / len(analysis["pattern_strength"]), 1.0)
 
-    def process_resonance_patterns(self, text: str) -> List[Dict]:
+    def process_resonance_patterns(self, text: TextInput) -> List[Dict]:
         """Verarbeitet Resonanzmuster"""
         patterns = []
-        text_lower = text.lower()
+        analyzed = self.analyze_text(text)
+        scan = analyzed.scan
         
         # Resonanz-Marker suchen
-        resonance_markers = self.marker_field["resonance_markers"]
-        for marker in resonance_markers:
-            if marker in text_lower:
-                pattern = {
-                    "type": "resonance",
-                    "marker": marker,
-                    "strength": self.calculate_resonance_strength(text, marker),
-                    "context": self.extract_resonance_context(text, marker)
-                }
-                patterns.append(pattern)
+        for entry in scan.by_category.get("resonance_markers", []):
+            marker = scan.entries[entry][1]
+            pattern = {
+                "type": "resonance",
+                "marker": marker,
+                "strength": self.calculate_resonance_strength(analyzed, marker, entry),
+                "context": self.extract_resonance_context(analyzed, marker)
+            }
+            patterns.append(pattern)
         
         # Emotionale Resonanz analysieren
-        emotional_pattern = self.analyze_emotional_resonance(text)
+        emotional_pattern = self.analyze_emotional_resonance(analyzed)
         if emotional_pattern:
             patterns.append(emotional_pattern)
         
         return patterns
 
-    def calculate_resonance_strength(self, text: str, marker: str) -> float:
-        """Berechnet die Resonanz-Stärke"""
+    def calculate_resonance_strength(self, text: TextInput, marker: str, entry: int = None) -> float:
+        """Berechnet die Resonanz-Stärke (mit entry aus den Treffern des Scans statt durch erneute Suche)"""
         # Einfache Heuristik basierend auf Marker-Position und Häufigkeit
-        text_lower = text.lower()
-        marker_count = text_lower.count(marker)
-        text_length = len(text.split())
+        analyzed = self.analyze_text(text)
+        if entry is not None and analyzed.scan is not None:
+            marker_count = analyzed.scan.count(entry)
+        else:
+            marker_count = analyzed.lower.count(marker)
+        text_length = analyzed.token_count
         
         return min(marker_count / max(text_length, 1) * 2, 1.0)
 
-    def extract_resonance_context(self, text: str, marker: str) -> str:
+    def extract_resonance_context(self, text: TextInput, marker: str) -> str:
         """Extrahiert Resonanz-Kontext"""
         # Suche nach Sätzen mit dem Marker
-        sentences = re.split(r'[.!?]', text)
-        for sentence in sentences:
-            if marker in sentence.lower():
-                return sentence.strip()
+        analyzed = self.analyze_text(text)
+        
+        # Über die Treffer-Position wird nur der betroffene Satz betrachtet
+        offset = analyzed.scan.first_offset(marker) if analyzed.scan is not None else None
+        if offset is not None and not any(separator in marker for separator in SENTENCE_SEPARATORS):
+            span = analyzed.sentence_around(offset)
+            if span is not None:
+                return analyzed.text[span[0]:span[1]].strip()
+        
+        for span in analyzed.sentence_spans:
+            if marker in analyzed.sentence_lower(span):
+                return analyzed.text[span[0]:span[1]].strip()
         return ""
 
-    def analyze_emotional_resonance(self, text: str) -> Optional[Dict]:
+    def analyze_emotional_resonance(self, text: TextInput) -> Optional[Dict]:
         """Analysiert emotionale Resonanz"""
-        emotional_words = {
-            "positive": ["freude", "glück", "liebe", "begeisterung", "zufriedenheit"],
-            "negative": ["traurigkeit", "wut", "angst", "frustration", "enttäuschung"],
-            "neutral": ["ruhig", "ausgeglichen", "neutral", "sachlich"]
-        }
-        
-        text_lower = text.lower()
+        scan = self.scan(text)
         emotions = {}
         
-        for category, words in emotional_words.items():
-            count = sum(1 for word in words if word in text_lower)
+        for category in EMOTIONAL_WORDS:
+            count = len(scan.terms(f"analysis:emotion_{category}"))
             if count > 0:
                 emotions[category] = count
         
@@ -245,13 +1139,13 @@ class MCPKernel:
             return {
                 "type": "emotional_resonance",
                 "dominant_emotion": dominant_emotion[0],
-                "emotion_strength": dominant_emotion[1] / len(emotional_words[dominant_emotion[0]]),
+                "emotion_strength": dominant_emotion[1] / len(EMOTIONAL_WORDS[dominant_emotion[0]]),
                 "all_emotions": emotions
             }
         
         return None
 
-    def understand_context(self, text: str, context: Dict = None) -> Dict:
+    def understand_context(self, text: TextInput, context: Dict = None) -> Dict:
         """Versteht den Kontext der Eingabe"""
         context_analysis = {
             "immediate_context": {},
@@ -259,43 +1153,33 @@ class MCPKernel:
             "systemic_context": {},
             "context_relevance": 0.0
         }
+        analyzed = self.analyze_text(text)
         
         # Unmittelbarer Kontext
-        context_analysis["immediate_context"] = self.extract_immediate_context(text)
+        context_analysis["immediate_context"] = self.extract_immediate_context(analyzed)
         
         # Historischer Kontext (aus Memory)
         if context:
             context_analysis["historical_context"] = self.analyze_historical_context(context)
         
         # Systemischer Kontext
-        context_analysis["systemic_context"] = self.analyze_systemic_context(text)
+        context_analysis["systemic_context"] = self.analyze_systemic_context(analyzed)
         
         # Kontextuelle Relevanz
         context_analysis["context_relevance"] = self.calculate_context_relevance(context_analysis)
         
         return context_analysis
 
-    def extract_immediate_context(self, text: str) -> Dict:
+    def extract_immediate_context(self, text: TextInput) -> Dict:
         """Extrahiert unmittelbaren Kontext"""
-        context_markers = self.marker_field["context_markers"]
+        scan = self.scan(text)
         immediate_context = {
-            "has_context_markers": any(marker in text.lower() for marker in context_markers),
-            "context_indicators": [],
-            "temporal_indicators": [],
+            "has_context_markers": scan.has("context_markers"),
+            "context_indicators": scan.terms("context_markers"),
+            "temporal_indicators": scan.terms("analysis:temporal"),
             "spatial_indicators": []
         }
         
-        # Kontext-Indikatoren finden
-        for marker in context_markers:
-            if marker in text.lower():
-                immediate_context["context_indicators"].append(marker)
-        
-        # Temporale Indikatoren
-        temporal_patterns = ["jetzt", "gerade", "später", "vorher", "heute", "gestern"]
-        for pattern in temporal_patterns:
-            if pattern in text.lower():
-                immediate_context["temporal_indicators"].append(pattern)
-        
         return immediate_context
 
     def analyze_historical_context(self, context: Dict) -> Dict:
@@ -307,74 +1191,50 @@ class MCPKernel:
             "system_state": context.get("system_state", {})
         }
 
-    def analyze_systemic_context(self, text: str) -> Dict:
+    def analyze_systemic_context(self, text: TextInput) -> Dict:
         """Analysiert systemischen Kontext"""
+        text = self.analyze_text(text)
         return {
             "systemic_patterns": self.detect_systemic_patterns(text),
             "interconnected_elements": self.find_interconnected_elements(text),
             "system_dynamics": self.analyze_system_dynamics(text)
         }
 
-    def detect_systemic_patterns(self, text: str) -> List[str]:
+    def detect_systemic_patterns(self, text: TextInput) -> List[str]:
         """Erkennt systemische Patterns"""
-        patterns = []
-        
-        # Systemische Indikatoren
-        systemic_indicators = [
-            "zusammenhang", "verbindung", "interaktion", "wechselwirkung",
-            "system", "ganzheitlich", "vernetzt", "integriert"
-        ]
-        
-        for indicator in systemic_indicators:
-            if indicator in text.lower():
-                patterns.append(indicator)
-        
-        return patterns
+        return self.scan(text).terms("analysis:systemic")
 
-    def find_interconnected_elements(self, text: str) -> List[str]:
+    def find_interconnected_elements(self, text: TextInput) -> List[str]:
         """Findet vernetzte Elemente"""
-        elements = []
-        
-        # Verbindungs-Indikatoren
-        connection_indicators = [
-            "und", "sowie", "auch", "gleichzeitig", "parallel",
-            "zusammen", "gemeinsam", "verbunden"
-        ]
-        
-        for indicator in connection_indicators:
-            if indicator in text.lower():
-                elements.append(indicator)
-        
-        return elements
+        return self.scan(text).terms("analysis:connection")
 
-    def analyze_system_dynamics(self, text: str) -> Dict:
+    def analyze_system_dynamics(self, text: TextInput) -> Dict:
         """Analysiert System-Dynamiken"""
+        text = self.analyze_text(text)
         return {
             "complexity_level": self.calculate_complexity(text),
             "stability_indicators": self.find_stability_indicators(text),
             "change_indicators": self.find_change_indicators(text)
         }
 
-    def calculate_complexity(self, text: str) -> float:
+    def calculate_complexity(self, text: TextInput) -> float:
         """Berechnet Komplexitäts-Level"""
-        words = text.split()
-        unique_words = len(set(words))
-        total_words = len(words)
+        analyzed = self.analyze_text(text)
+        unique_words = analyzed.unique_token_count
+        total_words = analyzed.token_count
         
         if total_words == 0:
             return 0.0
         
         return min(unique_words / total_words, 1.0)
 
-    def find_stability_indicators(self, text: str) -> List[str]:
+    def find_stability_indicators(self, text: TextInput) -> List[str]:
         """Findet Stabilitäts-Indikatoren"""
-        stability_words = ["stabil", "konstant", "gleichbleibend", "beständig", "ruhig"]
-        return [word for word in stability_words if word in text.lower()]
+        return self.scan(text).terms("analysis:stability")
 
-    def find_change_indicators(self, text: str) -> List[str]:
+    def find_change_indicators(self, text: TextInput) -> List[str]:
         """Findet Veränderungs-Indikatoren"""
-        change_words = ["verändert", "entwickelt", "evolution", "wandlung", "transformation"]
-        return [word for word in change_words if word in text.lower()]
+        return self.scan(text).terms("analysis:change")
 
     def calculate_context_relevance(self, context_analysis: Dict) -> float:
         """Berechnet kontextuelle Relevanz"""
@@ -477,18 +1337,178 @@ class MCPKernel:
         else:
             return "Ich verstehe. Lass mich das systemisch verarbeiten."
 
-# Globale MCP-Instanz
-mcp = MCPKernel()
+class MCPStream:
+    """Inkrementelle Analyse: jeder Chunk wird nur einmal durchsucht"""
+    
+    def __init__(self, kernel: MCPKernel, context: Dict = None, on_update=None):
+        self.kernel = kernel
+        self.context = context
+        self.on_update = on_update
+        self.field = kernel.current_field()
+        self.text = StreamingText(self.field)
+        self.result = None
+        self._signature = None
+    
+    def feed(self, chunk: str) -> Optional[Dict]:
+        """Verarbeitet angehängten Text; gibt das Ergebnis zurück, wenn es sich geändert hat"""
+        hits = self.text.append(chunk)
+        self.result = self.kernel.run_pipeline(self.text, self.context)
+        
+        # Änderung = neue Marker oder andere Verhaltensantwort
+        behavioral_response = self.result["behavioral_response"]
+        signature = (behavioral_response["response_type"], tuple(behavioral_response["suggested_actions"]),
+                     behavioral_response["systemic_understanding"])
+        if not hits and signature == self._signature:
+            return None
+        
+        self._signature = signature
+        if self.on_update is not None:
+            self.on_update(self.result)
+        return self.result
+    
+    def update(self, hypothesis: str) -> Optional[Dict]:
+        """Übernimmt eine neue Teil-Hypothese der Spracherkennung"""
+        current = self.text.text
+        if hypothesis.startswith(current):
+            return self.feed(hypothesis[len(current):])
+        
+        # Die Spracherkennung hat den Anfang korrigiert: neu beginnen
+        self.text = StreamingText(self.field)
+        self._signature = None
+        return self.feed(hypothesis)
+    
+    def finish(self) -> Dict:
+        """Liefert das endgültige Ergebnis für den bisherigen Text"""
+        if self.result is None:
+            self.result = self.kernel.run_pipeline(self.text, self.context)
+        return self.result
+
+
+class MCPSessionManager:
+    """Session-gebundene Kernel (Persona + Konversation) mit einem geteilten Marker-Feld"""
+    
+    # Das kompilierte Feld ist unveränderlich und wird nur per Referenz getauscht;
+    # veränderlicher Zustand (Resonanz, Kontext, Cache, Messwerte) gehört der Session
+    
+    def __init__(self, marker_stream=True, semantic_resonance=True, marker_dir=None, cache_size=0):
+        self.marker_stream = marker_stream
+        self.semantic_resonance = semantic_resonance
+        self.cache_size = cache_size
+        self.root = MCPKernel(marker_stream, semantic_resonance, marker_dir=marker_dir, verbose=False)
+        self.sessions: Dict[Tuple[str, str], MCPKernel] = {}
+        self._initialized = False
+        self._lock = threading.Lock()
+    
+    def ensure_initialized(self) -> MCPKernel:
+        """Lädt das geteilte Marker-Feld beim ersten Zugriff"""
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    self.root.init(self.marker_stream, self.semantic_resonance)
+                    self._initialized = True
+        return self.root
+    
+    def session(self, session_id: str = "default", persona: str = "otto") -> MCPKernel:
+        """Gibt den Kernel einer Session zurück und legt ihn bei Bedarf an"""
+        key = (persona, session_id)
+        kernel = self.sessions.get(key)
+        if kernel is not None:
+            return kernel
+        
+        root = self.ensure_initialized()
+        with self._lock:
+            kernel = self.sessions.get(key)
+            if kernel is None:
+                kernel = MCPKernel(self.marker_stream, self.semantic_resonance,
+                                   cache_size=self.cache_size, field_source=root, verbose=False)
+                kernel.behavior_logic = clone_result(root.behavior_logic)
+                kernel.persona = persona
+                kernel.session_id = session_id
+                self.sessions[key] = kernel
+        return kernel
+    
+    def close_session(self, session_id: str = "default", persona: str = "otto"):
+        """Entfernt eine Session samt ihrem Zustand"""
+        with self._lock:
+            self.sessions.pop((persona, session_id), None)
+    
+    def process_input(self, text: str, context: Dict = None, session_id: str = "default",
+                      persona: str = "otto") -> Dict:
+        """Thread-Pool-taugliche Verarbeitung; nach Anlage der Session ohne Locks"""
+        return self.session(session_id, persona).process_input(text, context)
+    
+    def refresh(self) -> bool:
+        """Lädt geänderte Marker-Dateien; alle Sessions sehen danach das neue Feld"""
+        return self.ensure_initialized().refresh()
+
 
-def init(marker_stream=True, semantic_resonance=True):
+# Globale MCP-Instanz (wird erst bei Bedarf erzeugt)
+_default_kernel = None
+_session_manager = None
+_level_classifier = None
+_global_lock = threading.Lock()
+
+def get_kernel() -> MCPKernel:
+    """Gibt die globale Standard-Instanz zurück"""
+    global _default_kernel
+    if _default_kernel is None:
+        with _global_lock:
+            if _default_kernel is None:
+                _default_kernel = MCPKernel()
+    return _default_kernel
+
+def get_session_manager() -> MCPSessionManager:
+    """Gibt den globalen Session-Manager zurück"""
+    global _session_manager
+    if _session_manager is None:
+        with _global_lock:
+            if _session_manager is None:
+                _session_manager = MCPSessionManager()
+    return _session_manager
+
+def get_level_classifier() -> LevelClassifier:
+    """Gibt den geteilten Level-Klassifikator zurück"""
+    global _level_classifier
+    if _level_classifier is None:
+        with _global_lock:
+            if _level_classifier is None:
+                _level_classifier = LevelClassifier()
+    return _level_classifier
+
+def session(session_id: str = "default", persona: str = "otto") -> MCPKernel:
+    """Session-Kernel mit geteiltem Marker-Feld"""
+    return get_session_manager().session(session_id, persona)
+
+def __getattr__(name):
+    # Kompatibilität: mcp_kernel.mcp war früher eine beim Import erzeugte Instanz
+    if name == "mcp":
+        return get_kernel()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def init(marker_stream=True, semantic_resonance=True, cache_size=0):
     """Initialisiert das MCP-System"""
+    mcp = get_kernel()
     mcp.init(marker_stream, semantic_resonance)
+    if cache_size:
+        mcp.enable_cache(cache_size)
     return mcp
 
 def process_input(text: str, context: Dict = None) -> Dict:
     """Verarbeitet Eingabe mit MCP"""
-    return mcp.process_input(text, context)
+    return get_kernel().process_input(text, context)
+
+def process_batch(texts: List[str], contexts: List[Dict] = None, columnar: bool = False):
+    """Verarbeitet viele Eingaben auf einmal mit MCP"""
+    return get_kernel().process_batch(texts, contexts, columnar)
 
 def get_response(analysis_result: Dict) -> str:
     """Generiert Antwort basierend auf MCP-Analyse"""
-    return mcp.get_response(analysis_result) 
\ No newline at end of file
+    return get_kernel().get_response(analysis_result)
+
+def classify_level(text: str, variant: str = "cumulative") -> LevelResult:
+    """Bestimmt das MCP-Level eines Textes (ein Durchlauf über den Text)"""
+    return get_level_classifier().classify(text, variant)
+
+def classify_levels(texts: List[str], variant: str = "cumulative") -> List[LevelResult]:
+    """Bestimmt die MCP-Level vieler Texte"""
+    return get_level_classifier().classify_batch(texts, variant)
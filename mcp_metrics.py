@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+MCP Metrics
+===========
+Latenz-Histogramme pro Pipeline-Stufe des MCP Kernels
+Feste Bucket-Grenzen, Ausgabe als API-Dict oder JSON-Lines
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# Obere Bucket-Grenzen in Millisekunden (letzter Bucket: alles darüber)
+DEFAULT_BUCKETS_MS = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0]
+
+# Geteilter No-op-Kontext, wenn die Instrumentierung deaktiviert ist
+NULL_STAGE = nullcontext()
+
+
+class StageHistogram:
+    """Histogramm mit festen Buckets für eine Stufe"""
+
+    def __init__(self, bounds_ms: List[float]):
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def add(self, duration_ms: float):
+        self.counts[bisect_left(self.bounds_ms, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        if self.min_ms is None or duration_ms < self.min_ms:
+            self.min_ms = duration_ms
+        if self.max_ms is None or duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def quantile(self, q: float) -> float:
+        """Schätzt ein Quantil als obere Grenze des Buckets"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.bounds_ms[index] if index < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "mean_ms": self.sum_ms / self.count if self.count else 0.0,
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "bounds_ms": self.bounds_ms,
+            "counts": list(self.counts)
+        }
+
+
+class _StageTimer:
+    """Kontextmanager, der die Dauer eines Blocks aufzeichnet"""
+
+    __slots__ = ("recorder", "stage", "started")
+
+    def __init__(self, recorder: "LatencyRecorder", stage: str):
+        self.recorder = recorder
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+class LatencyRecorder:
+    """Sammelt Stufen-Latenzen in Histogrammen mit festen Buckets"""
+
+    def __init__(self, bounds_ms: List[float] = None):
+        self.bounds_ms = sorted(bounds_ms or DEFAULT_BUCKETS_MS)
+        self.histograms: Dict[str, StageHistogram] = {}
+        self.started_at = datetime.now().isoformat()
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> _StageTimer:
+        """Misst einen Block: with recorder.stage("analyze_markers"): ..."""
+        return _StageTimer(self, name)
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = StageHistogram(self.bounds_ms)
+            histogram.add(seconds * 1000.0)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Aktueller Stand aller Histogramme"""
+        with self._lock:
+            return {stage: histogram.to_dict() for stage, histogram in self.histograms.items()}
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.started_at = datetime.now().isoformat()
+
+    def dump_jsonl(self, path, reset: bool = False) -> int:
+        """Hängt eine JSON-Zeile pro Stufe an die Datei an"""
+        with self._lock:
+            timestamp = datetime.now().isoformat()
+            lines = [json.dumps({"timestamp": timestamp, "since": self.started_at, "stage": stage,
+                                 **histogram.to_dict()}, ensure_ascii=False)
+                     for stage, histogram in self.histograms.items()]
+            if reset:
+                self.histograms = {}
+                self.started_at = timestamp
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+        return len(lines)
@@ -8,10 +8,17 @@ import os
 import json
 import yaml
 import re
+import heapq
+import threading
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+from marker_index_cache import MarkerIndexCache
+from marker_loading import load_marker_files, PARALLEL_MIN_FILES
+from marker_store import MarkerStore, write_marker_store
+from marker_watcher import MarkerWatcher, DEFAULT_DEBOUNCE
+
 # Konfiguriere Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,7 +26,26 @@ logger = logging.getLogger(__name__)
 class OrdoSemanticLoader:
     """Lädt und verwaltet semantische Marker für Ordo"""
     
-    def __init__(self, base_path: str = None):
+    # Bei Änderungen an den _parse_*-Methoden hochzählen (verwirft den Index-Cache)
+    PARSER_VERSION = 2
+    
+    # Ab so vielen Postings sucht search_markers(top_k=...) mit Score-Schranken
+    SEARCH_PRUNE_MIN_POSTINGS = 2000
+    
+    # Marker-Dateien in Lade-Reihenfolge
+    MARKER_FILES = [
+        "AMBIVALENCE_MARKER.txt",
+        "AMBIVALENCE_TOLERANCE_MARKER_MARKER.backup_20250703_031803",
+        "CARE_SIGNITURE_MARKER_MARKER.txt",
+        "DEVELOPMENT_META_COMMUNICATION_MARKER_MARKER.backup_20250703_030816",
+        "SELF_REFLECTION_MARKER_MARKER.backup_20250703_031518",
+        "RESONACE_MATCHING_DETECTOR.py_MARKER.txt",
+        "META_REFLEX_SEM_MARKER.yaml",
+        "neue_marker_beziehung.txt"
+    ]
+    
+    def __init__(self, base_path: str = None, use_cache: bool = True, cache_dir: str = None,
+                 workers: int = None, chunksize: int = None, parallel_min_files: int = PARALLEL_MIN_FILES):
         if base_path is None:
             # Pfad zu den Marker-Dateien
             self.base_path = Path(__file__).parent.parent.parent / "ALL_SEMANTIC_MARKER_TXT" / "ALL_NEWMARKER01"
@@ -29,6 +55,33 @@ class OrdoSemanticLoader:
         self.markers = {}
         self.semantic_grabbers = {}
         self.loaded_files = []
+        # Marker pro Datei, damit der Watcher einzelne Dateien neu laden kann
+        self.marker_sources = {}
+        self.marker_lock = threading.RLock()
+        self.marker_watcher = None
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.index_cache = None
+        
+        # Paralleles Laden: workers=1 erzwingt serielles Parsen
+        self.workers = workers
+        self.chunksize = chunksize
+        self.parallel_min_files = parallel_min_files
+        self.load_report = None
+        
+        # Invertierter Token-Index für search_markers
+        self._search_markers = []
+        self._search_postings = {}
+        self._search_patterns = []
+        self._search_tokens = []
+        self._search_index_size = -1
+        
+        # Sekundär-Indizes (Typ/Datei/Tag -> Marker-IDs) und laufende Zähler
+        self._ids_by_type = {}
+        self._ids_by_source = {}
+        self._ids_by_tag = {}
+        self._pattern_count = 0
+        self._marker_index_size = -1
         
     def load_all_markers(self) -> Dict[str, Any]:
         """Lädt alle verfügbaren Marker"""
@@ -38,31 +91,58 @@ class OrdoSemanticLoader:
             logger.error(f"Marker-Pfad existiert nicht: {self.base_path}")
             return {}
         
+        if isinstance(self.markers, MarkerStore):
+            # Ein eingebundener Marker-Store ist schreibgeschützt: Dateien ersetzen ihn
+            self.markers = {}
+        
         # Lade verschiedene Marker-Dateien
-        marker_files = [
-            "AMBIVALENCE_MARKER.txt",
-            "AMBIVALENCE_TOLERANCE_MARKER_MARKER.backup_20250703_031803",
-            "CARE_SIGNITURE_MARKER_MARKER.txt",
-            "DEVELOPMENT_META_COMMUNICATION_MARKER_MARKER.backup_20250703_030816",
-            "SELF_REFLECTION_MARKER_MARKER.backup_20250703_031518",
-            "RESONACE_MATCHING_DETECTOR.py_MARKER.txt",
-            "META_REFLEX_SEM_MARKER.yaml",
-            "neue_marker_beziehung.txt"
-        ]
-        
-        for filename in marker_files:
-            file_path = self.base_path / filename
-            if file_path.exists():
-                try:
-                    self._load_marker_file(file_path)
-                    self.loaded_files.append(filename)
-                    logger.info(f"✅ Geladen: {filename}")
-                except Exception as e:
-                    logger.error(f"❌ Fehler beim Laden von {filename}: {e}")
+        marker_files = self.MARKER_FILES
+        
+        if self.use_cache:
+            self.index_cache = MarkerIndexCache(self.base_path, "ordo_semantic_loader",
+                                                self.PARSER_VERSION, self.cache_dir)
+        
+        file_paths = [self.base_path / filename for filename in marker_files
+                      if (self.base_path / filename).exists()]
+        loaded, report = load_marker_files(file_paths, parse_marker_file, self.index_cache,
+                                           self.workers, self.chunksize, self.parallel_min_files)
+        
+        # Zusammenführen in Datei-Reihenfolge (deterministisch, auch bei parallelem Parsen)
+        for file_path, markers in loaded:
+            self.markers.update(markers)
+            self.loaded_files.append(file_path.name)
+            self.marker_sources[file_path.name] = markers
+        self.load_report = report
+        
+        if self.index_cache is not None:
+            self._save_index_cache()
+        self.build_marker_indexes()
+        
+        logger.info(f"📊 {report.summary()}")
+        for error in report.errors:
+            logger.error(f"❌ Fehler beim Laden von {error['file']}: {error['error']}")
+        
+        self.build_search_index()
         
         logger.info(f"Gesamt geladen: {len(self.markers)} Marker aus {len(self.loaded_files)} Dateien")
         return self.markers
     
+    def _parse_marker_file(self, file_path: Path) -> Dict[str, Any]:
+        """Parst eine Marker-Datei und gibt nur deren Marker zurück"""
+        markers, self.markers = self.markers, {}
+        try:
+            self._load_marker_file(file_path)
+            return self.markers
+        finally:
+            self.markers = markers
+    
+    def _save_index_cache(self):
+        """Speichert den Index-Cache; Fehler beim Schreiben verhindern das Laden nicht"""
+        try:
+            self.index_cache.save()
+        except OSError as e:
+            logger.warning(f"Index-Cache konnte nicht gespeichert werden: {e}")
+    
     def _load_marker_file(self, file_path: Path):
         """Lädt eine einzelne Marker-Datei"""
         content = file_path.read_text(encoding='utf-8')
@@ -83,18 +163,15 @@ class OrdoSemanticLoader:
                 logger.warning(f"Unbekanntes Format: {file_path}")
     
     def _parse_yaml_marker(self, content: str, marker_id: str):
-        """Parst YAML-Marker"""
-        try:
-            data = yaml.safe_load(content)
-            if isinstance(data, dict) and data is not None:
-                self.markers[marker_id] = {
-                    'id': marker_id,
-                    'type': 'yaml',
-                    'data': data,
-                    'patterns': self._extract_patterns(data)
-                }
-        except Exception as e:
-            logger.error(f"YAML-Parsing-Fehler: {e}")
+        """Parst YAML-Marker (Syntaxfehler landen als Fehler der Datei im Lade-Bericht)"""
+        data = yaml.safe_load(content)
+        if isinstance(data, dict) and data is not None:
+            self.markers[marker_id] = {
+                'id': marker_id,
+                'type': 'yaml',
+                'data': data,
+                'patterns': self._extract_patterns(data)
+            }
     
     def _parse_structured_marker(self, content: str, marker_id: str):
         """Parst strukturierte Marker (marker: format)"""
@@ -253,27 +330,212 @@ class OrdoSemanticLoader:
     
     def get_markers_by_type(self, marker_type: str) -> List[Dict[str, Any]]:
         """Gibt alle Marker eines bestimmten Typs zurück"""
-        return [marker for marker in self.markers.values() if marker['type'] == marker_type]
-    
-    def search_markers(self, query: str) -> List[Dict[str, Any]]:
-        """Sucht Marker basierend auf Text-Ähnlichkeit"""
-        query_lower = query.lower()
-        results = []
-        
-        for marker in self.markers.values():
-            # Suche in Patterns
-            for pattern in marker['patterns']:
-                if query_lower in pattern.lower():
-                    results.append({
-                        'marker': marker,
-                        'match': pattern,
-                        'score': self._calculate_similarity(query_lower, pattern.lower())
-                    })
-                    break
-        
-        # Sortiere nach Score
-        results.sort(key=lambda x: x['score'], reverse=True)
-        return results
+        return self._markers_for(lambda: self._ids_by_type.get(marker_type, ()))
+    
+    def get_markers_by_source(self, filename: str) -> List[Dict[str, Any]]:
+        """Gibt alle Marker aus einer Marker-Datei zurück"""
+        return self._markers_for(lambda: self._ids_by_source.get(filename, ()))
+    
+    def get_markers_by_tag(self, tag: str) -> List[Dict[str, Any]]:
+        """Gibt alle Marker mit einem Tag zurück (Feld 'tags' der Marker-Daten)"""
+        return self._markers_for(lambda: self._ids_by_tag.get(tag, ()))
+    
+    def _markers_for(self, marker_ids) -> List[Dict[str, Any]]:
+        with self.marker_lock:
+            self._ensure_marker_indexes()
+            return [self.markers[marker_id] for marker_id in marker_ids()]
+    
+    def build_marker_indexes(self):
+        """Baut Typ-, Datei- und Tag-Index sowie die Zähler für get_statistics"""
+        index = self._compute_marker_indexes(self.markers, self._marker_source_ids(), self.loaded_files)
+        with self.marker_lock:
+            self._set_marker_indexes(index, len(self.markers))
+    
+    def _ensure_marker_indexes(self):
+        # Direkt veränderte markers (ohne load_all_markers) werden beim nächsten Zugriff nachindiziert
+        if self._marker_index_size != len(self.markers):
+            self.build_marker_indexes()
+    
+    def _marker_source_ids(self) -> Dict[str, Any]:
+        if isinstance(self.markers, MarkerStore):
+            return self.markers.info.get('sources', {})
+        return self.marker_sources
+    
+    def _set_marker_indexes(self, index: Tuple, size: int):
+        self._ids_by_type, self._ids_by_source, self._ids_by_tag, self._pattern_count = index
+        self._marker_index_size = size
+    
+    def _compute_marker_indexes(self, markers: Dict[str, Any], sources: Dict[str, Any],
+                                filenames: List[str]) -> Tuple:
+        # Bei doppelten IDs gehört der Marker der zuletzt geladenen Datei (wie markers.update)
+        owners = {}
+        for filename in filenames:
+            for marker_id in sources.get(filename, ()):
+                owners[marker_id] = filename
+        
+        by_type: Dict[str, List[str]] = {}
+        by_source: Dict[str, List[str]] = {}
+        by_tag: Dict[str, List[str]] = {}
+        pattern_count = 0
+        for marker_id, marker in markers.items():
+            by_type.setdefault(marker['type'], []).append(marker_id)
+            if marker_id in owners:
+                by_source.setdefault(owners[marker_id], []).append(marker_id)
+            for tag in self._marker_tags(marker):
+                by_tag.setdefault(tag, []).append(marker_id)
+            pattern_count += len(marker['patterns'])
+        
+        return by_type, by_source, by_tag, pattern_count
+    
+    def _marker_tags(self, marker: Dict[str, Any]) -> List[str]:
+        data = marker.get('data')
+        tags = data.get('tags') if isinstance(data, dict) else None
+        if isinstance(tags, str):
+            tags = [tags]
+        if not isinstance(tags, list):
+            return []
+        # Reihenfolge behalten, doppelte Tags nur einmal indizieren
+        return list(dict.fromkeys(str(tag) for tag in tags if tag is not None))
+    
+    def build_search_index(self):
+        """Baut den invertierten Index: Token -> Pattern-Größe -> (Marker, Pattern)-Postings"""
+        index = self._compute_search_index(self.markers)
+        with self.marker_lock:
+            self._set_search_index(index, len(self.markers))
+    
+    def _set_search_index(self, index: Tuple, size: int):
+        self._search_markers, self._search_postings, self._search_patterns, self._search_tokens = index
+        self._search_index_size = size
+    
+    def _compute_search_index(self, markers: Dict[str, Any]) -> Tuple:
+        markers = list(markers.values())
+        postings: Dict[str, Dict[int, List[Tuple[int, int]]]] = {}
+        patterns_lower = []
+        token_sets = []
+        
+        for marker_pos, marker in enumerate(markers):
+            marker_patterns = []
+            marker_tokens = []
+            for pattern_pos, pattern in enumerate(marker['patterns']):
+                pattern_lower = pattern.lower() if isinstance(pattern, str) else ''
+                tokens = frozenset(pattern_lower.split())
+                marker_patterns.append(pattern_lower)
+                marker_tokens.append(tokens)
+                for token in tokens:
+                    postings.setdefault(token, {}).setdefault(len(tokens), []).append((marker_pos, pattern_pos))
+            patterns_lower.append(marker_patterns)
+            token_sets.append(marker_tokens)
+        
+        return markers, postings, patterns_lower, token_sets
+    
+    def search_markers(self, query: str, top_k: int = None) -> List[Dict[str, Any]]:
+        """Sucht Marker basierend auf Text-Ähnlichkeit
+        
+        Treffer sind Patterns, die die Anfrage enthalten und mindestens ein Wort
+        mit ihr teilen; pro Marker zählt das erste solche Pattern. Score ist die
+        Jaccard-Ähnlichkeit der Wortmengen. top_k begrenzt auf die besten Treffer.
+        """
+        # Index-Teile und Marker aus demselben Stand (der Watcher tauscht sie aus)
+        with self.marker_lock:
+            if self._search_index_size != len(self.markers):
+                self.build_search_index()
+            
+            query_lower = query.lower()
+            query_words = query_lower.split()
+            query_tokens = frozenset(query_words)
+            if not query_tokens:
+                return []
+            postings = self._search_postings
+            
+            # Wörter, die innerhalb der Anfrage von Leerraum umschlossen sind, müssen
+            # als ganze Tokens im Pattern vorkommen: dann genügt die kürzeste Posting-Liste
+            required = query_words[1:-1]
+            if query_lower[0].isspace():
+                required.append(query_words[0])
+            if query_lower[-1].isspace():
+                required.append(query_words[-1])
+            if required:
+                by_size = [min((postings.get(token, {}) for token in required),
+                               key=lambda sizes: sum(map(len, sizes.values())))]
+            else:
+                by_size = [postings.get(token, {}) for token in query_tokens]
+            
+            # Größen-Schranken lohnen sich erst bei langen Posting-Listen (häufige Wörter)
+            posting_count = sum(len(postings) for sizes in by_size for postings in sizes.values())
+            if top_k is not None and posting_count > self.SEARCH_PRUNE_MIN_POSTINGS:
+                scored = self._score_top_k(query_lower, query_tokens, by_size, top_k)
+            else:
+                scored = self._score_all(query_lower, query_tokens, by_size)
+                if top_k is not None:
+                    scored = heapq.nlargest(top_k, scored)
+            
+            # Nach Score, bei Gleichstand in Lade-Reihenfolge
+            scored.sort(reverse=True)
+            return [{
+                'marker': self._search_markers[-neg_marker_pos],
+                'match': self._search_markers[-neg_marker_pos]['patterns'][pattern_pos],
+                'score': score
+            } for score, neg_marker_pos, pattern_pos in scored]
+    
+    def _jaccard_entry(self, query_tokens: frozenset, marker_pos: int, pattern_pos: int) -> Tuple[float, int, int]:
+        pattern_tokens = self._search_tokens[marker_pos][pattern_pos]
+        overlap = len(query_tokens & pattern_tokens)
+        return overlap / (len(query_tokens) + len(pattern_tokens) - overlap), -marker_pos, pattern_pos
+    
+    def _score_all(self, query_lower: str, query_tokens: frozenset, by_size: List[Dict]) -> List[Tuple[float, int, int]]:
+        """Alle Treffer: pro Marker das erste passende Pattern aus den Postings"""
+        patterns_lower = self._search_patterns
+        best: Dict[int, int] = {}
+        for sizes in by_size:
+            for postings in sizes.values():
+                for marker_pos, pattern_pos in postings:
+                    current = best.get(marker_pos)
+                    if current is not None and current <= pattern_pos:
+                        continue
+                    if query_lower in patterns_lower[marker_pos][pattern_pos]:
+                        best[marker_pos] = pattern_pos
+        return [self._jaccard_entry(query_tokens, marker_pos, pattern_pos)
+                for marker_pos, pattern_pos in best.items()]
+    
+    def _score_top_k(self, query_lower: str, query_tokens: frozenset, by_size: List[Dict],
+                     top_k: int) -> List[Tuple[float, int, int]]:
+        """Beste top_k Treffer mit begrenztem Heap; Pattern-Größen nach oberer Score-Schranke"""
+        # Jaccard <= min(n, s) / max(n, s) für ein Pattern mit s Wörtern
+        query_size = len(query_tokens)
+        bounds = {size: min(query_size, size) / max(query_size, size)
+                  for sizes in by_size for size in sizes}
+        
+        patterns_lower = self._search_patterns
+        heap = []
+        seen = set()
+        for size in sorted(bounds, key=lambda size: (-bounds[size], size)):
+            # Abbrechen, sobald kein Pattern dieser Größe den k-ten Treffer schlagen kann
+            if len(heap) >= top_k and heap[0][0] > bounds[size]:
+                break
+            for sizes in by_size:
+                for marker_pos, pattern_pos in sizes.get(size, ()):
+                    # Postings stammen aus geteilten Tokens, es bleibt der Teilstring-Test
+                    if marker_pos in seen or query_lower not in patterns_lower[marker_pos][pattern_pos]:
+                        continue
+                    seen.add(marker_pos)
+                    
+                    # Ein früheres Pattern desselben Markers hat Vorrang
+                    for earlier in range(pattern_pos):
+                        if self._pattern_matches(query_lower, query_tokens, marker_pos, earlier):
+                            pattern_pos = earlier
+                            break
+                    
+                    entry = self._jaccard_entry(query_tokens, marker_pos, pattern_pos)
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+        return heap
+    
+    def _pattern_matches(self, query_lower: str, query_tokens: frozenset, marker_pos: int, pattern_pos: int) -> bool:
+        """Pattern enthält die Anfrage und teilt mindestens ein Wort mit ihr"""
+        return query_lower in self._search_patterns[marker_pos][pattern_pos] and \
+            not query_tokens.isdisjoint(self._search_tokens[marker_pos][pattern_pos])
     
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """Berechnet einfache Ähnlichkeit zwischen zwei Texten"""
@@ -288,21 +550,98 @@ class OrdoSemanticLoader:
         
         return len(intersection) / len(union) if union else 0.0
     
-    def get_statistics(self) -> Dict[str, Any]:
-        """Gibt Statistiken über geladene Marker zurück"""
-        stats = {
-            'total_markers': len(self.markers),
-            'loaded_files': len(self.loaded_files),
-            'marker_types': {},
-            'total_patterns': 0
-        }
+    def apply_marker_changes(self, paths: List[Path]) -> Dict[str, List]:
+        """Parst nur geänderte Marker-Dateien neu und tauscht Marker und Such-Index atomar aus
+        
+        Gelöschte Dateien werden entfernt; Leser sehen entweder den alten oder den neuen Stand.
+        """
+        changes = {'updated': [], 'removed': [], 'errors': []}
+        if isinstance(self.markers, MarkerStore):
+            logger.warning("Marker aus Marker-Store sind schreibgeschützt - Änderungen ignoriert")
+            return changes
+        
+        sources = dict(self.marker_sources)
+        for path in paths:
+            path = Path(path)
+            if path.name not in self.MARKER_FILES:
+                continue
+            if not path.exists():
+                if sources.pop(path.name, None) is not None:
+                    changes['removed'].append(path.name)
+                continue
+            try:
+                if self.index_cache is not None:
+                    markers = self.index_cache.load_file(path, parse_marker_file)
+                else:
+                    markers = parse_marker_file(path)
+            except Exception as e:
+                # z.B. halb geschriebene Datei: alter Stand bleibt bis zur nächsten Änderung
+                changes['errors'].append({'file': path.name, 'error': f"{type(e).__name__}: {e}"})
+                logger.error(f"❌ Fehler beim Neuladen von {path.name}: {e}")
+                continue
+            sources[path.name] = markers
+            changes['updated'].append(path.name)
+        
+        if not changes['updated'] and not changes['removed']:
+            return changes
         
-        for marker in self.markers.values():
-            marker_type = marker['type']
-            stats['marker_types'][marker_type] = stats['marker_types'].get(marker_type, 0) + 1
-            stats['total_patterns'] += len(marker['patterns'])
+        # Gleiche Reihenfolge wie load_all_markers
+        loaded_files = [filename for filename in self.MARKER_FILES if filename in sources]
+        markers = {}
+        for filename in loaded_files:
+            markers.update(sources[filename])
+        index = self._compute_search_index(markers)
+        marker_indexes = self._compute_marker_indexes(markers, sources, loaded_files)
+        
+        with self.marker_lock:
+            self.markers = markers
+            self.marker_sources = sources
+            self.loaded_files = loaded_files
+            self._set_search_index(index, len(markers))
+            self._set_marker_indexes(marker_indexes, len(markers))
+        
+        if self.index_cache is not None:
+            try:
+                self.index_cache.save(prune=False)
+            except OSError as e:
+                logger.warning(f"Index-Cache konnte nicht gespeichert werden: {e}")
+        
+        logger.info(f"🔄 Marker aktualisiert: {', '.join(changes['updated'] + changes['removed'])} "
+                    f"({len(markers)} Marker)")
+        return changes
+    
+    def watch_markers(self, debounce: float = DEFAULT_DEBOUNCE) -> Optional[MarkerWatcher]:
+        """Beobachtet base_path und lädt geänderte Marker-Dateien live nach (benötigt watchdog)"""
+        if self.marker_watcher is not None:
+            return self.marker_watcher
+        if isinstance(self.markers, MarkerStore):
+            logger.warning("Marker aus Marker-Store werden nicht beobachtet")
+            return None
         
-        return stats
+        # Die Ordo-Dateien haben teils keine .txt/.yaml-Endung: Filter über MARKER_FILES
+        watcher = MarkerWatcher(self.base_path, self.apply_marker_changes, None, debounce)
+        if not watcher.start():
+            return None
+        self.marker_watcher = watcher
+        logger.info(f"Beobachte Marker-Verzeichnis: {self.base_path}")
+        return watcher
+    
+    def stop_watching(self):
+        """Beendet die Beobachtung des Marker-Verzeichnisses"""
+        if self.marker_watcher is not None:
+            self.marker_watcher.stop()
+            self.marker_watcher = None
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Gibt Statistiken über geladene Marker zurück (aus den Indizes, ohne alle Marker zu durchlaufen)"""
+        with self.marker_lock:
+            self._ensure_marker_indexes()
+            return {
+                'total_markers': len(self.markers),
+                'loaded_files': len(self.loaded_files),
+                'marker_types': {marker_type: len(ids) for marker_type, ids in self._ids_by_type.items()},
+                'total_patterns': self._pattern_count
+            }
     
     def export_markers(self, output_path: str):
         """Exportiert alle Marker in JSON-Format"""
@@ -310,6 +649,38 @@ class OrdoSemanticLoader:
             json.dump(self.markers, f, indent=2, ensure_ascii=False)
         
         logger.info(f"Marker exportiert nach: {output_path}")
+    
+    def export_marker_store(self, output_path: str) -> int:
+        """Exportiert alle Marker als mmap-fähige Binärdatei (siehe marker_store)"""
+        size = write_marker_store(self.markers, output_path, {
+            'loaded_files': self.loaded_files,
+            'parser_version': self.PARSER_VERSION,
+            'sources': {filename: list(ids) for filename, ids in self._marker_source_ids().items()}
+        })
+        logger.info(f"Marker-Store geschrieben: {output_path} ({size} Bytes, {len(self.markers)} Marker)")
+        return size
+    
+    def load_marker_store(self, store_path: str, verify: bool = True) -> MarkerStore:
+        """Bindet einen Marker-Store schreibgeschützt ein statt die Dateien zu parsen
+        
+        self.markers wird zur MarkerStore-Sicht (Marker werden erst beim Zugriff
+        dekodiert); der Such-Index entsteht bei der ersten Suche.
+        """
+        store = MarkerStore(store_path, verify)
+        if store.info.get('parser_version') != self.PARSER_VERSION:
+            logger.warning(f"Marker-Store stammt von Parser-Version {store.info.get('parser_version')}, "
+                           f"aktuell {self.PARSER_VERSION}")
+        self.markers = store
+        self.loaded_files = list(store.info.get('loaded_files', []))
+        # Indizes beim nächsten Zugriff neu aufbauen (auch bei gleicher Marker-Anzahl)
+        self._search_index_size = -1
+        self._marker_index_size = -1
+        logger.info(f"Marker-Store eingebunden: {store_path} ({len(store)} Marker)")
+        return store
+
+def parse_marker_file(file_path: Path) -> Dict[str, Any]:
+    """Parst eine Marker-Datei (Modulebene, damit sie im Prozess-Pool laufen kann)"""
+    return OrdoSemanticLoader(use_cache=False)._parse_marker_file(file_path)
 
 # Test-Funktion
 if __name__ == "__main__":
@@ -328,7 +699,7 @@ if __name__ == "__main__":
     
     # Test-Suche
     test_query = "ich bin hin und her gerissen"
-    results = loader.search_markers(test_query)
+    results = loader.search_markers(test_query, top_k=3)
     print(f"\n🔍 Suche nach: '{test_query}'")
-    for result in results[:3]:  # Top 3
+    for result in results:
         print(f"   Match: {result['match'][:50]}... (Score: {result['score']:.3f})") 
\ No newline at end of file
@@ -15,6 +15,7 @@ from datetime import datetime
 import yaml
 from dotenv import load_dotenv
 import random
+from mcp_kernel import classify_level
 
 # Lade Umgebungsvariablen
 load_dotenv()
@@ -204,18 +205,7 @@ class AdaptiveLearningSystem:
     
     def determine_mcp_level(self, text):
         """Bestimmt MCP-Level basierend auf Input-Komplexität"""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['lernen', 'entwickeln', 'wachsen', 'systemisch', 'muster']):
-            return 5
-        elif any(word in text_lower for word in ['verstehen', 'analysieren', 'zusammenhang']):
-            return 4
-        elif any(word in text_lower for word in ['aufgabe', 'strukturieren', 'organisieren']):
-            return 3
-        elif any(word in text_lower for word in ['hallo', 'test', 'funktioniert']):
-            return 1
-        else:
-            return 2
+        return classify_level(text, "adaptive_learning").level
     
     def identify_conversation_type(self, text):
         """Identifiziert Konversationstyp"""
@@ -26,6 +26,7 @@ from dotenv import load_dotenv
 
 # Anthropic/Claude Import
 import anthropic
+from mcp_kernel import classify_level
 
 class OttoClaudeElevenLabs:
     def __init__(self):
@@ -275,35 +276,7 @@ class OttoClaudeElevenLabs:
 
     def determine_mcp_level(self, text: str) -> int:
         """Bestimmt das MCP-Level basierend auf Text"""
-        # Grundlegende Level-Bestimmung
-        level = 0
-        
-        # Level 1: Emotionale Verbindungen
-        emotional_words = ["fühle", "empfinde", "liebe", "hasse", "freue", "traurig", "glücklich"]
-        if any(word in text.lower() for word in emotional_words):
-            level = 1
-        
-        # Level 2: Verhaltensmuster
-        behavioral_words = ["mache", "tue", "verhalte", "reagiere", "handele", "entscheide"]
-        if any(word in text.lower() for word in behavioral_words):
-            level = 2
-        
-        # Level 3: Systemische Einsichten
-        systemic_words = ["system", "zusammenhang", "muster", "struktur", "ganzheitlich"]
-        if any(word in text.lower() for word in systemic_words):
-            level = 3
-        
-        # Level 4: Meta-Reflexion
-        meta_words = ["denke", "reflektiere", "überlege", "analysiere", "verstehe"]
-        if any(word in text.lower() for word in meta_words):
-            level = 4
-        
-        # Level 5: Emergente Komplexität
-        complex_words = ["emergenz", "komplexität", "evolution", "entwicklung", "wachstum"]
-        if any(word in text.lower() for word in complex_words):
-            level = 5
-        
-        return level
+        return classify_level(text, "cumulative").level
 
     def generate_claude_response(self, text: str, mcp_level: int, context: dict):
         """Generiert Antwort mit Claude API und MCP-Level"""
@@ -23,6 +23,7 @@ import numpy as np
 from collections import defaultdict
 import requests
 from dotenv import load_dotenv
+from mcp_kernel import classify_level
 
 # Anthropic/Claude Import
 import anthropic
@@ -168,37 +169,7 @@ class OttoClaudePriority:
 
     def determine_mcp_level(self, text):
         """Bestimme MCP-Level basierend auf Text-Komplexität"""
-        complexity_score = 0
-        
-        # Wortanzahl
-        words = text.split()
-        complexity_score += len(words) * 0.1
-        
-        # Komplexe Wörter
-        complex_words = ['systemisch', 'emergent', 'meta', 'transzendent', 'reflexion']
-        for word in complex_words:
-            if word in text.lower():
-                complexity_score += 2
-        
-        # Emotionale Intensität
-        emotional_words = ['fühle', 'empfinde', 'verstehe', 'denke', 'glaube']
-        for word in emotional_words:
-            if word in text.lower():
-                complexity_score += 1
-        
-        # Bestimme Level
-        if complexity_score < 1:
-            return 0
-        elif complexity_score < 2:
-            return 1
-        elif complexity_score < 3:
-            return 2
-        elif complexity_score < 4:
-            return 3
-        elif complexity_score < 5:
-            return 4
-        else:
-            return 5
+        return classify_level(text, "complexity_score").level
 
     def analyze_with_claude(self, text, mcp_level):
         """Analysiere mit Claude API"""
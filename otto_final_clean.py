@@ -17,6 +17,7 @@ import queue
 from datetime import datetime
 import yaml
 from dotenv import load_dotenv
+from mcp_kernel import classify_level
 
 # Lade Umgebungsvariablen
 load_dotenv()
@@ -131,20 +132,7 @@ class MCPSystem:
     
     def determine_mcp_level(self, text):
         """Bestimmt MCP-Level basierend auf Input-Komplexität"""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['lernen', 'entwickeln', 'wachsen', 'systemisch']):
-            return 5
-        elif any(word in text_lower for word in ['verstehen', 'analysieren', 'muster']):
-            return 4
-        elif any(word in text_lower for word in ['zusammenhang', 'kontext', 'beziehung']):
-            return 3
-        elif any(word in text_lower for word in ['aufgabe', 'strukturieren', 'organisieren']):
-            return 2
-        elif any(word in text_lower for word in ['hallo', 'test', 'funktioniert']):
-            return 1
-        else:
-            return 0
+        return classify_level(text, "final_clean").level
     
     def analyze_semantics(self, text):
         """Führt semantische Analyse durch"""
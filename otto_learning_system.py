@@ -19,6 +19,8 @@ import re
 from pathlib import Path
 import schedule
 import pickle
+from jam_journal import JamJournal, DEFAULT_SEGMENT_BYTES, DEFAULT_SEGMENT_AGE
+from write_behind import WriteBehindWriter
 
 # Lade Umgebungsvariablen
 load_dotenv()
@@ -27,11 +29,14 @@ load_dotenv()
 TRIGGER_WORDS = ['otto', 'ordo', 'ordu', 'odo', 'orden']
 ELEVENLABS_API_KEY = os.getenv('ELEVENLABS_API_KEY')
 VOICE_ID = os.getenv('ELEVENLABS_VOICE_ID', 'pNInz6obpgDQGcFmaJgB')
+# Ausstehende Schreibvorgänge beim Beenden: none, flush oder fsync
+WRITE_DURABILITY = os.getenv('OTTO_WRITE_DURABILITY', 'flush')
 
 class StrudelKnotenKristall:
     """Strudel-Knoten-Kristall System für Otto"""
     
-    def __init__(self):
+    def __init__(self, writer=None):
+        self.writer = writer
         self.kristalle = {}
         self.knoten = {}
         self.strudel = {}
@@ -64,8 +69,12 @@ class StrudelKnotenKristall:
             'verbindungen': self.verbindungen,
             'last_updated': datetime.now().isoformat()
         }
-        with open('otto_kristalle.yaml', 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+        content = yaml.dump(data, default_flow_style=False, allow_unicode=True)
+        if self.writer is not None:
+            self.writer.replace('otto_kristalle.yaml', content)
+        else:
+            with open('otto_kristalle.yaml', 'w', encoding='utf-8') as f:
+                f.write(content)
     
     def create_kristall(self, name, content, typ='erkenntnis'):
         """Erstellt einen neuen Kristall"""
@@ -168,7 +177,7 @@ class StrudelKnotenKristall:
 class JammelSystem:
     """Jammeldateien System für Otto"""
     
-    def __init__(self):
+    def __init__(self, writer=None):
         self.jammel_dir = Path("otto_jammel")
         self.jammel_dir.mkdir(exist_ok=True)
         self.jammel_files = {
@@ -179,13 +188,19 @@ class JammelSystem:
             'impressions': 'otto_impressions.jam',
             'insights': 'otto_insights.jam'
         }
+        # Append-only Journale (eine JSON-Zeile pro Eintrag), rotiert nach Größe und Alter
+        self.journals = {name: JamJournal(self.jammel_dir / filename, writer,
+                                          DEFAULT_SEGMENT_BYTES, DEFAULT_SEGMENT_AGE)
+                         for name, filename in self.jammel_files.items()}
         self.initialize_jammel_files()
     
     def initialize_jammel_files(self):
-        """Initialisiert Jammeldateien"""
-        for name, filename in self.jammel_files.items():
-            filepath = self.jammel_dir / filename
-            if not filepath.exists():
+        """Initialisiert Jammeldateien (alte JSON-Arrays werden einmalig umgewandelt)"""
+        for name, journal in self.journals.items():
+            if journal.is_legacy():
+                count = journal.migrate()
+                print(f"📒 {journal.path.name}: {count} Einträge ins Journal-Format umgewandelt")
+            if not journal.exists():
                 self.write_jammel_entry(name, f"Initialisiere {name} Jammeldatei", "system")
     
     def write_jammel_entry(self, jammel_type, content, source="otto"):
@@ -193,8 +208,6 @@ class JammelSystem:
         if jammel_type not in self.jammel_files:
             return
         
-        filepath = self.jammel_dir / self.jammel_files[jammel_type]
-        
         entry = {
             'timestamp': datetime.now().isoformat(),
             'source': source,
@@ -202,37 +215,22 @@ class JammelSystem:
             'type': jammel_type
         }
         
-        # Lade existierende Einträge
-        entries = []
-        if filepath.exists():
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    entries = json.load(f)
-            except:
-                entries = []
-        
-        entries.append(entry)
-        
-        # Speichere
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(entries, f, indent=2, ensure_ascii=False)
+        # Nur die neue Zeile anhängen
+        self.journals[jammel_type].append(entry)
     
     def read_jammel_entries(self, jammel_type, limit=10):
         """Liest Einträge aus Jammeldatei"""
         if jammel_type not in self.jammel_files:
             return []
         
-        filepath = self.jammel_dir / self.jammel_files[jammel_type]
-        
-        if not filepath.exists():
+        return self.journals[jammel_type].read_last(limit)  # Letzte Einträge
+    
+    def read_jammel_range(self, jammel_type, start=None, end=None):
+        """Liest Einträge mit start <= timestamp < end aus Jammeldatei"""
+        if jammel_type not in self.jammel_files:
             return []
         
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                entries = json.load(f)
-                return entries[-limit:]  # Letzte Einträge
-        except:
-            return []
+        return self.journals[jammel_type].read_range(start, end)
     
     def write_thought(self, thought):
         """Schreibt Gedanken"""
@@ -261,7 +259,7 @@ class JammelSystem:
 class MindSystem:
     """Mind-System für Otto"""
     
-    def __init__(self):
+    def __init__(self, writer=None):
         self.mind_dir = Path("otto_mind")
         self.mind_dir.mkdir(exist_ok=True)
         self.memory_files = {
@@ -270,13 +268,19 @@ class MindSystem:
             'system': 'otto_memory_system.jam',
             'learning': 'otto_memory_learning.jam'
         }
+        # Append-only Journale (eine JSON-Zeile pro Eintrag), rotiert nach Größe und Alter
+        self.journals = {name: JamJournal(self.mind_dir / filename, writer,
+                                          DEFAULT_SEGMENT_BYTES, DEFAULT_SEGMENT_AGE)
+                         for name, filename in self.memory_files.items()}
         self.initialize_mind_system()
     
     def initialize_mind_system(self):
-        """Initialisiert Mind-System"""
-        for name, filename in self.memory_files.items():
-            filepath = self.mind_dir / filename
-            if not filepath.exists():
+        """Initialisiert Mind-System (alte JSON-Arrays werden einmalig umgewandelt)"""
+        for name, journal in self.journals.items():
+            if journal.is_legacy():
+                count = journal.migrate()
+                print(f"📒 {journal.path.name}: {count} Einträge ins Journal-Format umgewandelt")
+            if not journal.exists():
                 self.write_memory_entry(name, f"Initialisiere {name} Memory", "system", 0)
     
     def write_memory_entry(self, memory_type, content, source="otto", mcp_level=0):
@@ -284,8 +288,6 @@ class MindSystem:
         if memory_type not in self.memory_files:
             return
         
-        filepath = self.mind_dir / self.memory_files[memory_type]
-        
         entry = {
             'timestamp': datetime.now().isoformat(),
             'source': source,
@@ -294,37 +296,22 @@ class MindSystem:
             'type': memory_type
         }
         
-        # Lade existierende Einträge
-        entries = []
-        if filepath.exists():
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    entries = json.load(f)
-            except:
-                entries = []
-        
-        entries.append(entry)
-        
-        # Speichere
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(entries, f, indent=2, ensure_ascii=False)
+        # Nur die neue Zeile anhängen
+        self.journals[memory_type].append(entry)
     
     def read_memory_entries(self, memory_type, limit=10):
         """Liest Memory-Einträge"""
         if memory_type not in self.memory_files:
             return []
         
-        filepath = self.mind_dir / self.memory_files[memory_type]
-        
-        if not filepath.exists():
+        return self.journals[memory_type].read_last(limit)  # Letzte Einträge
+    
+    def read_memory_range(self, memory_type, start=None, end=None):
+        """Liest Memory-Einträge mit start <= timestamp < end"""
+        if memory_type not in self.memory_files:
             return []
         
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                entries = json.load(f)
-                return entries[-limit:]  # Letzte Einträge
-        except:
-            return []
+        return self.journals[memory_type].read_range(start, end)
 
 class OttoLearningSystem:
     """Otto Learning System"""
@@ -332,9 +319,11 @@ class OttoLearningSystem:
     def __init__(self):
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
-        self.jammel_system = JammelSystem()
-        self.mind_system = MindSystem()
-        self.kristall_system = StrudelKnotenKristall()
+        # Schreibvorgänge laufen im Hintergrund, nicht zwischen Erkennung und Antwort
+        self.writer = WriteBehindWriter(durability=WRITE_DURABILITY).start()
+        self.jammel_system = JammelSystem(self.writer)
+        self.mind_system = MindSystem(self.writer)
+        self.kristall_system = StrudelKnotenKristall(self.writer)
         self.conversation_active = False
         self.conversation_timeout = 30
         self.last_conversation_time = 0
@@ -566,6 +555,7 @@ class OttoLearningSystem:
             except KeyboardInterrupt:
                 print("\n👋 Otto Learning System wird beendet...")
                 self.save_learning_data()
+                self.writer.close()
                 break
             except Exception as e:
                 print(f"❌ Fehler: {e}")
@@ -580,8 +570,8 @@ class OttoLearningSystem:
                 'total_interactions': len(self.learning_data)
             }
             
-            with open('otto_learning_data.yaml', 'w', encoding='utf-8') as f:
-                yaml.dump(learning_data, f, default_flow_style=False, allow_unicode=True)
+            self.writer.replace('otto_learning_data.yaml',
+                                yaml.dump(learning_data, default_flow_style=False, allow_unicode=True))
             
             print("💾 Learning-Daten gespeichert")
         except Exception as e:
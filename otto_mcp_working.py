@@ -25,7 +25,7 @@ import numpy as np
 from collections import defaultdict
 
 # Import MCP Kernel
-from mcp_kernel import init as mcp_init, process_input as mcp_process, get_response as mcp_response
+from mcp_kernel import init as mcp_init, process_input as mcp_process, get_response as mcp_response, classify_level
 
 # OpenAI Import (Version 0.28)
 import openai
@@ -272,35 +272,7 @@ class OttoMCPWorking:
 
     def determine_mcp_level(self, text: str, mcp_analysis: dict) -> int:
         """Bestimmt das MCP-Level basierend auf Text und Analyse"""
-        # Grundlegende Level-Bestimmung
-        level = 0
-        
-        # Level 1: Emotionale Verbindungen
-        emotional_words = ["fühle", "empfinde", "liebe", "hasse", "freue", "traurig", "glücklich"]
-        if any(word in text.lower() for word in emotional_words):
-            level = 1
-        
-        # Level 2: Verhaltensmuster
-        behavioral_words = ["mache", "tue", "verhalte", "reagiere", "handele", "entscheide"]
-        if any(word in text.lower() for word in behavioral_words):
-            level = 2
-        
-        # Level 3: Systemische Einsichten
-        systemic_words = ["system", "zusammenhang", "muster", "struktur", "ganzheitlich"]
-        if any(word in text.lower() for word in systemic_words):
-            level = 3
-        
-        # Level 4: Meta-Reflexion
-        meta_words = ["denke", "reflektiere", "überlege", "analysiere", "verstehe"]
-        if any(word in text.lower() for word in meta_words):
-            level = 4
-        
-        # Level 5: Emergente Komplexität
-        complex_words = ["emergenz", "komplexität", "evolution", "entwicklung", "wachstum"]
-        if any(word in text.lower() for word in complex_words):
-            level = 5
-        
-        return level
+        return classify_level(text, "cumulative").level
 
     def generate_intelligent_response(self, text: str, mcp_analysis: dict, mcp_level: int):
         """Generiert intelligente Antwort basierend auf MCP-Analyse und Level"""
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Otto Memory Store
+=================
+SQLite-Speicher (WAL) für Ottos Erinnerungen mit Volltextsuche
+Ben-Erinnerungen, Selbst-Erinnerungen, Jammel-Einträge und Interaktionen
+liegen in je einer Tabelle mit Indizes auf Zeit, Kategorie, MCP-Level und
+Quelle sowie einem FTS5-Index über den Inhalt. Abfragen wie "Level-3-
+Erinnerungen über Kanban aus der letzten Woche" lesen nur passende Zeilen.
+
+Bestehende Dateien übernehmen:
+
+    python otto_memory_store.py import [Dateien oder Verzeichnisse ...]
+    python otto_memory_store.py search memories kanban --level 3 --days 7
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import yaml
+
+from jam_journal import JamJournal
+
+DEFAULT_DB = "otto_memory.db"
+
+# Schema-Version (PRAGMA user_version); bei Änderungen hochzählen
+SCHEMA_VERSION = 2
+
+# memories: Erinnerungen an Ben und Mind-Einträge, self_memories: Ottos Selbst-Narrativ,
+# jammel_entries: Jammeldateien, interactions: Eingaben mit Antworten
+TABLES = ("memories", "self_memories", "jammel_entries", "interactions")
+
+COLUMNS = ("timestamp", "category", "mcp_level", "source", "content", "data")
+
+# Suchbare Spalten mit Index (jeweils zusammen mit dem Zeitstempel)
+INDEXED = ("category", "mcp_level", "source")
+
+# Standard-Fundorte der Agenten (Otto_*_System unter ~/Documents)
+AGENT_ROOTS = Path.home() / "Documents"
+
+
+def _timestamp(value: Any) -> Optional[str]:
+    """Einheitlicher, sortierbarer ISO-Zeitstempel (aus ISO, "YYYY-MM-DD HH:MM:SS" oder Datum)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).strip().replace(" ", "T", 1)
+
+
+def _fts_query(text: str) -> str:
+    """Suchtext als FTS5-Ausdruck: alle Wörter müssen vorkommen, "wort*" sucht nach Präfix"""
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+class OttoMemoryStore:
+    """SQLite-Datenbank mit den Tabellen aus TABLES (thread-sicher über eine Verbindung)
+
+    Ohne FTS5 in der SQLite-Bibliothek fällt die Textsuche auf LIKE zurück.
+    Doppelte Einträge (gleicher Zeitstempel, Kategorie und Inhalt) werden beim
+    Einfügen übersprungen; fehlende Kategorien werden als '' gespeichert, damit
+    auch sie als gleich gelten. Zusammen mit den festen Ersatz-Zeitstempeln des
+    Importers lässt sich ein Import daher gefahrlos wiederholen.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB):
+        self.path = Path(path)
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.fts = self._fts_available()
+        if not self.fts:
+            print("⚠️  SQLite ohne FTS5 - Textsuche nutzt LIKE")
+        self._create_schema()
+
+    def _fts_available(self) -> bool:
+        try:
+            self.connection.execute("CREATE VIRTUAL TABLE temp.fts_probe USING fts5(content)")
+            self.connection.execute("DROP TABLE temp.fts_probe")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def _create_schema(self):
+        with self.lock, self.connection:
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            for table in TABLES:
+                self.connection.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        id INTEGER PRIMARY KEY,
+                        timestamp TEXT NOT NULL,
+                        category TEXT NOT NULL DEFAULT '',
+                        mcp_level NUMERIC,
+                        source TEXT,
+                        content TEXT NOT NULL,
+                        data TEXT
+                    )""")
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_timestamp ON {table} (timestamp)")
+                for column in INDEXED:
+                    self.connection.execute(
+                        f"CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} ({column}, timestamp)")
+                self.connection.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_unique ON {table} (timestamp, category, content)")
+                if self.fts:
+                    self._create_fts(table)
+                if 0 < version < 2:
+                    self._upgrade_categories(table)
+            self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _upgrade_categories(self, table: str):
+        """Schema 1 speicherte fehlende Kategorien als NULL (nie gleich): vereinheitlichen und Duplikate löschen"""
+        self.connection.execute(f"""
+            DELETE FROM {table} WHERE category IS NULL AND EXISTS (
+                SELECT 1 FROM {table} AS other
+                WHERE other.timestamp = {table}.timestamp AND other.content = {table}.content
+                  AND COALESCE(other.category, '') = '' AND other.id < {table}.id
+            )""")
+        self.connection.execute(f"""
+            DELETE FROM {table} WHERE category IS NULL AND EXISTS (
+                SELECT 1 FROM {table} AS other
+                WHERE other.timestamp = {table}.timestamp AND other.content = {table}.content
+                  AND other.category = ''
+            )""")
+        self.connection.execute(f"UPDATE {table} SET category = '' WHERE category IS NULL")
+
+    def _create_fts(self, table: str):
+        # Externer Inhalt: der FTS-Index speichert den Text nicht doppelt, Trigger halten ihn aktuell
+        self.connection.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+                content, content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+            )""")
+        self.connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {table}_fts (rowid, content) VALUES (new.id, new.content);
+            END""")
+        self.connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {table}_fts ({table}_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            END""")
+        self.connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF content ON {table} BEGIN
+                INSERT INTO {table}_fts ({table}_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                INSERT INTO {table}_fts (rowid, content) VALUES (new.id, new.content);
+            END""")
+
+    @staticmethod
+    def _check_table(table: str):
+        if table not in TABLES:
+            raise ValueError(f"Unbekannte Tabelle: {table} (erwartet: {', '.join(TABLES)})")
+
+    @staticmethod
+    def _row(content: str, timestamp=None, category: str = None, mcp_level=None, source: str = None,
+             **data) -> tuple:
+        return (_timestamp(timestamp) or datetime.now().isoformat(), category or "", mcp_level, source, str(content),
+                json.dumps(data, ensure_ascii=False, default=str) if data else None)
+
+    def add(self, table: str, content: str, timestamp=None, category: str = None, mcp_level=None,
+            source: str = None, **data) -> bool:
+        """Speichert einen Eintrag; weitere Felder landen als JSON in data. False bei Duplikat"""
+        return self.add_many(table, [dict(data, content=content, timestamp=timestamp, category=category,
+                                          mcp_level=mcp_level, source=source)]) == 1
+
+    def add_many(self, table: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Speichert mehrere Einträge in einer Transaktion; gibt die Anzahl neuer Einträge zurück"""
+        self._check_table(table)
+        rows = [self._row(**record) for record in records]
+        with self.lock, self.connection:
+            cursor = self.connection.executemany(
+                f"INSERT OR IGNORE INTO {table} ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)", rows)
+            return max(cursor.rowcount, 0)
+
+    def search(self, table: str, text: str = None, category: str = None, mcp_level=None, source: str = None,
+               since=None, until=None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Einträge nach Text, Kategorie, MCP-Level, Quelle und Zeitraum (since <= timestamp < until)
+
+        Ergebnis: neueste zuerst, als Dicts mit den Spalten und den Zusatzfeldern aus data.
+        """
+        self._check_table(table)
+        conditions = []
+        parameters: List[Any] = []
+        source_table = table
+        if text:
+            if self.fts:
+                source_table = f"{table} JOIN {table}_fts ON {table}_fts.rowid = {table}.id"
+                conditions.append(f"{table}_fts MATCH ?")
+                parameters.append(_fts_query(text))
+            else:
+                for word in text.split():
+                    conditions.append(f"{table}.content LIKE ?")
+                    parameters.append(f"%{word.rstrip('*')}%")
+        for column, value in (("category", category), ("mcp_level", mcp_level), ("source", source)):
+            if value is not None:
+                conditions.append(f"{table}.{column} = ?")
+                parameters.append(value)
+        if since is not None:
+            conditions.append(f"{table}.timestamp >= ?")
+            parameters.append(_timestamp(since))
+        if until is not None:
+            conditions.append(f"{table}.timestamp < ?")
+            parameters.append(_timestamp(until))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = (f"SELECT {table}.* FROM {source_table} {where} "
+                 f"ORDER BY {table}.timestamp DESC, {table}.id DESC LIMIT ?")
+        with self.lock:
+            rows = self.connection.execute(query, parameters + [limit]).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def recent(self, table: str, days: float = 7, **filters) -> List[Dict[str, Any]]:
+        """Einträge der letzten days Tage (weitere Filter wie bei search)"""
+        return self.search(table, since=datetime.now() - timedelta(days=days), **filters)
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+        entry = dict(row)
+        data = entry.pop("data")
+        if data:
+            entry.update((key, value) for key, value in json.loads(data).items() if key not in entry)
+        return entry
+
+    def count(self, table: str) -> int:
+        self._check_table(table)
+        with self.lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Anzahl Einträge pro Tabelle und MCP-Level"""
+        stats = {}
+        with self.lock:
+            for table in TABLES:
+                levels = self.connection.execute(
+                    f"SELECT mcp_level, COUNT(*) FROM {table} GROUP BY mcp_level").fetchall()
+                stats[table] = {
+                    "total": sum(count for _, count in levels),
+                    "by_mcp_level": {level: count for level, count in levels if level is not None}
+                }
+        return stats
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def __enter__(self) -> "OttoMemoryStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Importer für die bestehenden Dateien
+
+def _load_yaml(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _import_ben_memory(store: OttoMemoryStore, data: Dict[str, Any], fallback: str) -> int:
+    """ben_claude_memory.yaml: memories, mcp_level_evolution und resonance_evolution"""
+    created = data.get("created_at") or fallback
+    records = []
+    for memory in data.get("memories") or []:
+        if isinstance(memory, dict) and memory.get("memory"):
+            extra = {key: value for key, value in memory.items()
+                     if key not in ("memory", "date", "category", "mcp_level")}
+            records.append(dict(extra, content=memory["memory"], timestamp=memory.get("date") or created,
+                                category=memory.get("category"), mcp_level=memory.get("mcp_level"),
+                                source="ben"))
+    for key, texts in (data.get("mcp_level_evolution") or {}).items():
+        # level_3_memories -> MCP-Level 3
+        level = key.split("_")[1] if key.count("_") >= 2 else None
+        for text in texts or []:
+            records.append(dict(content=text, timestamp=created, category="mcp_level_evolution",
+                                mcp_level=int(level) if level and level.isdigit() else None, source="ben"))
+    for event in (data.get("resonance_evolution") or {}).get("evolution_timeline") or []:
+        if isinstance(event, dict):
+            records.append(dict(content=json.dumps(event, ensure_ascii=False, default=str),
+                                timestamp=event.get("timestamp") or event.get("date") or created,
+                                category="resonance_evolution", mcp_level=event.get("mcp_level"), source="ben"))
+    return store.add_many("memories", records)
+
+
+def _import_self_narrative(store: OttoMemoryStore, data: Dict[str, Any], fallback: str) -> int:
+    """otto_self_narrative.yaml: self_memories, evolution_timeline/-journey und self_understanding"""
+    created = data.get("created_at") or fallback
+    records = []
+    for memory in data.get("self_memories") or []:
+        if isinstance(memory, dict) and memory.get("memory"):
+            extra = {key: value for key, value in memory.items()
+                     if key not in ("memory", "date", "category", "mcp_level")}
+            records.append(dict(extra, content=memory["memory"], timestamp=memory.get("date") or created,
+                                category=memory.get("category"), mcp_level=memory.get("mcp_level"),
+                                source="otto"))
+    for key in ("evolution_timeline", "evolution_journey"):
+        for stage in data.get(key) or []:
+            if isinstance(stage, dict):
+                title = stage.get("stage") or stage.get("phase") or ""
+                description = stage.get("description") or ""
+                records.append(dict(content=f"{title}: {description}" if title else description,
+                                    timestamp=stage.get("date") or created, category="evolution",
+                                    mcp_level=stage.get("mcp_level"), source="otto"))
+    for item in data.get("self_understanding") or []:
+        if isinstance(item, dict) and item.get("understanding"):
+            records.append(dict(content=item["understanding"], timestamp=created, category=item.get("category"),
+                                source="otto", confidence=item.get("confidence")))
+    return store.add_many("self_memories", records)
+
+
+def _import_interactions(store: OttoMemoryStore, data: Dict[str, Any], fallback: str) -> int:
+    """otto_learning_data.yaml (learning_entries) und Kontext-Dateien (interactions)"""
+    records = []
+    for entry in data.get("learning_entries") or []:
+        if isinstance(entry, dict) and entry.get("input"):
+            records.append(dict(content=entry["input"], timestamp=entry.get("timestamp") or fallback,
+                                category=entry.get("context"), source="learning_system",
+                                response=entry.get("response"),
+                                kristalle_triggered=entry.get("kristalle_triggered")))
+    for entry in data.get("interactions") or []:
+        if isinstance(entry, dict) and entry.get("text"):
+            records.append(dict(content=entry["text"], timestamp=entry.get("timestamp") or fallback, category="context",
+                                mcp_level=entry.get("mcp_level"), source="otto",
+                                level_description=entry.get("level_description")))
+    return store.add_many("interactions", records)
+
+
+def _import_journal(store: OttoMemoryStore, path: Path, fallback: str) -> int:
+    """Jammel- (otto_jammel) oder Mind-Datei (otto_mind) im Journal- oder Array-Format"""
+    table = "memories" if path.parent.name == "otto_mind" else "jammel_entries"
+    records = []
+    for entry in JamJournal(path).read_all():
+        if isinstance(entry, dict) and entry.get("content") is not None:
+            records.append(dict(content=entry["content"], timestamp=entry.get("timestamp") or fallback,
+                                category=entry.get("type") or path.stem, mcp_level=entry.get("mcp_level"),
+                                source=entry.get("source")))
+    return store.add_many(table, records)
+
+
+def _file_timestamp(path: Path) -> str:
+    """Ersatz-Zeitstempel für Einträge ohne eigenen: Änderungszeit der Datei (bei Wiederholung gleich)"""
+    for candidate in (path, path.with_name(f"{path.name}.segments")):
+        try:
+            return datetime.fromtimestamp(candidate.stat().st_mtime).isoformat()
+        except OSError:
+            continue
+    return datetime.fromtimestamp(0).isoformat()
+
+
+def import_file(store: OttoMemoryStore, path: Union[str, Path]) -> int:
+    """Übernimmt eine bestehende Datei anhand ihres Namens; gibt die Anzahl neuer Einträge zurück"""
+    path = Path(path)
+    fallback = _file_timestamp(path)
+    if path.suffix == ".jam":
+        return _import_journal(store, path, fallback)
+    if path.suffix != ".yaml":
+        return 0
+    data = _load_yaml(path)
+    if not isinstance(data, dict):
+        return 0
+    if "ben" in path.stem and "memory" in path.stem:
+        return _import_ben_memory(store, data, fallback)
+    if "self_narrative" in path.stem:
+        return _import_self_narrative(store, data, fallback)
+    if path.stem == "otto_learning_data" or path.stem.startswith("context_"):
+        return _import_interactions(store, data, fallback)
+    return 0
+
+
+def default_import_paths() -> List[Path]:
+    """Dateien im Arbeitsverzeichnis und in den Otto_*_System-Verzeichnissen der Agenten"""
+    paths = [Path("otto_jammel"), Path("otto_mind"), Path("otto_self_narrative.yaml"),
+             Path("otto_learning_data.yaml")]
+    for root in sorted(AGENT_ROOTS.glob("Otto_*_System")):
+        paths.extend(sorted(root.glob("Ben_Memory/*.yaml")))
+        paths.append(root / "Otto_Self" / "otto_self_narrative.yaml")
+        paths.extend(sorted(root.glob("Context/memory/context_*.yaml")))
+    return paths
+
+
+def import_existing(store: OttoMemoryStore, paths: Iterable[Union[str, Path]] = None) -> Dict[str, int]:
+    """Übernimmt Dateien und Verzeichnisse (.jam/.yaml darin); Pfad -> Anzahl neuer Einträge"""
+    results = {}
+    for path in (Path(path) for path in (paths or default_import_paths())):
+        if path.is_dir():
+            # Journale, deren aktive Datei nach einer Rotation fehlt, stecken nur in <name>.segments
+            journals = {file.name for file in path.glob("*.jam")}
+            journals.update(file.name[:-len(".segments")] for file in path.glob("*.jam.segments"))
+            files = [path / name for name in sorted(journals)] + sorted(path.glob("*.yaml"))
+        else:
+            files = [path]
+        for file in files:
+            if not file.exists() and not file.with_name(f"{file.name}.segments").is_dir():
+                continue
+            try:
+                results[str(file)] = import_file(store, file)
+            except (OSError, ValueError, yaml.YAMLError, sqlite3.Error) as e:
+                print(f"⚠️  {file} nicht übernommen: {e}")
+    return results
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Otto Memory Store")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Datenbank-Datei")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Bestehende YAML-/Jammel-Dateien übernehmen")
+    importer.add_argument("paths", nargs="*", help="Dateien oder Verzeichnisse (Standard: bekannte Fundorte)")
+
+    search = commands.add_parser("search", help="Einträge suchen")
+    search.add_argument("table", choices=TABLES)
+    search.add_argument("text", nargs="?", help="Suchwörter (alle müssen vorkommen)")
+    search.add_argument("--category")
+    search.add_argument("--level", type=float, help="MCP-Level")
+    search.add_argument("--source")
+    search.add_argument("--days", type=float, help="Nur die letzten N Tage")
+    search.add_argument("--limit", type=int, default=20)
+
+    commands.add_parser("stats", help="Anzahl Einträge pro Tabelle und MCP-Level")
+
+    args = parser.parse_args(argv)
+    with OttoMemoryStore(args.db) as store:
+        if args.command == "import":
+            results = import_existing(store, args.paths)
+            for path, count in results.items():
+                print(f"✅ {path}: {count} neue Einträge")
+            print(f"📊 {sum(results.values())} Einträge aus {len(results)} Dateien übernommen")
+        elif args.command == "search":
+            since = datetime.now() - timedelta(days=args.days) if args.days is not None else None
+            for entry in store.search(args.table, args.text, args.category, args.level, args.source,
+                                      since=since, limit=args.limit):
+                level = f" L{entry['mcp_level']}" if entry["mcp_level"] is not None else ""
+                print(f"{entry['timestamp']} [{entry['category'] or '-'}{level}] {entry['content']}")
+        else:
+            print(json.dumps(store.get_statistics(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ Verwendet Marker, um das Denksystem zu verstehen und zu antizipieren
 
 import os
 import sys
+import argparse
 import json
 import time
 import speech_recognition as sr
@@ -17,6 +18,7 @@ from dotenv import load_dotenv
 import random
 import re
 from pathlib import Path
+from marker_system import MarkerSystemBase
 
 # Lade Umgebungsvariablen
 load_dotenv()
@@ -27,138 +29,15 @@ ELEVENLABS_API_KEY = os.getenv('ELEVENLABS_API_KEY')
 VOICE_ID = os.getenv('ELEVENLABS_VOICE_ID', 'pNInz6obpgDQGcFmaJgB')
 
 # Marker-System
-class MarkerSystem:
-    def __init__(self):
-        self.markers = {}
+class MarkerSystem(MarkerSystemBase):
+    cache_name = "otto_mind_reader"
+    
+    def __init__(self, **options):
+        """Optionen (fuzzy, regex_patterns, semantic, marker_store, ...) siehe MarkerSystemBase"""
         self.mind_patterns = {}
         self.user_profile = {}
         self.anticipation_data = {}
-        self.load_all_markers()
-    
-    def load_all_markers(self):
-        """Lädt alle Marker aus dem ALL_SEMANTIC_MARKER_TXT Verzeichnis"""
-        marker_dir = Path("../ALL_SEMANTIC_MARKER_TXT/ALL_NEWMARKER01")
-        
-        if not marker_dir.exists():
-            print(f"⚠️  Marker-Verzeichnis nicht gefunden: {marker_dir}")
-            return
-        
-        print(f"🔍 Lade Marker aus: {marker_dir}")
-        
-        # Lade alle .txt und .yaml Dateien
-        marker_files = list(marker_dir.glob("*.txt")) + list(marker_dir.glob("*.yaml"))
-        
-        for file_path in marker_files:
-            try:
-                self.load_marker_file(file_path)
-            except Exception as e:
-                print(f"⚠️  Fehler beim Laden von {file_path.name}: {e}")
-        
-        print(f"✅ {len(self.markers)} Marker geladen")
-    
-    def load_marker_file(self, file_path):
-        """Lädt eine einzelne Marker-Datei"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Versuche YAML zu parsen
-            try:
-                data = yaml.safe_load(content)
-                if data and isinstance(data, dict):
-                    self.process_marker_data(data, file_path.name)
-                    return
-            except:
-                pass
-            
-            # Fallback: Text-basiertes Parsing
-            self.process_text_marker(content, file_path.name)
-            
-        except Exception as e:
-            print(f"⚠️  Fehler beim Laden von {file_path}: {e}")
-    
-    def process_marker_data(self, data, filename):
-        """Verarbeitet YAML-basierte Marker-Daten"""
-        marker_name = data.get('marker', filename.replace('.yaml', '').replace('.txt', ''))
-        
-        self.markers[marker_name] = {
-            'name': marker_name,
-            'description': data.get('beschreibung', ''),
-            'examples': data.get('beispiele', []),
-            'patterns': data.get('semantic_grab', {}).get('patterns', []),
-            'tags': data.get('tags', []),
-            'filename': filename
-        }
-    
-    def process_text_marker(self, content, filename):
-        """Verarbeitet Text-basierte Marker-Dateien"""
-        lines = content.split('\n')
-        marker_name = filename.replace('.txt', '').replace('.yaml', '')
-        
-        description = ""
-        examples = []
-        patterns = []
-        
-        in_examples = False
-        in_patterns = False
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            if line.startswith('marker:'):
-                marker_name = line.split(':', 1)[1].strip()
-            elif line.startswith('beschreibung:'):
-                description = line.split(':', 1)[1].strip()
-            elif line.startswith('beispiele:'):
-                in_examples = True
-                in_patterns = False
-            elif line.startswith('semantic_grab:'):
-                in_examples = False
-                in_patterns = True
-            elif in_examples and line.startswith('- '):
-                examples.append(line[2:].strip('"'))
-            elif in_patterns and line.startswith('- '):
-                patterns.append(line[2:])
-        
-        self.markers[marker_name] = {
-            'name': marker_name,
-            'description': description,
-            'examples': examples,
-            'patterns': patterns,
-            'filename': filename
-        }
-    
-    def analyze_text_for_markers(self, text):
-        """Analysiert Text auf Marker"""
-        found_markers = []
-        text_lower = text.lower()
-        
-        for marker_name, marker_data in self.markers.items():
-            # Prüfe Beispiele
-            for example in marker_data['examples']:
-                if example.lower() in text_lower:
-                    found_markers.append({
-                        'marker': marker_name,
-                        'type': 'example_match',
-                        'confidence': 0.8,
-                        'description': marker_data['description']
-                    })
-                    break
-            
-            # Prüfe Patterns
-            for pattern in marker_data['patterns']:
-                if pattern.lower() in text_lower:
-                    found_markers.append({
-                        'marker': marker_name,
-                        'type': 'pattern_match',
-                        'confidence': 0.9,
-                        'description': marker_data['description']
-                    })
-                    break
-        
-        return found_markers
+        super().__init__(**options)
     
     def update_user_profile(self, text, markers_found):
         """Aktualisiert das Benutzerprofil basierend auf gefundenen Markern"""
@@ -234,10 +113,11 @@ class MarkerSystem:
         self.anticipation_data = anticipation_profile
 
 class MindReaderOtto:
-    def __init__(self):
+    def __init__(self, fuzzy=False):
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
-        self.marker_system = MarkerSystem()
+        # fuzzy: fehlertolerante Marker-Suche für ASR-Transkripte (langsamer, daher optional)
+        self.marker_system = MarkerSystem(fuzzy=fuzzy)
         self.conversation_active = False
         self.conversation_timeout = 30
         self.last_conversation_time = 0
@@ -484,5 +364,10 @@ class MindReaderOtto:
             print(f"⚠️  Fehler beim Speichern: {e}")
 
 if __name__ == "__main__":
-    agent = MindReaderOtto()
+    parser = argparse.ArgumentParser(description="OTTO - Mind Reader Version")
+    parser.add_argument("--fuzzy", action="store_true",
+                        help="Fehlertolerante Marker-Suche (z.B. 'sensucht' findet 'sehnsucht')")
+    args = parser.parse_args()
+    
+    agent = MindReaderOtto(fuzzy=args.fuzzy)
     agent.run() 
\ No newline at end of file
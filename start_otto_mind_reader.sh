@@ -72,4 +72,4 @@ echo "⏹️  Drücke Ctrl+C zum Beenden"
 echo ""
 
 # Starte Otto
-python3 otto_mind_reader.py 
\ No newline at end of file
+python3 otto_mind_reader.py "$@"
\ No newline at end of file
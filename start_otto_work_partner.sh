@@ -73,4 +73,4 @@ echo "⏹️  Drücke Ctrl+C zum Beenden"
 echo ""
 
 # Starte Otto
-python3 otto_work_partner.py 
\ No newline at end of file
+python3 otto_work_partner.py "$@"
\ No newline at end of file
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test Marker Regex
+=================
+Vergleicht RegexMarkerSet (Pflicht-Literal-Vorfilter) mit re.finditer pro Pattern
+
+    python -m pytest test_marker_regex.py
+"""
+
+import random
+import re
+
+from marker_regex import RegexMarkerSet, required_literal
+
+# Bausteine für Zufalls-Patterns, inklusive gezählter Quantoren und '{' als Zeichen
+ATOMS = [
+    "a", "b", "ab", "a*", "b+", "(a|b)", "[ab]", "a?", "(ab)+", "\\w", "\\b", "c.", "(?:ba)",
+    "a{2}", "a{0,2}", "b{1,3}", "a{,2}", "(ab){2}", "[ab]{1,2}", "\\w{2,4}", "c{3,}", "{", "{}", "a{b",
+    "(a)\\1", "\\x41", "\\u0069", "s", "i", "ß", "I", "S", "\\.", ".", "|", "Σ", "k", "[]a]", "\\d",
+    "ich", "Si"
+]
+ALPHABET = "abcisßẞıſİKΣσς .kA1{}2"
+
+
+def _check(patterns, text):
+    markers = RegexMarkerSet(first_entry=3)
+    entries = [markers.add("test", pattern) for pattern in patterns]
+    markers.compile()
+    found = sorted((hit.entry, hit.start, hit.end) for hit in markers.find_all(text))
+    expected = sorted((entry + 3, match.start(), match.end())
+                      for entry, pattern in zip(entries, patterns) if entry >= 0
+                      for match in re.finditer(pattern, text, re.IGNORECASE))
+    assert found == expected, (patterns, text, [(pattern, required_literal(pattern)) for pattern in patterns])
+
+
+def test_matches_equal_finditer():
+    rng = random.Random(7)
+    for _ in range(3000):
+        patterns = ["".join(rng.choice(ATOMS) for _ in range(rng.randint(1, 5)))
+                    for _ in range(rng.randint(1, 10))]
+        for _ in range(5):
+            text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 20))).lower()
+            _check(patterns, text)
+
+
+def test_counted_quantifiers():
+    _check([r"\b\w{10,20}\b"], "eine verantwortung")
+    assert required_literal(r"\b\w{10,20}\b") == ""
+    assert required_literal(r"nein{2}mal") == "nein"
+    assert required_literal(r"neinx{0,2}mal") == "nein"
+    assert required_literal(r"ab{}cd") == "ab"
+
+
+if __name__ == "__main__":
+    test_matches_equal_finditer()
+    test_counted_quantifiers()
+    print("✅ Marker-Regex-Tests bestanden")
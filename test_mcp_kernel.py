@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test MCP Kernel
+===============
+Batch- und Stream-Verarbeitung müssen im Fuzzy-Modus dasselbe liefern wie process_input
+
+    python -m pytest test_mcp_kernel.py
+"""
+
+import contextlib
+import io
+import random
+import tempfile
+
+from mcp_kernel import MCPKernel
+
+# Verhörte Marker, wie sie von der Spracherkennung kommen
+MISHEARD = ["sensucht", "verlangn", "erkentnis", "klarhet", "spüree", "verpflichtng", "im kontekst"]
+
+
+def _kernel() -> MCPKernel:
+    with contextlib.redirect_stdout(io.StringIO()):
+        kernel = MCPKernel(marker_dir=tempfile.mkdtemp())
+        kernel.init()
+    kernel.enable_fuzzy()
+    return kernel
+
+
+def _without_timestamp(result):
+    result = dict(result)
+    result.pop("timestamp")
+    return result
+
+
+def _texts(kernel, count, seed):
+    rng = random.Random(seed)
+    vocabulary = [marker for markers in kernel.marker_field.values() for marker in markers]
+    vocabulary += MISHEARD + ["und", "ich", "x", ".", "!", "  "]
+    return [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 20))) for _ in range(count)]
+
+
+def test_batch_equals_process_input_with_fuzzy():
+    kernel = _kernel()
+    texts = ["ich habe sensucht und verlangn"] + _texts(kernel, 300, 11)
+    batch = kernel.process_batch(texts)
+    for text, result in zip(texts, batch):
+        assert _without_timestamp(result) == _without_timestamp(kernel.process_input(text)), text
+
+    analysis = batch[0]["marker_analysis"]
+    assert analysis["detected_markers"] == ["sehnsucht", "verlangen"]
+    assert [match["heard"] for match in analysis["fuzzy_matches"]] == ["sensucht", "verlangn"]
+
+
+def test_stream_equals_process_input_with_fuzzy():
+    kernel = _kernel()
+    rng = random.Random(5)
+    for text in _texts(kernel, 300, 12):
+        stream = kernel.stream()
+        position = 0
+        while position < len(text):
+            size = rng.randint(1, 7)
+            stream.feed(text[position:position + size])
+            position += size
+            expected = kernel.process_input(stream.text.text)
+            assert _without_timestamp(stream.result) == _without_timestamp(expected), stream.text.text
+
+
+if __name__ == "__main__":
+    test_batch_equals_process_input_with_fuzzy()
+    test_stream_equals_process_input_with_fuzzy()
+    print("✅ MCP-Kernel-Tests bestanden")
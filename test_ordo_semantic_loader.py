@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test Ordo Semantic Loader
+=========================
+Fehlerhafte Marker-Dateien landen im Lade-Bericht statt still leer geladen zu werden
+
+    python -m pytest test_ordo_semantic_loader.py
+"""
+
+import tempfile
+from pathlib import Path
+
+from ordo_semantic_loader import OrdoSemanticLoader
+
+VALID_YAML = "marker: META_REFLEX\nbeschreibung: Reflexion\nbeispiele:\n  - ich denke darüber nach\n"
+BROKEN_YAML = "marker: META_REFLEX\nbeispiele: [ich denke\n  - : :\n"
+
+
+def _loader(content: str, use_cache: bool = True):
+    base_path = Path(tempfile.mkdtemp())
+    (base_path / "META_REFLEX_SEM_MARKER.yaml").write_text(content, encoding="utf-8")
+    loader = OrdoSemanticLoader(base_path, use_cache=use_cache, cache_dir=str(base_path / "cache"), workers=1)
+    loader.load_all_markers()
+    return loader, base_path
+
+
+def test_broken_yaml_is_reported_and_not_cached():
+    loader, base_path = _loader(BROKEN_YAML)
+    assert loader.load_report.loaded == []
+    assert [error["file"] for error in loader.load_report.errors] == ["META_REFLEX_SEM_MARKER.yaml"]
+    assert "META_REFLEX_SEM_MARKER" not in loader.markers
+
+    # Ein zweiter Lauf parst die Datei erneut, statt ein leeres Ergebnis aus dem Cache zu holen
+    again = OrdoSemanticLoader(base_path, cache_dir=str(base_path / "cache"), workers=1)
+    again.load_all_markers()
+    assert again.load_report.cached == 0
+    assert len(again.load_report.errors) == 1
+
+
+def test_broken_rewrite_keeps_previous_markers():
+    for use_cache in (True, False):
+        loader, base_path = _loader(VALID_YAML, use_cache)
+        assert list(loader.markers) == ["META_REFLEX_SEM_MARKER"]
+
+        path = base_path / "META_REFLEX_SEM_MARKER.yaml"
+        path.write_text(BROKEN_YAML, encoding="utf-8")
+        changes = loader.apply_marker_changes([path])
+        assert changes["updated"] == []
+        assert [error["file"] for error in changes["errors"]] == ["META_REFLEX_SEM_MARKER.yaml"]
+        assert list(loader.markers) == ["META_REFLEX_SEM_MARKER"]
+        assert loader.search_markers("ich denke darüber nach")
+
+
+if __name__ == "__main__":
+    test_broken_yaml_is_reported_and_not_cached()
+    test_broken_rewrite_keeps_previous_markers()
+    print("✅ Ordo-Loader-Tests bestanden")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Write Behind
+============
+Schreibt Journal-Einträge und Datei-Snapshots im Hintergrund
+Ein Gesprächszug legt seine Schreibvorgänge nur in eine Warteschlange; ein
+Writer-Thread fasst sie pro Datei zusammen (alle Journal-Zeilen in einem
+Schreibvorgang, von mehreren Snapshots nur der letzte) und schreibt, sobald
+max_pending Vorgänge anstehen, max_delay Sekunden vergangen sind oder
+flush() aufgerufen wird.
+"""
+
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Was beim Beenden mit ausstehenden Schreibvorgängen passiert:
+#   none  - verwerfen, flush - schreiben, fsync - schreiben und auf die Platte zwingen
+DURABILITY_POLICIES = ("none", "flush", "fsync")
+
+DEFAULT_MAX_PENDING = 64
+DEFAULT_MAX_DELAY = 2.0
+
+
+class WriteBehindWriter:
+    """Warteschlange mit Writer-Thread für JamJournal-Einträge und Datei-Snapshots
+
+    Journale mit writer=... reichen ihre Einträge hierher weiter und lesen
+    noch nicht geschriebene Einträge über pending() mit. Bei durability="fsync"
+    wird auch jeder Hintergrund-Schreibvorgang mit fsync abgeschlossen.
+    """
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING, max_delay: float = DEFAULT_MAX_DELAY,
+                 durability: str = "flush"):
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(f"Unbekannte Durability-Policy: {durability}")
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.durability = durability
+        self.batches = 0
+        self._appends: Dict[Path, Tuple[Any, List[Dict[str, Any]]]] = {}
+        self._replaces: Dict[Path, str] = {}
+        # Vom Writer übernommen, aber noch nicht geschrieben (für pending())
+        self._inflight: Dict[Path, List[Dict[str, Any]]] = {}
+        self._count = 0
+        self._deadline = 0.0
+        self._condition = threading.Condition()
+        # Hält die Schreib-Reihenfolge zwischen Writer-Thread und flush() ein
+        self._write_lock = threading.Lock()
+        self._running = False
+        self._worker: Optional[threading.Thread] = None
+
+    def append(self, journal, entry: Dict[str, Any]):
+        """Merkt einen Journal-Eintrag vor (journal braucht path, lock und write_entries)"""
+        with self._condition:
+            pending = self._appends.get(journal.path)
+            if pending is None:
+                pending = self._appends[journal.path] = (journal, [])
+            pending[1].append(entry)
+            self._queued()
+
+    def replace(self, path, content: str):
+        """Merkt den neuen Inhalt einer Datei vor; ein späterer Snapshot ersetzt einen früheren"""
+        with self._condition:
+            self._replaces[Path(path)] = content
+            self._queued()
+
+    def _queued(self):
+        if self._count == 0:
+            self._deadline = time.monotonic() + self.max_delay
+        self._count += 1
+        if self._count >= self.max_pending:
+            self._condition.notify()
+
+    def pending(self, journal) -> List[Dict[str, Any]]:
+        """Noch nicht geschriebene Einträge eines Journals (älteste zuerst)
+
+        Mit journal.lock gehalten ergibt das zusammen mit dem Dateiinhalt einen
+        konsistenten Stand: der Writer schreibt und trägt aus unter diesem Lock.
+        """
+        with self._condition:
+            entries = list(self._inflight.get(journal.path, ()))
+            queued = self._appends.get(journal.path)
+            if queued is not None:
+                entries.extend(queued[1])
+            return entries
+
+    def start(self) -> "WriteBehindWriter":
+        if not self._running:
+            self._running = True
+            self._worker = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._worker.start()
+            atexit.register(self.close)
+        return self
+
+    def flush(self, fsync: bool = None) -> int:
+        """Schreibt alle bisher vorgemerkten Vorgänge sofort; gibt die Anzahl geschriebener Dateien zurück"""
+        if fsync is None:
+            fsync = self.durability == "fsync"
+        with self._write_lock:
+            with self._condition:
+                appends, self._appends = self._appends, {}
+                replaces, self._replaces = self._replaces, {}
+                self._inflight = {path: entries for path, (_, entries) in appends.items()}
+                self._count = 0
+            if not appends and not replaces:
+                return 0
+
+            self.batches += 1
+            for path, content in replaces.items():
+                try:
+                    self._write_file(path, content, fsync)
+                except OSError as e:
+                    print(f"❌ {path.name} konnte nicht geschrieben werden: {e}")
+            for path, (journal, entries) in appends.items():
+                with journal.lock:
+                    try:
+                        journal.write_entries(entries, fsync)
+                    except OSError as e:
+                        print(f"❌ {len(entries)} Einträge für {path.name} verloren: {e}")
+                    finally:
+                        with self._condition:
+                            self._inflight.pop(path, None)
+            return len(replaces) + len(appends)
+
+    @staticmethod
+    def _write_file(path: Path, content: str, fsync: bool):
+        tmp_path = path.with_suffix(f"{path.suffix}.tmp{os.getpid()}")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def close(self, durability: str = None):
+        """Beendet den Writer-Thread und verfährt mit Ausstehendem nach der Policy (Standard: self.durability)"""
+        durability = durability or self.durability
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(f"Unbekannte Durability-Policy: {durability}")
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+            atexit.unregister(self.close)
+
+        if durability == "none":
+            with self._condition:
+                dropped = self._count
+                self._appends.clear()
+                self._replaces.clear()
+                self._count = 0
+            if dropped:
+                print(f"⚠️  {dropped} ausstehende Schreibvorgänge verworfen")
+        else:
+            self.flush(fsync=durability == "fsync")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and (self._count == 0 or
+                                         (self._count < self.max_pending and time.monotonic() < self._deadline)):
+                    timeout = self._deadline - time.monotonic() if self._count else None
+                    self._condition.wait(timeout)
+                if not self._running:
+                    return
+            self.flush()
+
+    def __enter__(self) -> "WriteBehindWriter":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()